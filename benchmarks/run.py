@@ -0,0 +1,367 @@
+"""Time TimeLedger's hot paths on a synthetic ledger and compare with a baseline.
+
+Usage:
+    python benchmarks/run.py --scale month
+    python benchmarks/run.py --scale year --save-baseline
+    python benchmarks/run.py --scale year --baseline benchmarks/results/baseline-year.json
+
+Ledgers and storage trees are generated deterministically (see
+synthetic.py) under --work-dir and reused between runs. Each case is timed
+--repeat times after its setup and a warmup run; results are written as JSON, and cases
+slower than the baseline median by more than --tolerance are reported
+(exit status 1), so runs can be compared across changes and machines.
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import matplotlib
+matplotlib.use("Agg")
+
+from benchmarks.synthetic import build_tree, generate_day, write_ledger
+from gui.chart_manager import Chart
+from gui.timeline_view import TimelineView
+from tracker.app_timer import AppTimer
+from tracker.storage_cache import StorageCache
+from tracker.storage_tracker import StorageTracker
+from utils.data_manager import DataManager
+from utils.report_aggregator import iter_day_sessions
+from utils.report_generator import ReportGenerator
+from utils.session_index import SessionFilter, SessionIndex
+from utils.time_binning import BUCKET_SECONDS, bin_intervals, session_arrays
+
+RESULTS_VERSION = 1
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+# days, sessions per day
+SCALES = {
+    "day": (1, 3000),
+    "month": (30, 1500),
+    "year": (365, 1500)
+}
+
+# Figure sizes the timeline tab registers its views with
+TIMELINE_VIEWS = {"hourly": (12, 8), "detailed": (14, 8), "apps": (14, 8)}
+
+CASES = []
+
+
+def case(name):
+    """Register a benchmark: setup(context) returns a callable that runs one timed iteration"""
+    def register(setup):
+        CASES.append((name, setup))
+        return setup
+    return register
+
+
+class Context:
+    """Generated data shared by the cases"""
+
+    def __init__(self, args):
+        self.args = args
+        self.work_dir = Path(args.work_dir)
+        self.data_dir = self.work_dir / (f"ledger_{args.days}d_{args.sessions_per_day}s_"
+                                         f"{args.apps}a_{args.zipf}z_{args.seed}")
+        self.days = write_ledger(self.data_dir, days=args.days, sessions_per_day=args.sessions_per_day,
+                                 apps=args.apps, zipf_exponent=args.zipf, seed=args.seed)
+        self.today = self.days[-1]
+        self.last_closed_day = self.days[-2] if len(self.days) > 1 else None
+        self.storage_root = self.work_dir / "storage_tree"
+        self.scratch = Path(tempfile.mkdtemp(prefix="timeledger_bench_"))
+
+    def data_manager(self):
+        return DataManager(self.data_dir)
+
+    def ledger_sessions(self):
+        sessions = []
+        for day in self.days:
+            sessions.extend(iter_day_sessions(self.data_dir / f"{day.isoformat()}.json"))
+        return sessions
+
+    def scratch_dir(self, name):
+        path = self.scratch / name
+        shutil.rmtree(path, ignore_errors=True)
+        path.mkdir(parents=True)
+        return path
+
+
+@case("data_manager.load_daily_data")
+def bench_load(ctx):
+    data_manager = ctx.data_manager()
+    return lambda: data_manager.load_daily_data(ctx.today)
+
+
+@case("data_manager.save_daily_data")
+def bench_save(ctx):
+    data_manager = ctx.data_manager()
+    data_manager.data_dir = ctx.scratch_dir("save")  # don't overwrite the ledger
+    return data_manager.save_daily_data
+
+
+@case("data_manager.get_app_usage_summary")
+def bench_usage_summary(ctx):
+    return ctx.data_manager().get_app_usage_summary
+
+
+@case("app_timer.check_app_limits.first")
+def bench_limits_first(ctx):
+    data_manager = ctx.data_manager()
+    data_manager.data_dir = ctx.scratch_dir("limits")
+
+    def run():
+        # A fresh timer counts the whole day's sessions
+        timer = AppTimer(data_manager)
+        for app_name in ("chrome.exe", "code.exe", "slack.exe", "spotify.exe", "steam.exe"):
+            timer.app_limits[app_name] = 3600
+        timer.check_app_limits()
+    return run
+
+
+@case("app_timer.check_app_limits.incremental")
+def bench_limits_incremental(ctx):
+    data_manager = ctx.data_manager()
+    data_manager.data_dir = ctx.scratch_dir("limits")
+    timer = AppTimer(data_manager)
+    for app_name in ("chrome.exe", "code.exe", "slack.exe", "spotify.exe", "steam.exe"):
+        timer.app_limits[app_name] = 3600
+    timer.check_app_limits()
+    extra = generate_day(ctx.today, 1000, seed=ctx.args.seed + 1)
+
+    def run():
+        # The tracker closed one more session since the last check
+        data_manager.app_sessions.append(extra[len(data_manager.app_sessions) % len(extra)])
+        timer.check_app_limits()
+    return run
+
+
+def _report_generator(ctx, name):
+    generator = ReportGenerator(ctx.data_manager(), reports_dir=ctx.scratch_dir(name))
+    generator.rollup_cache.cache_dir = ctx.scratch / "rollups"
+    return generator
+
+
+@case("report_generator.generate_daily_report")
+def bench_daily_report(ctx):
+    generator = _report_generator(ctx, "reports_daily")
+    day = ctx.last_closed_day or ctx.today
+    return lambda: generator.generate_daily_report(day, force=True)
+
+
+@case("report_generator.generate_daily_report.cached")
+def bench_daily_report_cached(ctx):
+    generator = _report_generator(ctx, "reports_cached")
+    day = ctx.last_closed_day or ctx.today
+    generator.generate_daily_report(day)
+    return lambda: generator.generate_daily_report(day)
+
+
+@case("report_generator.generate_range_report")
+def bench_range_report(ctx):
+    generator = _report_generator(ctx, "reports_range")
+
+    def run():
+        # Cold: no cached rollups
+        shutil.rmtree(generator.rollup_cache.cache_dir, ignore_errors=True)
+        generator.generate_range_report(ctx.days[0], ctx.today, jobs=ctx.args.jobs)
+    return run
+
+
+def _timeline_case(view):
+    def setup(ctx):
+        timeline = TimelineView.__new__(TimelineView)
+        timeline.data_manager = ctx.data_manager()
+        setup_view = getattr(timeline, f"setup_{view}_timeline")
+        update_view = getattr(timeline, f"update_{view}_timeline")
+
+        def run():
+            # What the chart manager's render thread does for a new view
+            chart = Chart(TIMELINE_VIEWS[view])
+            chart.resize(1200, 700)
+            setup_view(chart)
+            update_view(chart)
+            chart.render()
+        return run
+    return setup
+
+
+for _view in TIMELINE_VIEWS:
+    case(f"timeline_view.{_view}")(_timeline_case(_view))
+
+
+@case("session_index.load_range")
+def bench_session_index(ctx):
+    data_manager = ctx.data_manager()
+    return lambda: SessionIndex(data_manager).load(ctx.days[0], ctx.today)
+
+
+@case("session_index.query")
+def bench_session_query(ctx):
+    data_manager = ctx.data_manager()
+    index = SessionIndex(data_manager).load(ctx.days[0], ctx.today)
+    session_filter = SessionFilter(app="e", min_duration=10, active_only=True, sort_by="app")
+    return lambda: index.query(session_filter).page(0, 40)
+
+
+@case("time_binning.bin_intervals")
+def bench_binning(ctx):
+    arrays = session_arrays(ctx.ledger_sessions(), group_by="app")
+    origin = float(arrays.starts.min())
+    bucket = BUCKET_SECONDS["15min"]
+    n_buckets = int((arrays.ends.max() - origin) // bucket) + 1
+    return lambda: bin_intervals(arrays.starts, arrays.ends, bucket, n_buckets, origin,
+                                 arrays.groups, len(arrays.names))
+
+
+def _storage_tracker(ctx):
+    build_tree(ctx.storage_root, ctx.args.storage_files, 3, 8, 64)
+    data_manager = ctx.data_manager()
+    data_manager.data_dir = ctx.scratch_dir("storage")
+    return StorageTracker(data_manager, scan_roots=[], throttle_entries_per_sec=None)
+
+
+@case("storage_tracker.scan_folder_sizes")
+def bench_scan(ctx):
+    tracker = _storage_tracker(ctx)
+    return lambda: tracker.scan_folder_sizes(ctx.storage_root)
+
+
+@case("storage_tracker.incremental_rescan")
+def bench_rescan(ctx):
+    tracker = _storage_tracker(ctx)
+    cache = StorageCache(ctx.scratch / "storage" / "storage_cache.bin")
+    tracker.scanner.scan(ctx.storage_root, max_depth=2, cache=cache)
+    return lambda: tracker.scanner.scan(ctx.storage_root, max_depth=2, cache=cache)
+
+
+def run_cases(ctx, selected, repeat, warmup):
+    results = {}
+    for name, setup in CASES:
+        if selected and not any(pattern in name for pattern in selected):
+            continue
+        try:
+            run = setup(ctx)
+            for _ in range(warmup):
+                run()
+            timings = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                run()
+                timings.append(time.perf_counter() - started)
+        except Exception as e:
+            print(f"{name}: error: {e}")
+            results[name] = {"error": str(e)}
+            continue
+        results[name] = {
+            "median_s": statistics.median(timings),
+            "min_s": min(timings),
+            "runs_s": [round(timing, 6) for timing in timings]
+        }
+        print(f"{name:<48} median {results[name]['median_s'] * 1000:>10.2f} ms  "
+              f"min {results[name]['min_s'] * 1000:>10.2f} ms")
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """Print the change against a baseline; returns the names of regressed cases"""
+    if baseline.get("config") != results["config"]:
+        print("NOTE: the baseline was recorded with different settings:", baseline.get("config"))
+
+    regressed = []
+    print(f"\n{'case':<48} {'baseline':>12} {'now':>12} {'change':>8}")
+    for name, result in results["results"].items():
+        before = baseline.get("results", {}).get(name, {})
+        if "median_s" not in result or "median_s" not in before:
+            continue
+        change = result["median_s"] / before["median_s"] - 1 if before["median_s"] else 0
+        flag = ""
+        if change > tolerance:
+            flag = "  SLOWER"
+            regressed.append(name)
+        elif change < -tolerance:
+            flag = "  faster"
+        print(f"{name:<48} {before['median_s'] * 1000:>10.2f}ms {result['median_s'] * 1000:>10.2f}ms "
+              f"{change:>+7.0%}{flag}")
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", choices=sorted(SCALES), default="month")
+    parser.add_argument("--days", type=int, help="override the scale's number of days")
+    parser.add_argument("--sessions-per-day", type=int, help="override the scale's sessions per day")
+    parser.add_argument("--apps", type=int, default=50)
+    parser.add_argument("--zipf", type=float, default=1.2, help="Zipf exponent of app popularity")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--storage-files", type=int, default=20000)
+    parser.add_argument("--jobs", type=int, default=1, help="worker processes for range reports")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--warmup", type=int, default=1, help="untimed runs before timing each case")
+    parser.add_argument("--cases", nargs="*", help="only run cases whose name contains one of these")
+    parser.add_argument("--work-dir", default=os.path.join(tempfile.gettempdir(), "timeledger_bench"))
+    parser.add_argument("--output", help="results file (default: benchmarks/results/<time>-<scale>.json)")
+    parser.add_argument("--baseline", help="compare against this results file")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="also write the results as benchmarks/results/baseline-<scale>.json")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown before flagging")
+    args = parser.parse_args()
+
+    days, sessions_per_day = SCALES[args.scale]
+    args.days = args.days or days
+    args.sessions_per_day = args.sessions_per_day or sessions_per_day
+
+    print(f"Generating {args.days} days x {args.sessions_per_day} sessions "
+          f"({args.apps} apps, Zipf {args.zipf}) under {args.work_dir} ...")
+    ctx = Context(args)
+    try:
+        results = {
+            "version": RESULTS_VERSION,
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "machine": {
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "cpus": os.cpu_count()
+            },
+            "config": {
+                "scale": args.scale,
+                "days": args.days,
+                "sessions_per_day": args.sessions_per_day,
+                "apps": args.apps,
+                "zipf": args.zipf,
+                "seed": args.seed,
+                "storage_files": args.storage_files,
+                "jobs": args.jobs
+            },
+            "results": run_cases(ctx, args.cases, args.repeat, args.warmup)
+        }
+    finally:
+        shutil.rmtree(ctx.scratch, ignore_errors=True)
+
+    output = Path(args.output) if args.output else RESULTS_DIR / f"{datetime.now():%Y%m%d-%H%M%S}-{args.scale}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2))
+    print(f"\nResults written to {output}")
+    if args.save_baseline:
+        baseline_path = RESULTS_DIR / f"baseline-{args.scale}.json"
+        baseline_path.write_text(json.dumps(results, indent=2))
+        print(f"Baseline saved to {baseline_path}")
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            regressed = compare(results, json.load(f), args.tolerance)
+        if regressed:
+            print(f"\n{len(regressed)} case(s) slower than the baseline by more than {args.tolerance:.0%}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
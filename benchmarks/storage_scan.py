@@ -0,0 +1,86 @@
+"""Benchmark the single-pass storage scanner against the legacy rglob walk.
+
+Usage:
+    python benchmarks/storage_scan.py --files 1000000 --depth 4 --fanout 8
+
+The synthetic tree is created once under --root (default: a temp directory)
+and reused on later runs if it already holds the requested number of files.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.synthetic import build_tree
+from tracker.storage_scanner import DirectoryScanner
+from tracker.storage_cache import StorageCache
+
+
+def legacy_scan_folder_sizes(path, max_depth=2, current_depth=0):
+    """The rglob-per-directory implementation this benchmark replaces"""
+    if current_depth > max_depth:
+        return {}
+
+    folder_sizes = {}
+    for item in Path(path).iterdir():
+        if item.is_dir():
+            size = sum(f.stat().st_size for f in item.rglob('*') if f.is_file())
+            folder_sizes[str(item)] = size
+            if current_depth < max_depth:
+                folder_sizes.update(legacy_scan_folder_sizes(item, max_depth, current_depth + 1))
+
+    return folder_sizes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--root", default=os.path.join(tempfile.gettempdir(), "timeledger_scan_bench"))
+    parser.add_argument("--files", type=int, default=1_000_000)
+    parser.add_argument("--depth", type=int, default=4)
+    parser.add_argument("--fanout", type=int, default=8)
+    parser.add_argument("--file-size", type=int, default=64)
+    parser.add_argument("--max-depth", type=int, default=2)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--skip-legacy", action="store_true")
+    args = parser.parse_args()
+
+    print(f"Building {args.files} files under {args.root} ...")
+    build_tree(args.root, args.files, args.depth, args.fanout, args.file_size)
+
+    scanner = DirectoryScanner(max_workers=args.workers)
+    sizes = scanner.scan(args.root, max_depth=args.max_depth)
+    stats = scanner.last_stats
+    print(f"single-pass ({args.workers} workers): {stats.elapsed:.2f}s  {stats.files_per_sec():,.0f} files/s  "
+          f"{stats.bytes_per_sec() / 1024 / 1024:,.1f} MB/s  ({len(sizes)} folders)")
+
+    # Steady state: a cold scan fills the cache, the rescan reuses it
+    cache = StorageCache(os.path.join(tempfile.gettempdir(), "timeledger_scan_bench.cache"))
+    scanner.scan(args.root, max_depth=args.max_depth, cache=cache)
+    cold = scanner.last_stats.elapsed
+    cache.save()
+    cache.load()
+    rescanned = scanner.scan(args.root, max_depth=args.max_depth, cache=cache)
+    warm = scanner.last_stats
+    print(f"incremental rescan: {warm.elapsed:.2f}s ({warm.elapsed / cold:.1%} of cold scan, "
+          f"{warm.dirs_reused} dirs reused)")
+    if rescanned != sizes:
+        print("WARNING: incremental totals differ from the full scan")
+
+    if not args.skip_legacy:
+        started = time.perf_counter()
+        legacy = legacy_scan_folder_sizes(args.root, max_depth=args.max_depth)
+        elapsed = time.perf_counter() - started
+        print(f"legacy rglob: {elapsed:.2f}s  {stats.files / elapsed:,.0f} files/s")
+        print(f"speedup: {elapsed / stats.elapsed:.1f}x")
+
+        mismatched = [k for k in legacy if legacy[k] != sizes.get(k, (None,))[0]]
+        if mismatched:
+            print(f"WARNING: {len(mismatched)} folder totals differ, e.g. {mismatched[0]}")
+
+
+if __name__ == "__main__":
+    main()
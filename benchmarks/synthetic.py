@@ -0,0 +1,123 @@
+"""Deterministic synthetic data for the benchmarks.
+
+Ledgers are day files in the DataManager format, with sessions back to back
+through the working day and apps drawn from a Zipf distribution (a few apps
+take most of the time, like real usage). The same seed, range and settings
+always produce the same files. Storage trees are balanced directory trees
+of small files.
+"""
+from datetime import date, datetime, time, timedelta
+import json
+from pathlib import Path
+
+import numpy as np
+
+# The first apps get the highest Zipf weights; the rest are numbered
+KNOWN_APPS = ["chrome.exe", "code.exe", "slack.exe", "explorer.exe", "outlook.exe", "teams.exe",
+              "firefox.exe", "python.exe", "excel.exe", "spotify.exe", "word.exe", "terminal.exe",
+              "discord.exe", "zoom.exe", "notepad.exe", "steam.exe", "git.exe", "vlc.exe"]
+
+
+def app_catalog(count):
+    """Return `count` app names"""
+    return (KNOWN_APPS + [f"app{i:03d}.exe" for i in range(len(KNOWN_APPS), count)])[:count]
+
+
+def zipf_weights(count, exponent):
+    """Probabilities proportional to 1 / rank ** exponent"""
+    weights = 1.0 / np.arange(1, count + 1) ** exponent
+    return weights / weights.sum()
+
+
+def make_intervals(count, apps, seed=1):
+    """Return (starts, ends, groups) arrays of back-to-back sessions, in seconds"""
+    rng = np.random.default_rng(seed)
+    lengths = rng.exponential(120.0, count)
+    lengths[rng.random(count) < 0.01] *= 60  # a few very long sessions
+    ends = np.cumsum(lengths)
+    starts = ends - lengths
+    groups = rng.integers(0, apps, count)
+    return starts, ends, groups
+
+
+def generate_day(day, sessions, apps=50, zipf_exponent=1.2, titles_per_app=40, seed=1):
+    """Return one day's session dicts, seeded by (seed, day)"""
+    rng = np.random.default_rng([seed, day.toordinal()])
+    names = app_catalog(apps)
+    app_index = rng.choice(apps, size=sessions, p=zipf_weights(apps, zipf_exponent))
+    title_index = rng.zipf(1.5, size=sessions) % titles_per_app
+    lengths = rng.exponential(45.0, sessions)
+    lengths[rng.random(sessions) < 0.02] *= 40  # occasional long stretches
+    gaps = rng.exponential(5.0, sessions)
+    active = rng.random(sessions) < 0.85
+
+    # The day runs from 08:00 and is squeezed to end by 23:00 however many sessions it has
+    scale = min(1.0, 15 * 3600 / float((gaps + lengths).sum()))
+    lengths *= scale
+    gaps *= scale
+    clock = datetime.combine(day, time(8))
+    offsets = np.cumsum(gaps + lengths) - lengths
+    day_sessions = []
+    for i in range(sessions):
+        start = clock + timedelta(seconds=float(offsets[i]))
+        end = start + timedelta(seconds=float(lengths[i]))
+        app_name = names[app_index[i]]
+        day_sessions.append({
+            "app_name": app_name,
+            "start_time": start.isoformat(),
+            "end_time": end.isoformat(),
+            "duration_seconds": float(lengths[i]),
+            "was_active": bool(active[i]),
+            "date": day.isoformat(),
+            "window_title": f"{app_name[:-4].title()} - Document {title_index[i]}"
+        })
+    return day_sessions
+
+
+def write_ledger(data_dir, last_day=None, days=30, sessions_per_day=1000, apps=50, zipf_exponent=1.2, seed=1):
+    """Write `days` day files ending at last_day (default today); returns the days.
+
+    A marker file records the settings, so an existing ledger is reused.
+    """
+    data_dir = Path(data_dir)
+    last_day = last_day or date.today()
+    ledger_days = [last_day - timedelta(days=offset) for offset in range(days - 1, -1, -1)]
+    settings = [last_day.isoformat(), days, sessions_per_day, apps, zipf_exponent, seed]
+    marker = data_dir / ".synthetic_ledger.json"
+    if marker.exists() and json.loads(marker.read_text()) == settings:
+        return ledger_days
+
+    data_dir.mkdir(parents=True, exist_ok=True)
+    for day in ledger_days:
+        data = {
+            "date": day.isoformat(),
+            "app_sessions": generate_day(day, sessions_per_day, apps, zipf_exponent, seed=seed),
+            "storage_snapshot": None,
+            "location_data": {},
+            "last_updated": datetime.combine(day, time(23, 59)).isoformat()
+        }
+        with open(data_dir / f"{day.isoformat()}.json", 'w') as f:
+            json.dump(data, f, indent=2)
+    marker.write_text(json.dumps(settings))
+    return ledger_days
+
+
+def build_tree(root, files, depth, fanout, file_size):
+    """Create a balanced tree of directories holding `files` small files (reused if present)"""
+    root = Path(root)
+    marker = root / f".bench_{files}_{depth}_{fanout}_{file_size}"
+    if marker.exists():
+        return
+
+    leaves = [root]
+    for _ in range(depth):
+        leaves = [parent / f"d{i}" for parent in leaves for i in range(fanout)]
+    for leaf in leaves:
+        leaf.mkdir(parents=True, exist_ok=True)
+
+    payload = b"x" * file_size
+    for i in range(files):
+        with open(leaves[i % len(leaves)] / f"f{i}.bin", "wb") as f:
+            f.write(payload)
+
+    marker.touch()
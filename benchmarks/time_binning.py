@@ -0,0 +1,71 @@
+"""Benchmark the vectorized interval binning kernel against a per-session loop.
+
+Usage:
+    python benchmarks/time_binning.py --sessions 1000000 --bucket hour
+
+Sessions are synthetic and back to back, with lengths drawn
+so that many cross minute, quarter-hour and hour boundaries.
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.synthetic import make_intervals
+from utils.time_binning import BUCKET_SECONDS, bin_intervals
+
+
+def loop_binning(starts, ends, groups, bucket_seconds, n_buckets, n_groups):
+    """Split each session bucket by bucket in Python"""
+    occupancy = [[0.0] * n_buckets for _ in range(n_groups)]
+    for start, end, group in zip(starts.tolist(), ends.tolist(), groups.tolist()):
+        row = occupancy[group]
+        while start < end:
+            bucket = int(start // bucket_seconds)
+            if bucket >= n_buckets:
+                break
+            boundary = min(end, (bucket + 1) * bucket_seconds)
+            row[bucket] += boundary - start
+            start = boundary
+    return np.array(occupancy)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=1_000_000)
+    parser.add_argument("--apps", type=int, default=50)
+    parser.add_argument("--bucket", choices=sorted(BUCKET_SECONDS), default="hour")
+    parser.add_argument("--skip-loop", action="store_true")
+    args = parser.parse_args()
+
+    starts, ends, groups = make_intervals(args.sessions, args.apps)
+    bucket_seconds = BUCKET_SECONDS[args.bucket]
+    n_buckets = int(np.ceil(ends[-1] / bucket_seconds))
+    print(f"{args.sessions:,} sessions over {ends[-1] / 86400:.1f} days, "
+          f"{n_buckets:,} {args.bucket} buckets x {args.apps} apps")
+
+    started = time.perf_counter()
+    binned = bin_intervals(starts, ends, bucket_seconds, n_buckets, groups=groups, n_groups=args.apps)
+    vectorized = time.perf_counter() - started
+    print(f"vectorized: {vectorized:.3f}s  {args.sessions / vectorized:,.0f} sessions/s")
+
+    total = ends[-1] - starts[0]
+    if not np.isclose(binned.sum(), total):
+        print(f"WARNING: binned {binned.sum():.1f}s of {total:.1f}s")
+
+    if not args.skip_loop:
+        started = time.perf_counter()
+        expected = loop_binning(starts, ends, groups, bucket_seconds, n_buckets, args.apps)
+        elapsed = time.perf_counter() - started
+        print(f"python loop: {elapsed:.3f}s  {args.sessions / elapsed:,.0f} sessions/s")
+        print(f"speedup: {elapsed / vectorized:.1f}x")
+        if not np.allclose(binned, expected):
+            print(f"WARNING: max bucket difference {np.abs(binned - expected).max():.6f}s")
+
+
+if __name__ == "__main__":
+    main()
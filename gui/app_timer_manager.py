@@ -1,6 +1,7 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 from datetime import datetime
+from utils.event_bus import ALERT, APP_BLOCKED, LIMITS_CHANGED, SESSION_CLOSED
 
 class AppTimerManager:
     def __init__(self, parent_frame, data_manager, app_timer, app_blocker):
@@ -9,8 +10,15 @@ class AppTimerManager:
         self.app_timer = app_timer
         self.app_blocker = app_blocker
         
+        # Row values currently shown, by app (the app name is the row id)
+        self.timer_rows = {}
+        
         self.create_widgets()
         self.update_display()
+        
+        # Refresh when usage, limits or blocks change instead of polling
+        for topic in (SESSION_CLOSED, ALERT, APP_BLOCKED, LIMITS_CHANGED):
+            self.data_manager.events.subscribe(topic, lambda payload: self.update_display())
     
     def create_widgets(self):
         """Create app timer management widgets"""
@@ -125,8 +133,7 @@ class AppTimerManager:
             messagebox.showwarning("Warning", "Please select a timer to remove")
             return
         
-        item = self.timer_tree.item(selection[0])
-        app_name = item['values'][0]
+        app_name = selection[0]  # rows are keyed by app name
         
         # Confirm removal
         if messagebox.askyesno("Confirm", f"Remove timer for {app_name}?"):
@@ -142,8 +149,7 @@ class AppTimerManager:
             messagebox.showwarning("Warning", "Please select an app to unblock")
             return
         
-        item = self.timer_tree.item(selection[0])
-        app_name = item['values'][0]
+        app_name = selection[0]  # rows are keyed by app name
         
         if messagebox.askyesno("Confirm", f"Unblock {app_name}? (Timer will remain active)"):
             self.app_blocker.unblock_app(app_name)
@@ -151,42 +157,45 @@ class AppTimerManager:
             messagebox.showinfo("Success", f"{app_name} has been unblocked")
     
     def update_display(self):
-        """Update the timer display"""
-        # Clear existing items
-        for item in self.timer_tree.get_children():
-            self.timer_tree.delete(item)
-        
+        """Update the timer display, touching only rows whose values changed"""
         # Get timer status
         timer_status = self.app_timer.get_app_limits_status()
         
-        # Populate treeview
+        # Drop rows for removed timers
+        for app_name in list(self.timer_rows):
+            if app_name not in timer_status:
+                self.timer_tree.delete(app_name)
+                del self.timer_rows[app_name]
+        
         for app_name, status in timer_status.items():
-            # Determine status color and text
+            # Determine status text
             if status['status'] == 'exceeded':
-                status_text = "BLOCKED"
+                status_text = "🚫 BLOCKED"
                 # Check if app should be blocked
                 if not self.app_blocker.is_app_blocked(app_name):
                     self.app_blocker.block_app(app_name)
+            elif status['percentage_used'] > 80:
+                status_text = "⚠️ WARNING"
             else:
-                status_text = "ACTIVE"
+                status_text = "✅ ACTIVE"
             
-            # Insert row
-            item_id = self.timer_tree.insert("", tk.END, values=(
+            values = (
                 app_name,
                 f"{status['limit_hours']:.1f}",
                 f"{status['usage_hours']:.1f}",
                 f"{status['remaining_hours']:.1f}",
                 status_text,
                 f"{status['percentage_used']:.1f}%"
-            ))
+            )
             
-            # Color code based on status
-            if status['status'] == 'exceeded':
-                self.timer_tree.set(item_id, "Status", "🚫 BLOCKED")
-            elif status['percentage_used'] > 80:
-                self.timer_tree.set(item_id, "Status", "⚠️ WARNING")
-            else:
-                self.timer_tree.set(item_id, "Status", "✅ ACTIVE")
+            shown = self.timer_rows.get(app_name)
+            if shown is None:
+                self.timer_tree.insert("", tk.END, iid=app_name, values=values)
+            elif shown != values:
+                for column, old, new in zip(self.timer_tree["columns"], shown, values):
+                    if old != new:
+                        self.timer_tree.set(app_name, column, new)
+            self.timer_rows[app_name] = values
         
         # Update blocked apps display
         blocked_apps = self.app_blocker.get_blocked_apps_list()
@@ -194,7 +203,5 @@ class AppTimerManager:
             blocked_text = f"Currently blocked: {', '.join(blocked_apps)}"
         else:
             blocked_text = "No apps currently blocked"
-        self.blocked_apps_var.set(blocked_text)
-        
-        # Schedule next update
-        self.parent_frame.after(5000, self.update_display)  # Update every 5 seconds
+        if self.blocked_apps_var.get() != blocked_text:
+            self.blocked_apps_var.set(blocked_text)
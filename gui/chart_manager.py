@@ -0,0 +1,195 @@
+import tkinter as tk
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import matplotlib
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.colors import to_hex
+from matplotlib.figure import Figure
+from PIL import Image, ImageTk
+
+
+class Chart:
+    """A persistent figure for one chart view, rendered with Agg.
+
+    Views create their axes and artists once in a setup function and then
+    update them in place (set_height, set_ydata, ...) when the data
+    changes. `key` records which data the figure currently holds. Axes
+    registered in `markers` get a vertical marker line drawn by Tk over
+    the rendered image, so it can move without re-rendering.
+
+    Only the ChartManager's render thread touches the figure.
+    """
+
+    def __init__(self, figsize):
+        self.figure = Figure(figsize=figsize, layout="tight")
+        self.canvas = FigureCanvasAgg(self.figure)
+        self.artists = {}
+        self.markers = {}
+        self.key = None
+        self._message = None
+
+    def show_message(self, message):
+        """Hide the axes and show a centered message instead"""
+        for ax in self.figure.axes:
+            ax.set_visible(False)
+        if self._message is None:
+            self._message = self.figure.text(0.5, 0.5, message, ha='center', va='center', fontsize=16)
+        self._message.set_text(message)
+        self._message.set_visible(True)
+
+    def clear_message(self):
+        if self._message is not None:
+            self._message.set_visible(False)
+        for ax in self.figure.axes:
+            ax.set_visible(True)
+
+    def resize(self, width, height):
+        dpi = self.figure.dpi
+        self.figure.set_size_inches(width / dpi, height / dpi)
+
+    def render(self):
+        """Draw the figure; returns (RGBA bytes, (width, height), marker extents).
+
+        Marker extents map each marker to its axes' pixel box (left, top,
+        right, bottom, measured from the top left) and x limits.
+        """
+        self.canvas.draw()
+        width, height = self.canvas.get_width_height()
+        extents = {}
+        for name, ax in self.markers.items():
+            if ax.get_visible() and ax.figure is self.figure:
+                box = ax.bbox
+                extents[name] = (box.x0, height - box.y1, box.x1, height - box.y0, *ax.get_xlim())
+        return bytes(self.canvas.buffer_rgba()), (width, height), extents
+
+
+class ChartManager:
+    """Renders chart views off the Tk thread and shows them in one canvas.
+
+    show() only schedules work: requests are debounced, and a request
+    supersedes any earlier one still waiting or rendering. A single render
+    thread updates the view's persistent figure (if its data key changed)
+    and draws it with Agg at the canvas size; the pixels are handed back to
+    Tk with after() and shown as a PhotoImage. Finished images are cached
+    by (view, data key, size), so switching back to a view or tab whose
+    data hasn't changed shows it immediately.
+    """
+
+    def __init__(self, master, debounce_ms=100, cache_size=8):
+        self.master = master
+        self.debounce_ms = debounce_ms
+        self.cache_size = cache_size
+
+        background = to_hex(matplotlib.rcParams["figure.facecolor"])
+        self.surface = tk.Canvas(master, highlightthickness=0, bd=0, bg=background)
+        self.surface.pack(fill="both", expand=True)
+        self.surface.bind("<Configure>", lambda event: self._schedule())
+        self._image_item = self.surface.create_image(0, 0, anchor="nw")
+
+        self.views = {}    # name -> (setup, update, figsize)
+        self.charts = {}   # name -> Chart, created on the render thread
+        self.current = None
+        self.data_key = None
+
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="chart-render")
+        self._cache = OrderedDict()  # (name, data key, width, height) -> (PhotoImage, marker extents)
+        self._pending = None
+        self._token = 0
+        self._extents = {}
+        self._marker_positions = {}
+        self._marker_items = {}
+
+    def register(self, name, setup, update, figsize=(10, 6)):
+        """Add a view: setup(chart) builds its artists, update(chart) loads current data into them"""
+        self.views[name] = (setup, update, figsize)
+
+    def show(self, name, data_key):
+        """Show a view for the given data key, rendering it in the background if needed"""
+        self.current = name
+        self.data_key = data_key
+        self._schedule()
+
+    def set_marker(self, name, x):
+        """Move a marker line to data coordinate x (cheap: no re-render)"""
+        self._marker_positions[name] = x
+        self._draw_markers()
+
+    def _schedule(self):
+        if self._pending is not None:
+            self.master.after_cancel(self._pending)
+        self._pending = self.master.after(self.debounce_ms, self._start)
+
+    def _start(self):
+        self._pending = None
+        if self.current is None:
+            return
+        width, height = self.surface.winfo_width(), self.surface.winfo_height()
+        if width < 2 or height < 2:
+            return  # not mapped yet; <Configure> will ask again
+
+        # Anything already queued or rendering is now stale
+        self._token += 1
+        key = (self.current, self.data_key, width, height)
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            self._display(*self._cache[key])
+            return
+        self._executor.submit(self._render, self._token, key)
+
+    def _render(self, token, key):
+        """Render thread: update the figure if needed and draw it"""
+        if token != self._token:
+            return
+        name, data_key, width, height = key
+        setup, update, figsize = self.views[name]
+        try:
+            chart = self.charts.get(name)
+            if chart is None:
+                chart = self.charts[name] = Chart(figsize)
+                setup(chart)
+            chart.resize(width, height)
+            if chart.key != data_key:
+                update(chart)
+                chart.key = data_key
+            if token != self._token:
+                return
+            result = chart.render()
+        except Exception as e:
+            print(f"Chart render error ({name}): {e}")
+            return
+        try:
+            self.master.after(0, self._deliver, token, key, *result)
+        except RuntimeError:
+            pass  # main loop has exited
+
+    def _deliver(self, token, key, rgba, size, extents):
+        """Tk thread: turn rendered pixels into a PhotoImage and show it"""
+        image = Image.frombuffer("RGBA", size, rgba, "raw", "RGBA", 0, 1)
+        photo = ImageTk.PhotoImage(image, master=self.surface)
+        self._cache[key] = (photo, extents)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        if token == self._token:
+            self._display(photo, extents)
+
+    def _display(self, photo, extents):
+        self.surface.itemconfigure(self._image_item, image=photo)
+        self._extents = extents
+        self._draw_markers()
+
+    def _draw_markers(self):
+        for name, item in list(self._marker_items.items()):
+            if name not in self._extents:
+                self.surface.delete(item)
+                del self._marker_items[name]
+
+        for name, (left, top, right, bottom, xmin, xmax) in self._extents.items():
+            x = self._marker_positions.get(name)
+            if x is None or xmax == xmin:
+                continue
+            pixel = left + (x - xmin) / (xmax - xmin) * (right - left)
+            item = self._marker_items.get(name)
+            if item is None:
+                item = self._marker_items[name] = self.surface.create_line(
+                    0, 0, 0, 0, fill="red", dash=(4, 2))
+            self.surface.coords(item, pixel, top, pixel, bottom)
@@ -4,7 +4,10 @@ import threading
 from datetime import datetime
 from gui.visualization import DataVisualization
 from gui.timeline_view import TimelineView
+from gui.session_browser import SessionBrowser
 from gui.app_timer_manager import AppTimerManager
+from gui.ui_watchdog import UIWatchdog
+from utils.event_bus import ACTIVITY_CHANGED, RESOURCES_UPDATED, SESSION_CLOSED, STORAGE_SCAN_DONE
 from utils.report_generator import ReportGenerator
 from utils.startup_manager import StartupManager
 
@@ -16,7 +19,9 @@ class MainWindow:
         
         self.setup_window()
         self.create_widgets()
+        self.subscribe_events()
         self.start_updates()
+        self.watchdog.start()
         
         # Bind the window closing protocol to our custom handler
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
@@ -30,106 +35,124 @@ class MainWindow:
         self.root.grid_rowconfigure(0, weight=1)
         self.root.grid_columnconfigure(0, weight=1)
         
+        # Measures main loop lateness and records what caused stalls
+        self.watchdog = UIWatchdog(self.root, self.data_manager.data_dir / "diagnostics" / "ui_latency.jsonl")
+        
     def create_widgets(self):
         """Create main window widgets"""
         # Create notebook for tabs
-        self.notebook = ctk.CTkTabview(self.root)
+        self.notebook = ctk.CTkTabview(self.root, command=self.on_tab_changed)
         self.notebook.grid(row=0, column=0, sticky="nsew", padx=10, pady=10)
         
         # Create tabs
         self.create_dashboard_tab()
         self.create_charts_tab()
         self.create_timeline_tab()
+        self.create_sessions_tab()
         self.create_app_timers_tab()
         self.create_storage_tab()
         self.create_location_tab()
         self.create_reports_tab()
         self.create_settings_tab()
         
-    def _create_segmented_progress_bar(self, parent_frame, app_usage_data, total_time_seconds):
-        """Creates a segmented progress bar based on app usage."""
-        # Clear existing widgets in the progress bar frame
-        for widget in parent_frame.winfo_children():
-            widget.destroy()
-
-        if not app_usage_data or total_time_seconds == 0:
-            ctk.CTkLabel(parent_frame, text="No app usage data yet.", text_color="gray").pack(fill="x", pady=5)
-            return
-
-        # Sort apps by total time descending
-        sorted_apps = sorted(app_usage_data.items(), key=lambda item: item[1]['total_time'], reverse=True)
-
-        # Define a set of colors for the segments
-        colors = ["#2ECC71", "#3498DB", "#9B59B6", "#F1C40F", "#E67E22", "#E74C3C", "#1ABC9C", "#2C3E50"]
-        color_index = 0
-
-        # Create a frame to hold the segments, ensuring it has rounded corners
-        progress_bar_container = ctk.CTkFrame(parent_frame, fg_color="gray20", corner_radius=10, height=20)
-        progress_bar_container.pack(fill="x", pady=10, padx=10)
-        progress_bar_container.pack_propagate(False) # Prevent it from resizing based on children
-
-        # Use a grid layout for segments to ensure they fill the height
-        progress_bar_container.grid_rowconfigure(0, weight=1)
-
-        current_width_percentage = 0
-        for i, (app_name, data) in enumerate(sorted_apps):
-            segment_percentage = (data['total_time'] / total_time_seconds) * 100
-            
-            # Only show segments that are at least 1% to avoid tiny slivers
-            if segment_percentage < 1 and i < len(sorted_apps) - 1:
-                continue # Skip small segments unless it's the last one (for "Other")
-
-            # Assign color
-            segment_color = colors[color_index % len(colors)]
-            color_index += 1
-
-            # Create a frame for each segment
-            segment_frame = ctk.CTkFrame(progress_bar_container, fg_color=segment_color, corner_radius=0)
-            segment_frame.pack(side="left", fill="y", expand=True, ipadx=0, ipady=0)
-            
-            # Set width based on percentage. CustomTkinter pack doesn't directly support percentage width,
-            # so we'll rely on expand=True and the order of packing.
-            # For a more precise visual, we'd need to calculate exact pixel widths or use a canvas.
-            # For simplicity and visual effect, we'll use `pack` with `fill="y"` and `side="left"`.
-            # The `ipadx` and `ipady` are set to 0 to ensure no internal padding.
-            
-            # Store app name and color for the legend below
-            self.app_colors[app_name] = segment_color
-            
-            current_width_percentage += segment_percentage
-            if current_width_percentage >= 100:
-                break # Stop if we've filled the bar
-
-        # Add a small "remainder" segment if total is less than 100%
-        if current_width_percentage < 100:
-            remainder_frame = ctk.CTkFrame(progress_bar_container, fg_color="gray30", corner_radius=0)
-            remainder_frame.pack(side="left", fill="y", expand=True)
-
-        # Create a legend for the apps below the bar
+    # Colors for the usage bar segments, by rank; apps under 1% share "Other"
+    USAGE_COLORS = ["#2ECC71", "#3498DB", "#9B59B6", "#F1C40F", "#E67E22", "#E74C3C", "#1ABC9C", "#2C3E50"]
+    OTHER_COLOR = "gray30"
+    
+    def _build_usage_bar(self, parent_frame):
+        """Create the segmented usage bar and its legend once; updates only reconfigure them"""
+        self.usage_empty_label = ctk.CTkLabel(parent_frame, text="No app usage data yet.", text_color="gray")
+        
+        # One canvas; each segment is a rectangle item sized to its share
+        self.usage_canvas = ctk.CTkCanvas(parent_frame, height=20, bg="gray20", highlightthickness=0)
+        self.usage_canvas.pack(fill="x", pady=10, padx=10)
+        self.usage_canvas.bind("<Configure>", lambda event: self._layout_usage_bar())
+        self.usage_segments = []  # (app name, seconds, color)
+        self.usage_rects = {}     # app name -> canvas item
+        
+        # Legend rows for the top 3 apps
         legend_frame = ctk.CTkFrame(parent_frame, fg_color="transparent")
         legend_frame.pack(fill="x", pady=(5, 0), padx=10)
-        
-        # Clear existing legend items
-        for widget in legend_frame.winfo_children():
-            widget.destroy()
-
-        # Display top 3 apps with their colors and times
-        for i, (app_name, data) in enumerate(sorted_apps[:3]):
-            color = self.app_colors.get(app_name, "gray") # Get color from stored map
-            time_str = f"{int(data['total_time'] // 3600)}h {int((data['total_time'] % 3600) // 60)}m"
-            
-            app_row_frame = ctk.CTkFrame(legend_frame, fg_color="transparent")
-            app_row_frame.pack(fill="x", pady=2)
-
-            # Fix: Use ctk.ThemeManager.get_color to get a valid background color for CTkCanvas
-            # This ensures it's not "transparent" which CTkCanvas doesn't understand.
-            canvas_bg_color = "gray20"  # Safe default background
-            color_dot = ctk.CTkCanvas(app_row_frame, width=10, height=10, bg=canvas_bg_color, highlightthickness=0)
-            color_dot.create_oval(0, 0, 10, 10, fill=color, outline="")
-            color_dot.pack(side="left", padx=(0, 5))
-            
-            ctk.CTkLabel(app_row_frame, text=app_name, font=ctk.CTkFont(size=12)).pack(side="left", anchor="w")
-            ctk.CTkLabel(app_row_frame, text=time_str, font=ctk.CTkFont(size=12, weight="bold")).pack(side="right", anchor="e")
+        self.usage_legend_rows = []
+        for _ in range(3):
+            row = ctk.CTkFrame(legend_frame, fg_color="transparent")
+            dot = ctk.CTkCanvas(row, width=10, height=10, bg="gray20", highlightthickness=0)
+            oval = dot.create_oval(0, 0, 10, 10, fill="gray", outline="")
+            dot.pack(side="left", padx=(0, 5))
+            name_label = ctk.CTkLabel(row, text="", font=ctk.CTkFont(size=12))
+            name_label.pack(side="left", anchor="w")
+            time_label = ctk.CTkLabel(row, text="", font=ctk.CTkFont(size=12, weight="bold"))
+            time_label.pack(side="right", anchor="e")
+            self.usage_legend_rows.append({"frame": row, "dot": dot, "oval": oval, "name": name_label,
+                                           "time": time_label, "shown": False, "state": None})
+    
+    def _update_usage_bar(self, app_usage_data, total_time_seconds):
+        """Update the usage bar segments and legend in place"""
+        if not app_usage_data or total_time_seconds == 0:
+            self.usage_empty_label.pack(fill="x", pady=5, before=self.usage_canvas)
+            sorted_apps = []
+        else:
+            self.usage_empty_label.pack_forget()
+            # Sort apps by total time descending
+            sorted_apps = sorted(app_usage_data.items(), key=lambda item: item[1]['total_time'], reverse=True)
+        
+        segments = []
+        other = 0
+        for app_name, data in sorted_apps:
+            if data['total_time'] / total_time_seconds < 0.01:
+                other += data['total_time']
+                continue
+            color = self.USAGE_COLORS[len(segments) % len(self.USAGE_COLORS)]
+            segments.append((app_name, data['total_time'], color))
+            self.app_colors[app_name] = color
+        if other:
+            segments.append(("Other", other, self.OTHER_COLOR))
+        self.usage_segments = segments
+        self._layout_usage_bar()
+        
+        # Legend: top 3 apps with their colors and times
+        for i, row in enumerate(self.usage_legend_rows):
+            if i >= len(sorted_apps):
+                if row["shown"]:
+                    row["frame"].pack_forget()
+                    row["shown"] = False
+                continue
+            app_name, data = sorted_apps[i]
+            state = (app_name, self.app_colors.get(app_name, "gray"),
+                     f"{int(data['total_time'] // 3600)}h {int((data['total_time'] % 3600) // 60)}m")
+            if state != row["state"]:
+                row["dot"].itemconfigure(row["oval"], fill=state[1])
+                row["name"].configure(text=state[0])
+                row["time"].configure(text=state[2])
+                row["state"] = state
+            if not row["shown"]:
+                row["frame"].pack(fill="x", pady=2)
+                row["shown"] = True
+    
+    def _layout_usage_bar(self):
+        """Place the segment rectangles at widths proportional to their time"""
+        canvas = self.usage_canvas
+        width = canvas.winfo_width()
+        height = int(canvas.cget("height"))
+        total = sum(seconds for _, seconds, _ in self.usage_segments)
+        
+        x = 0.0
+        current = set()
+        for app_name, seconds, color in self.usage_segments:
+            x1 = x + width * seconds / total
+            rect = self.usage_rects.get(app_name)
+            if rect is None:
+                rect = canvas.create_rectangle(x, 0, x1, height, fill=color, width=0)
+                self.usage_rects[app_name] = rect
+            else:
+                canvas.coords(rect, x, 0, x1, height)
+                canvas.itemconfigure(rect, fill=color)
+            current.add(app_name)
+            x = x1
+        
+        for app_name in list(self.usage_rects):
+            if app_name not in current:
+                canvas.delete(self.usage_rects.pop(app_name))
 
     def create_dashboard_tab(self):
         """Create dashboard tab"""
@@ -137,6 +160,10 @@ class MainWindow:
         
         # Initialize app_colors dictionary
         self.app_colors = {}
+        
+        # Last values shown, so unchanged parts aren't redrawn
+        self.dashboard_generation = None
+        self.shown_text = {}
 
         # Current activity frame
         activity_frame = ctk.CTkFrame(tab)
@@ -156,6 +183,7 @@ class MainWindow:
 
         self.progress_bar_frame = ctk.CTkFrame(total_time_frame, fg_color="transparent")
         self.progress_bar_frame.pack(fill="x", pady=(0, 10)) # This frame will hold the segmented bar and legend
+        self._build_usage_bar(self.progress_bar_frame)
 
         # Stats frames (moved to row 2)
         stats_frame = ctk.CTkFrame(tab)
@@ -199,9 +227,6 @@ class MainWindow:
         """Create charts tab"""
         tab = self.notebook.add("📈 Charts")
         
-        # Create visualization component
-        self.visualization = DataVisualization(tab, self.data_manager)
-        
         # Control frame
         control_frame = ctk.CTkFrame(tab)
         control_frame.pack(fill="x", padx=10, pady=5)
@@ -219,6 +244,9 @@ class MainWindow:
         self.chart_frame = ctk.CTkFrame(tab)
         self.chart_frame.pack(fill="both", expand=True, padx=10, pady=5)
         
+        # Create visualization component (keeps one figure per chart in the chart frame)
+        self.visualization = DataVisualization(self.chart_frame, self.data_manager)
+        
     def create_timeline_tab(self):
         """Create timeline tab"""
         tab = self.notebook.add("⏰ Timeline")
@@ -226,6 +254,13 @@ class MainWindow:
         # Create timeline view
         self.timeline_view = TimelineView(tab, self.data_manager)
         
+    def create_sessions_tab(self):
+        """Create session browser tab"""
+        tab = self.notebook.add("🔎 Sessions")
+        
+        # Create session browser (loads when the tab is first shown)
+        self.session_browser = SessionBrowser(tab, self.data_manager)
+        
     def create_app_timers_tab(self):
         """Create app timers tab"""
         tab = self.notebook.add("⏱️ App Timers")
@@ -245,8 +280,12 @@ class MainWindow:
         ctk.CTkLabel(info_frame, text="Storage Analysis", font=ctk.CTkFont(size=16, weight="bold")).pack(pady=5)
         
         ctk.CTkButton(info_frame, text="Scan Storage", command=self.scan_storage).pack(side="left", padx=5)
+        ctk.CTkButton(info_frame, text="Cancel Scan", command=self.cancel_storage_scan).pack(side="left", padx=5)
         ctk.CTkButton(info_frame, text="Refresh", command=self.update_storage_display).pack(side="left", padx=5)
         
+        self.storage_progress_label = ctk.CTkLabel(info_frame, text="", text_color="gray")
+        self.storage_progress_label.pack(side="left", padx=10)
+        
         # Storage display
         self.storage_text = ctk.CTkTextbox(tab, height=400)
         self.storage_text.pack(fill="both", expand=True, padx=10, pady=5)
@@ -281,6 +320,8 @@ class MainWindow:
         button_frame.pack(fill="x", pady=5)
         
         ctk.CTkButton(button_frame, text="Daily Report", command=self.generate_daily_report).pack(side="left", padx=5)
+        ctk.CTkButton(button_frame, text="Weekly Report", command=lambda: self.generate_period_report("weekly")).pack(side="left", padx=5)
+        ctk.CTkButton(button_frame, text="Monthly Report", command=lambda: self.generate_period_report("monthly")).pack(side="left", padx=5)
         ctk.CTkButton(button_frame, text="Export CSV", command=self.export_csv).pack(side="left", padx=5)
         ctk.CTkButton(button_frame, text="Export JSON", command=self.export_json).pack(side="left", padx=5)
         
@@ -322,47 +363,67 @@ class MainWindow:
         ctk.CTkButton(data_frame, text="Clear All Data", command=self.clear_data).pack(side="left", padx=5)
         ctk.CTkButton(data_frame, text="Open Data Folder", command=self.open_data_folder).pack(side="left", padx=5)
         
+        # UI responsiveness diagnostics
+        diagnostics_frame = ctk.CTkFrame(tab)
+        diagnostics_frame.pack(fill="both", expand=True, padx=10, pady=5)
+        
+        ctk.CTkLabel(diagnostics_frame, text="UI Responsiveness", font=ctk.CTkFont(size=16, weight="bold")).pack(pady=5)
+        ctk.CTkButton(diagnostics_frame, text="Refresh", command=self.update_diagnostics).pack(anchor="w", padx=10, pady=2)
+        
+        self.diagnostics_text = ctk.CTkTextbox(diagnostics_frame, height=250, font=ctk.CTkFont(family="Courier"))
+        self.diagnostics_text.pack(fill="both", expand=True, padx=10, pady=5)
+        
     def show_app_usage_chart(self):
         """Show app usage pie chart"""
-        self.clear_chart_frame()
-        fig = self.visualization.create_app_usage_pie_chart()
-        if fig:
-            self.visualization.embed_chart_in_frame(fig, self.chart_frame)
+        self.visualization.show_chart("app_usage")
         
     def show_timeline_chart(self):
         """Show timeline chart"""
-        self.clear_chart_frame()
-        fig = self.visualization.create_timeline_chart()
-        if fig:
-            self.visualization.embed_chart_in_frame(fig, self.chart_frame)
+        self.visualization.show_chart("timeline")
         
     def show_resource_chart(self):
         """Show resource usage chart"""
-        self.clear_chart_frame()
-        fig = self.visualization.create_resource_usage_chart()
-        if fig:
-            self.visualization.embed_chart_in_frame(fig, self.chart_frame)
+        self.visualization.show_chart("resource")
         
     def show_storage_chart(self):
         """Show storage usage chart"""
-        self.clear_chart_frame()
-        fig = self.visualization.create_storage_usage_chart()
-        if fig:
-            self.visualization.embed_chart_in_frame(fig, self.chart_frame)
-        
-    def clear_chart_frame(self):
-        """Clear chart frame"""
-        for widget in self.chart_frame.winfo_children():
-            widget.destroy()
+        self.visualization.show_chart("storage")
     
     def scan_storage(self):
         """Start storage scan in background"""
-        def scan_thread():
-            self.app.storage_tracker.scan_storage_usage()
-            self.root.after(0, self.update_storage_display)
+        started = self.app.storage_tracker.start_scan(
+            progress_callback=lambda stats: self.root.after(0, self.update_storage_progress, stats),
+            done_callback=lambda completed: self.root.after(0, self.on_storage_scan_done, completed),
+            throttled=False
+        )
         
-        threading.Thread(target=scan_thread, daemon=True).start()
-        messagebox.showinfo("Storage Scan", "Storage scan started in background...")
+        if started:
+            self.storage_progress_label.configure(text="Scanning...")
+            messagebox.showinfo("Storage Scan", "Storage scan started in background...")
+        else:
+            messagebox.showinfo("Storage Scan", "A storage scan is already running.")
+    
+    def cancel_storage_scan(self):
+        """Cancel the running storage scan"""
+        self.app.storage_tracker.cancel_scan()
+    
+    def update_storage_progress(self, stats):
+        """Show live storage scan progress"""
+        self.storage_progress_label.configure(
+            text=f"Scanning... {stats['files']:,} files, {stats['bytes']/(1024**3):.2f} GB "
+                 f"({stats['files_per_sec']:,.0f} files/s)"
+        )
+    
+    def on_storage_scan_done(self, completed):
+        """Handle the end of a storage scan"""
+        if completed:
+            stats = self.app.storage_tracker.last_scan_stats
+            self.storage_progress_label.configure(
+                text=f"Scanned {stats.get('files', 0):,} files in {stats.get('elapsed_seconds', 0):.1f}s"
+            )
+        else:
+            self.storage_progress_label.configure(text="Scan cancelled")
+        self.update_storage_display()
     
     def update_storage_display(self):
         """Update storage display"""
@@ -385,10 +446,14 @@ class MainWindow:
         # App storage
         if 'app_storage' in storage_data:
             display_text += "=== Top Applications by Storage ===\n"
+            allocated = storage_data.get('app_storage_allocated', {})
             sorted_apps = sorted(storage_data['app_storage'].items(), key=lambda x: x[1], reverse=True)[:20]
             for app, size_mb in sorted_apps:
                 if size_mb > 1:  # Only show apps using more than 1MB
-                    display_text += f"{app}: {size_mb:.1f} MB\n"
+                    if app in allocated:
+                        display_text += f"{app}: {size_mb:.1f} MB ({allocated[app]:.1f} MB on disk)\n"
+                    else:
+                        display_text += f"{app}: {size_mb:.1f} MB\n"
         
         self.storage_text.delete("1.0", "end")
         self.storage_text.insert("1.0", display_text)
@@ -396,7 +461,7 @@ class MainWindow:
     def update_location(self):
         """Update location in background"""
         def location_thread():
-            self.app.location_tracker.update_location()
+            self.app.location_tracker.update_location(force=True, wait=True)
             self.root.after(0, self.update_location_display)
         
         threading.Thread(target=location_thread, daemon=True).start()
@@ -426,18 +491,53 @@ class MainWindow:
         self.location_text.insert("1.0", display_text)
     
     def generate_daily_report(self):
-        """Generate daily report"""
-        try:
-            report_generator = ReportGenerator(self.data_manager)
-            report_path = report_generator.generate_daily_report()
-            
-            self.report_text.delete("1.0", "end")
-            self.report_text.insert("1.0", f"Daily report generated successfully!\n\nReport saved to: {report_path}\n\nThe report contains:\n- Daily activity summary\n- App usage analysis\n- Productivity insights\n- Resource usage statistics\n- Timeline visualization\n\nOpen the HTML file in your browser to view the full report.")
-            
-            messagebox.showinfo("Report Generated", f"Daily report saved to:\n{report_path}")
-            
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to generate report: {str(e)}")
+        """Generate daily report in the background (reports read a snapshot, so tracking continues)"""
+        def report_thread():
+            try:
+                report_generator = ReportGenerator(self.data_manager)
+                report_path = report_generator.generate_daily_report()
+                self.root.after(0, self.on_daily_report_done, report_path, report_generator.last_report_cached)
+            except Exception as e:
+                self.root.after(0, messagebox.showerror, "Error", f"Failed to generate report: {str(e)}")
+        
+        threading.Thread(target=report_thread, daemon=True).start()
+    
+    def on_daily_report_done(self, report_path, cached=False):
+        """Show the result of a daily report"""
+        self.report_text.delete("1.0", "end")
+        if cached:
+            self.report_text.insert("1.0", f"Daily report is up to date (no new activity since it was generated).\n\nReport saved to: {report_path}")
+            messagebox.showinfo("Report Up to Date", f"Daily report saved to:\n{report_path}")
+            return
+        self.report_text.insert("1.0", f"Daily report generated successfully!\n\nReport saved to: {report_path}\n\nThe report contains:\n- Daily activity summary\n- App usage analysis\n- Productivity insights\n- Resource usage statistics\n- Timeline visualization\n\nOpen the HTML file in your browser to view the full report.")
+        
+        messagebox.showinfo("Report Generated", f"Daily report saved to:\n{report_path}")
+    
+    def generate_period_report(self, period):
+        """Generate a weekly or monthly report in the background"""
+        self.report_text.delete("1.0", "end")
+        self.report_text.insert("1.0", f"Generating {period} report...")
+        
+        def report_thread():
+            try:
+                report_generator = ReportGenerator(self.data_manager)
+                if period == "weekly":
+                    report_path = report_generator.generate_weekly_report()
+                else:
+                    report_path = report_generator.generate_monthly_report()
+                self.root.after(0, self.on_period_report_done, period, report_path, report_generator.last_rollup_stats)
+            except Exception as e:
+                self.root.after(0, messagebox.showerror, "Error", f"Failed to generate report: {str(e)}")
+        
+        threading.Thread(target=report_thread, daemon=True).start()
+    
+    def on_period_report_done(self, period, report_path, stats):
+        """Show the result of a weekly or monthly report"""
+        self.report_text.delete("1.0", "end")
+        self.report_text.insert("1.0", f"{period.capitalize()} report generated successfully!\n\nReport saved to: {report_path}\n\n"
+                                       f"Days included: {stats.get('days', 0)} ({stats.get('cached', 0)} from cache, "
+                                       f"{stats.get('computed', 0)} recomputed)\n\nOpen the HTML file in your browser to view the full report.")
+        messagebox.showinfo("Report Generated", f"{period.capitalize()} report saved to:\n{report_path}")
     
     def export_csv(self):
         """Export data to CSV"""
@@ -486,6 +586,7 @@ class MainWindow:
             try:
                 # Clear current session data
                 self.data_manager.app_sessions = []
+                self.data_manager.generation += 1
                 self.data_manager.storage_data = {}
                 self.data_manager.location_data = {}
                 
@@ -508,21 +609,35 @@ class MainWindow:
         else:
             messagebox.showerror("Error", "Data folder not found")
     
+    def _set_text(self, textbox, text):
+        """Replace a textbox's contents, unless it already shows this text"""
+        if self.shown_text.get(textbox) == text:
+            return
+        textbox.delete("1.0", "end")
+        textbox.insert("1.0", text)
+        self.shown_text[textbox] = text
+    
+    def update_current_activity(self, current_activity=None):
+        """Show the foreground app and idle state"""
+        current_activity = current_activity or self.data_manager.current_activity
+        if current_activity:
+            activity_text = f"Current App: {current_activity.get('app_name', 'Unknown')}\n"
+            activity_text += f"Window: {current_activity.get('window_title', 'Unknown')}\n"
+            activity_text += f"Status: {'Active' if not current_activity.get('is_idle', True) else 'Idle'}\n"
+            activity_text += f"Last Update: {current_activity.get('timestamp', 'Unknown')}"
+        else:
+            activity_text = "No current activity data available"
+        
+        self._set_text(self.current_activity_text, activity_text)
+    
     def update_dashboard(self):
-        """Update dashboard display"""
+        """Update dashboard display (session-based parts only when sessions changed)"""
         try:
-            # Update current activity
-            current_activity = self.data_manager.current_activity
-            if current_activity:
-                activity_text = f"Current App: {current_activity.get('app_name', 'Unknown')}\n"
-                activity_text += f"Window: {current_activity.get('window_title', 'Unknown')}\n"
-                activity_text += f"Status: {'Active' if not current_activity.get('is_idle', True) else 'Idle'}\n"
-                activity_text += f"Last Update: {current_activity.get('timestamp', 'Unknown')}"
-            else:
-                activity_text = "No current activity data available"
+            self.update_current_activity()
             
-            self.current_activity_text.delete("1.0", "end")
-            self.current_activity_text.insert("1.0", activity_text)
+            if self.data_manager.generation == self.dashboard_generation:
+                return
+            self.dashboard_generation = self.data_manager.generation
             
             # Update stats
             app_usage = self.data_manager.get_app_usage_summary()
@@ -542,7 +657,7 @@ class MainWindow:
             self.total_time_label.configure(text=f"{total_hours} h {total_minutes} m")
 
             # Update segmented progress bar
-            self._create_segmented_progress_bar(self.progress_bar_frame, app_usage, total_time_seconds)
+            self._update_usage_bar(app_usage, total_time_seconds)
 
             self.stats_labels['total_time'].configure(text=f"{total_time_seconds/3600:.1f}h")
             self.stats_labels['active_time'].configure(text=f"{active_time/3600:.1f}h")
@@ -561,22 +676,64 @@ class MainWindow:
             if not recent_sessions:
                 recent_text += "No recent activity"
             
-            self.recent_activity_text.delete("1.0", "end")
-            self.recent_activity_text.insert("1.0", recent_text)
+            self._set_text(self.recent_activity_text, recent_text)
             
         except Exception as e:
             print(f"Dashboard update error: {e}")
     
+    def subscribe_events(self):
+        """Receive tracker updates on the Tk thread as they happen"""
+        events = self.data_manager.events
+        events.attach(lambda callback: self.root.after(0, callback))
+        events.subscribe(ACTIVITY_CHANGED, self.update_current_activity)
+        events.subscribe(SESSION_CLOSED, lambda session: self.on_sessions_changed())
+        events.subscribe(STORAGE_SCAN_DONE, lambda result: self.update_storage_display())
+        events.subscribe(RESOURCES_UPDATED, lambda resource_data: self.on_resources_updated())
+    
+    def on_sessions_changed(self):
+        """Refresh the session-based views that are on screen"""
+        self.update_dashboard()
+        if self.notebook.get() == "⏰ Timeline":
+            self.timeline_view.refresh()
+        elif self.notebook.get() == "🔎 Sessions":
+            self.session_browser.refresh()
+    
+    def on_resources_updated(self):
+        if self.notebook.get() == "📈 Charts" and self.visualization.charts.current == "resource":
+            self.show_resource_chart()
+    
+    def on_tab_changed(self):
+        """Bring the newly shown tab up to date"""
+        if self.notebook.get() == "⏰ Timeline":
+            self.timeline_view.refresh()
+        elif self.notebook.get() == "🔎 Sessions":
+            self.session_browser.refresh()
+        elif self.notebook.get() == "⚙️ Settings":
+            self.update_diagnostics()
+    
+    def update_diagnostics(self):
+        """Show the UI latency histogram and recent stalls"""
+        self._set_text(self.diagnostics_text, self.watchdog.format_report())
+    
     def start_updates(self):
-        """Start periodic updates"""
+        """Start periodic updates.
+        
+        Data changes arrive as events; this slow tick only covers what
+        depends on the clock (the timeline's time marker, the day rolling over).
+        """
         self.update_dashboard()
-        self.root.after(5000, self.start_updates)  # Update every 5 seconds
+        if self.notebook.get() == "⏰ Timeline":
+            self.timeline_view.refresh()
+        elif self.notebook.get() == "⚙️ Settings":
+            self.update_diagnostics()
+        self.root.after(60000, self.start_updates)  # Update every minute
 
     def on_closing(self):
         """Handles the main window closing event for graceful shutdown."""
         if messagebox.askokcancel("Quit", "Do you want to quit TimeLedger?"):
             # Signal all background threads to stop
             self.app.stop_tracking()
+            self.watchdog.stop()
             
             # Stop the system tray icon gracefully
             if self.app.system_tray.icon:
@@ -587,5 +744,8 @@ class MainWindow:
             import time
             time.sleep(0.1) 
             
+            # Stop scheduling events onto the loop that is about to go away
+            self.data_manager.events.detach()
+            
             # Destroy the main window
             self.root.destroy()
@@ -0,0 +1,232 @@
+import tkinter as tk
+from tkinter import ttk
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from utils.session_index import SessionFilter, SessionIndex
+
+class SessionBrowser:
+    """Sortable, filterable list of every session in a date range.
+
+    The Treeview only ever holds as many rows as fit on screen: scrolling
+    moves an offset into the query result and refills those rows with the
+    page at that offset, so a year of sessions scrolls as smoothly as a
+    day. Loading the range, filtering and sorting run on a worker thread
+    (a newer query supersedes an older one) and the result is handed back
+    to Tk with after().
+    """
+
+    RANGES = {"Today": 0, "Last 7 days": 6, "Last 30 days": 29, "Last 90 days": 89, "Last 365 days": 364}
+    COLUMNS = (("start", "Start", 150), ("app", "Application", 170), ("category", "Category", 120),
+               ("duration", "Duration", 80), ("active", "Active", 60), ("title", "Window Title", 420))
+    ALL_CATEGORIES = "All categories"
+
+    def __init__(self, parent_frame, data_manager, debounce_ms=250):
+        self.parent_frame = parent_frame
+        self.data_manager = data_manager
+        self.debounce_ms = debounce_ms
+
+        self.index = SessionIndex(data_manager)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="session-query")
+        self._token = 0
+        self._pending = None
+        self._reset = False
+
+        self.result = None
+        self.offset = 0
+        self.visible = 0
+        self.shown_rows = []
+        self.sort_by = "start"
+        self.descending = True
+        self.query_generation = None
+
+        self.create_widgets()
+
+    def create_widgets(self):
+        """Create session browser widgets"""
+        # Filter controls
+        control_frame = ttk.Frame(self.parent_frame)
+        control_frame.pack(fill=tk.X, padx=10, pady=5)
+
+        ttk.Label(control_frame, text="Range:").pack(side=tk.LEFT, padx=5)
+        self.range_var = tk.StringVar(value="Today")
+        range_combo = ttk.Combobox(control_frame, textvariable=self.range_var, values=list(self.RANGES),
+                                   state="readonly", width=14)
+        range_combo.pack(side=tk.LEFT, padx=5)
+
+        ttk.Label(control_frame, text="App:").pack(side=tk.LEFT, padx=5)
+        self.app_var = tk.StringVar()
+        ttk.Entry(control_frame, textvariable=self.app_var, width=20).pack(side=tk.LEFT, padx=5)
+
+        ttk.Label(control_frame, text="Category:").pack(side=tk.LEFT, padx=5)
+        self.category_var = tk.StringVar(value=self.ALL_CATEGORIES)
+        self.category_combo = ttk.Combobox(control_frame, textvariable=self.category_var,
+                                           values=[self.ALL_CATEGORIES], state="readonly", width=16)
+        self.category_combo.pack(side=tk.LEFT, padx=5)
+
+        ttk.Label(control_frame, text="Min minutes:").pack(side=tk.LEFT, padx=5)
+        self.min_minutes_var = tk.StringVar(value="0")
+        ttk.Entry(control_frame, textvariable=self.min_minutes_var, width=6).pack(side=tk.LEFT, padx=5)
+
+        self.active_only_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(control_frame, text="Active only", variable=self.active_only_var).pack(side=tk.LEFT, padx=10)
+
+        for var in (self.range_var, self.app_var, self.category_var, self.min_minutes_var, self.active_only_var):
+            var.trace_add("write", lambda *args: self.schedule_query(reset=True))
+
+        self.status_var = tk.StringVar(value="")
+        ttk.Label(control_frame, textvariable=self.status_var).pack(side=tk.RIGHT, padx=5)
+
+        # Session list: a fixed set of rows refilled as the list scrolls
+        list_frame = ttk.Frame(self.parent_frame)
+        list_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+
+        self.session_tree = ttk.Treeview(list_frame, columns=[name for name, _, _ in self.COLUMNS],
+                                         show="headings", selectmode="none")
+        for name, heading, width in self.COLUMNS:
+            self.session_tree.heading(name, text=heading, command=lambda column=name: self.sort(column))
+            self.session_tree.column(name, width=width, stretch=(name == "title"))
+
+        self.scrollbar = ttk.Scrollbar(list_frame, orient=tk.VERTICAL, command=self.on_scrollbar)
+        self.session_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        self.session_tree.bind("<Configure>", self.on_resize)
+        self.session_tree.bind("<MouseWheel>", self.on_mousewheel)
+        self.session_tree.bind("<Button-4>", lambda event: self.scroll_to(self.offset - 3))
+        self.session_tree.bind("<Button-5>", lambda event: self.scroll_to(self.offset + 3))
+        self.session_tree.bind("<Prior>", lambda event: self.scroll_to(self.offset - self.visible))
+        self.session_tree.bind("<Next>", lambda event: self.scroll_to(self.offset + self.visible))
+        self.session_tree.bind("<Home>", lambda event: self.scroll_to(0))
+        self.session_tree.bind("<End>", lambda event: self.scroll_to(len(self.result or ())))
+        self._update_headings()
+
+    def refresh(self):
+        """Re-run the query if the sessions changed since the last one"""
+        if self.query_generation != self.data_manager.generation:
+            self.schedule_query()
+
+    def sort(self, column):
+        """Sort by a column; clicking it again reverses the order"""
+        if self.sort_by == column:
+            self.descending = not self.descending
+        else:
+            self.sort_by = column
+            self.descending = column in ("start", "duration")
+        self._update_headings()
+        self.schedule_query(reset=True)
+
+    def _update_headings(self):
+        for name, heading, _ in self.COLUMNS:
+            if name == self.sort_by:
+                heading += " ▼" if self.descending else " ▲"
+            self.session_tree.heading(name, text=heading)
+
+    def _filter(self):
+        """Read the filter controls (on the Tk thread)"""
+        try:
+            min_duration = max(0.0, float(self.min_minutes_var.get() or 0)) * 60
+        except ValueError:
+            min_duration = 0
+        category = self.category_var.get()
+        return SessionFilter(
+            app=self.app_var.get().strip(),
+            category=None if category == self.ALL_CATEGORIES else category,
+            min_duration=min_duration,
+            active_only=self.active_only_var.get(),
+            sort_by=self.sort_by,
+            descending=self.descending
+        )
+
+    def schedule_query(self, reset=False):
+        """Query again after a short pause (typing in the filters restarts it)"""
+        self._reset = self._reset or reset
+        if self._pending is not None:
+            self.parent_frame.after_cancel(self._pending)
+        self._pending = self.parent_frame.after(self.debounce_ms, self._start_query)
+
+    def _start_query(self):
+        self._pending = None
+        self._token += 1
+        last_day = date.today()
+        first_day = last_day - timedelta(days=self.RANGES.get(self.range_var.get(), 0))
+        self.query_generation = self.data_manager.generation
+        self.status_var.set("Loading sessions...")
+        self._executor.submit(self._run_query, self._token, first_day, last_day, self._filter(), self._reset)
+        self._reset = False
+
+    def _run_query(self, token, first_day, last_day, session_filter, reset):
+        """Worker thread: load the range and run the query"""
+        if token != self._token:
+            return
+        try:
+            self.index.load(first_day, last_day)
+            if token != self._token:
+                return
+            result = self.index.query(session_filter)
+        except Exception as e:
+            print(f"Session query error: {e}")
+            return
+        try:
+            self.parent_frame.after(0, self._deliver, token, result, reset)
+        except RuntimeError:
+            pass  # main loop has exited
+
+    def _deliver(self, token, result, reset):
+        """Tk thread: show a finished query"""
+        if token != self._token:
+            return
+        self.result = result
+
+        categories = [self.ALL_CATEGORIES] + sorted(result.category_names)
+        if list(self.category_combo["values"]) != categories:
+            self.category_combo.configure(values=categories)
+
+        hours = result.total_seconds / 3600
+        self.status_var.set(f"{len(result):,} of {result.searched:,} sessions, {hours:.1f}h")
+        self.scroll_to(0 if reset else self.offset, force=True)
+
+    def on_resize(self, event):
+        """Hold as many rows as fit in the list"""
+        row_height = int(ttk.Style().lookup("Treeview", "rowheight") or 20)
+        visible = max(1, event.height // row_height - 1)  # less the heading
+        if visible != self.visible:
+            self.visible = visible
+            self.scroll_to(self.offset, force=True)
+
+    def on_scrollbar(self, action, amount, unit=None):
+        total = len(self.result or ())
+        if action == "moveto":
+            self.scroll_to(int(float(amount) * total))
+        elif unit == "pages":
+            self.scroll_to(self.offset + int(amount) * self.visible)
+        else:
+            self.scroll_to(self.offset + int(amount))
+
+    def on_mousewheel(self, event):
+        self.scroll_to(self.offset - int(event.delta / 120) * 3)
+
+    def scroll_to(self, offset, force=False):
+        """Show the rows from offset on, refilling only cells that change"""
+        total = len(self.result or ())
+        offset = max(0, min(offset, total - self.visible))
+        if offset == self.offset and not force:
+            return
+        self.offset = offset
+
+        rows = self.result.page(offset, self.visible) if self.result is not None else []
+
+        # Keep exactly one tree item per visible row (ids are row positions)
+        for position in range(len(self.shown_rows), len(rows)):
+            self.session_tree.insert("", tk.END, iid=str(position), values=rows[position])
+        for position in range(len(rows), len(self.shown_rows)):
+            self.session_tree.delete(str(position))
+
+        for position, (old, new) in enumerate(zip(self.shown_rows, rows)):
+            if old != new:
+                self.session_tree.item(str(position), values=new)
+        self.shown_rows = rows
+
+        if total:
+            self.scrollbar.set(offset / total, min(1.0, (offset + self.visible) / total))
+        else:
+            self.scrollbar.set(0, 1)
@@ -78,16 +78,25 @@ class SystemTrayManager:
             from utils.report_generator import ReportGenerator
             report_gen = ReportGenerator(self.app.data_manager)
             report_path = report_gen.generate_daily_report()
-            self.show_notification("TimeLedger", f"Report generated: {report_path}")
+            status = "up to date" if report_gen.last_report_cached else "generated"
+            self.show_notification("TimeLedger", f"Report {status}: {report_path}")
         except Exception as e:
             self.show_notification("TimeLedger", f"Report error: {str(e)}")
     
+    def on_timer_status(self, icon, item):
+        """Show today's app timer status"""
+        try:
+            self.show_notification("TimeLedger - App Timers", self.app.app_timer.format_limits_status())
+        except Exception as e:
+            self.show_notification("TimeLedger", f"Timer status error: {str(e)}")
+    
     def create_menu(self):
         """Create system tray menu"""
         return pystray.Menu(
             pystray.MenuItem("Show/Hide Window", self.on_show_hide),
             pystray.MenuItem("Privacy Mode", self.on_privacy_mode),
             pystray.MenuItem("Generate Report", self.on_generate_report),
+            pystray.MenuItem("Timer Status", self.on_timer_status),
             pystray.Menu.SEPARATOR,
             pystray.MenuItem("Quit", self.on_quit)
         )
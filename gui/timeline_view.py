@@ -1,10 +1,11 @@
 import tkinter as tk
 from tkinter import ttk
 import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import matplotlib.dates as mdates
+from matplotlib.patches import Patch
 from datetime import datetime, timedelta
 import numpy as np
+from gui.chart_manager import ChartManager
+from utils.time_binning import bin_intervals, coalesce_intervals, day_origin, duration_weights, session_arrays
 
 class TimelineView:
     def __init__(self, parent_frame, data_manager):
@@ -36,45 +37,34 @@ class TimelineView:
         # Timeline frame
         self.timeline_frame = ttk.Frame(self.parent_frame)
         self.timeline_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+        
+        # One persistent figure per view, rendered off the Tk thread
+        self.charts = ChartManager(self.timeline_frame)
+        self.charts.register("hourly", self.setup_hourly_timeline, self.update_hourly_timeline, (12, 8))
+        self.charts.register("detailed", self.setup_detailed_timeline, self.update_detailed_timeline, (14, 8))
+        self.charts.register("apps", self.setup_apps_timeline, self.update_apps_timeline, (14, 8))
     
     def on_view_changed(self, event=None):
         """Handle view selection change"""
         self.current_view = self.view_var.get()
         self.update_timeline()
     
-    def create_hourly_timeline(self):
-        """Create hourly activity timeline"""
-        sessions = self.data_manager.app_sessions
-        
-        if not sessions:
-            return self.create_empty_chart("No activity data available")
-        
-        # Group sessions by hour
-        hourly_data = {}
-        for hour in range(24):
-            hourly_data[hour] = {"total": 0, "active": 0, "apps": set()}
-        
-        for session in sessions:
-            start_time = datetime.fromisoformat(session['start_time'])
-            if start_time.date() == datetime.now().date():  # Today only
-                hour = start_time.hour
-                duration = session['duration_seconds'] / 3600  # Convert to hours
-                
-                hourly_data[hour]["total"] += duration
-                if session['was_active']:
-                    hourly_data[hour]["active"] += duration
-                hourly_data[hour]["apps"].add(session['app_name'])
-        
-        # Create chart
-        fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(12, 8))
-        
+    def _data_key(self):
+        """What a view's contents depend on: the session data and the day"""
+        return (self.data_manager.generation, datetime.now().date())
+    
+    def _now_hour(self):
+        now = datetime.now()
+        return now.hour + now.minute / 60 + now.second / 3600
+    
+    def setup_hourly_timeline(self, chart):
+        ax1, ax2 = chart.figure.subplots(2, 1)
         hours = list(range(24))
-        total_times = [hourly_data[h]["total"] for h in hours]
-        active_times = [hourly_data[h]["active"] for h in hours]
+        chart.artists.update(ax1=ax1, ax2=ax2)
         
         # Total activity chart
-        ax1.bar(hours, total_times, alpha=0.7, color='skyblue', label='Total Time')
-        ax1.bar(hours, active_times, alpha=0.9, color='orange', label='Active Time')
+        chart.artists["total"] = ax1.bar(hours, [0] * 24, alpha=0.7, color='skyblue', label='Total Time')
+        chart.artists["active"] = ax1.bar(hours, [0] * 24, alpha=0.9, color='orange', label='Active Time')
         ax1.set_xlabel('Hour of Day')
         ax1.set_ylabel('Time (Hours)')
         ax1.set_title('Hourly Activity Timeline - Today')
@@ -83,84 +73,117 @@ class TimelineView:
         ax1.set_xticks(range(0, 24, 2))
         
         # App count chart
-        app_counts = [len(hourly_data[h]["apps"]) for h in hours]
-        ax2.plot(hours, app_counts, marker='o', color='green', linewidth=2)
+        chart.artists["apps"], = ax2.plot(hours, [0] * 24, marker='o', color='green', linewidth=2)
         ax2.set_xlabel('Hour of Day')
         ax2.set_ylabel('Number of Apps Used')
         ax2.set_title('Apps Used Per Hour')
         ax2.grid(True, alpha=0.3)
         ax2.set_xticks(range(0, 24, 2))
         
-        plt.tight_layout()
-        return fig
+        # Current time marker, drawn by Tk over the rendered chart
+        chart.markers["now"] = ax1
     
-    def create_detailed_timeline(self):
-        """Create detailed minute-by-minute timeline"""
+    def update_hourly_timeline(self, chart):
+        """Update hourly activity timeline"""
         sessions = self.data_manager.app_sessions
         
         if not sessions:
-            return self.create_empty_chart("No activity data available")
-        
-        # Filter today's sessions
-        today_sessions = []
-        today = datetime.now().date()
-        
-        for session in sessions:
-            start_time = datetime.fromisoformat(session['start_time'])
-            if start_time.date() == today:
-                today_sessions.append(session)
-        
-        if not today_sessions:
-            return self.create_empty_chart("No activity data for today")
-        
-        # Create timeline chart
-        fig, ax = plt.subplots(figsize=(14, 8))
-        
-        # Color map for different apps
-        apps = list(set(s['app_name'] for s in today_sessions))
-        colors = plt.cm.Set3(np.linspace(0, 1, len(apps)))
-        app_colors = dict(zip(apps, colors))
+            return chart.show_message("No activity data available")
+        chart.clear_message()
+        
+        # Split each session across the clock hours it spans (today only)
+        arrays = session_arrays(sessions, group_by="app")
+        weights = duration_weights(arrays.starts, arrays.ends, arrays.durations)
+        origin = day_origin(datetime.now().date())
+        by_app = bin_intervals(arrays.starts, arrays.ends, 3600, 24, origin,
+                               arrays.groups, len(arrays.names), weights)
+        by_activity = bin_intervals(arrays.starts, arrays.ends, 3600, 24, origin,
+                                    arrays.active.astype(np.int64), 2, weights)
+        
+        total_times = by_app.sum(axis=0) / 3600  # Convert to hours
+        active_times = by_activity[1] / 3600
+        for bar, height in zip(chart.artists["total"], total_times):
+            bar.set_height(height)
+        for bar, height in zip(chart.artists["active"], active_times):
+            bar.set_height(height)
+        chart.artists["apps"].set_ydata((by_app > 0).sum(axis=0))
+        
+        for ax in (chart.artists["ax1"], chart.artists["ax2"]):
+            ax.relim()
+            ax.autoscale_view()
+    
+    def setup_detailed_timeline(self, chart):
+        chart.artists["ax"] = chart.figure.subplots()
+        chart.markers["now"] = chart.artists["ax"]
+    
+    def update_detailed_timeline(self, chart):
+        """Update detailed timeline, one lane per app"""
+        sessions = self.data_manager.app_sessions
         
-        y_pos = 0
-        for session in sorted(today_sessions, key=lambda x: x['start_time']):
-            start_time = datetime.fromisoformat(session['start_time'])
-            end_time = datetime.fromisoformat(session['end_time'])
-            
-            # Convert to hours from start of day
-            start_hour = start_time.hour + start_time.minute/60 + start_time.second/3600
-            end_hour = end_time.hour + end_time.minute/60 + end_time.second/3600
-            
-            color = app_colors[session['app_name']]
-            alpha = 0.8 if session['was_active'] else 0.4
-            
-            ax.barh(y_pos, end_hour - start_hour, left=start_hour, 
-                   color=color, alpha=alpha, height=0.8,
-                   label=session['app_name'] if session['app_name'] not in ax.get_legend_handles_labels()[1] else "")
-            
-            y_pos += 1
+        if not sessions:
+            return chart.show_message("No activity data available")
+        
+        # Hours since midnight, clipped to today
+        arrays = session_arrays(sessions, group_by="app")
+        origin = day_origin(datetime.now().date())
+        starts = np.clip((arrays.starts - origin) / 3600, 0, 24)
+        ends = np.clip((arrays.ends - origin) / 3600, 0, 24)
+        today = ends > starts
+        
+        if not today.any():
+            return chart.show_message("No activity data for today")
+        chart.clear_message()
+        
+        # Lanes ordered by time used, busiest at the top
+        totals = np.bincount(arrays.groups[today], weights=(ends - starts)[today], minlength=len(arrays.names))
+        lanes = [index for index in np.argsort(-totals, kind="stable") if totals[index] > 0]
+        
+        # Lanes come and go with the data, so the axes are redrawn (the figure is kept)
+        fig = chart.figure
+        ax = chart.artists["ax"]
+        ax.clear()
+        
+        # Intervals closer than a pixel are drawn as one bar
+        plot_pixels = fig.get_size_inches()[0] * fig.dpi * ax.get_position().width
+        resolution = 24 / plot_pixels
+        
+        colors = plt.cm.Set3(np.linspace(0, 1, len(lanes)))
+        handles = []
+        for y_pos, (group, color) in enumerate(zip(lanes, colors)):
+            in_lane = today & (arrays.groups == group)
+            # One collection per lane; active time is drawn over idle time
+            bars, facecolors = [], []
+            for active, alpha in ((False, 0.4), (True, 0.8)):
+                selected = in_lane & (arrays.active == active)
+                run_starts, run_ends = coalesce_intervals(starts[selected], ends[selected], resolution)
+                bars.extend(zip(run_starts, np.maximum(run_ends - run_starts, resolution)))
+                facecolors.extend([(*color[:3], alpha)] * len(run_starts))
+            ax.broken_barh(bars, (y_pos - 0.4, 0.8), facecolors=facecolors, linewidth=0)
+            handles.append(Patch(color=color, label=arrays.names[group]))
         
         ax.set_xlabel('Time of Day (Hours)')
-        ax.set_ylabel('Activity Sessions')
+        ax.set_ylabel('Application')
         ax.set_title('Detailed Activity Timeline - Today')
         ax.set_xlim(0, 24)
         ax.set_xticks(range(0, 25, 2))
         ax.set_xticklabels([f"{h:02d}:00" for h in range(0, 25, 2)])
+        ax.set_ylim(len(lanes) - 0.5, -0.5)
+        ax.set_yticks(range(len(lanes)))
+        ax.set_yticklabels([arrays.names[group][:20] for group in lanes])
         
         # Add legend (limit to 10 apps)
-        handles, labels = ax.get_legend_handles_labels()
-        if len(handles) > 10:
-            handles, labels = handles[:10], labels[:10]
-        ax.legend(handles, labels, bbox_to_anchor=(1.05, 1), loc='upper left')
-        
-        plt.tight_layout()
-        return fig
+        ax.legend(handles=handles[:10], bbox_to_anchor=(1.05, 1), loc='upper left')
+
+    
+    def setup_apps_timeline(self, chart):
+        chart.artists["ax1"], chart.artists["ax2"] = chart.figure.subplots(1, 2)
     
-    def create_apps_timeline(self):
-        """Create app-focused timeline"""
+    def update_apps_timeline(self, chart):
+        """Update app-focused timeline"""
         sessions = self.data_manager.app_sessions
         
         if not sessions:
-            return self.create_empty_chart("No activity data available")
+            return chart.show_message("No activity data available")
         
         # Get app usage data
         app_usage = {}
@@ -179,13 +202,16 @@ class TimelineView:
                 app_usage[app_name]["sessions"].append(session)
         
         if not app_usage:
-            return self.create_empty_chart("No activity data for today")
+            return chart.show_message("No activity data for today")
+        chart.clear_message()
         
         # Sort apps by usage time
         sorted_apps = sorted(app_usage.items(), key=lambda x: x[1]["total"], reverse=True)[:10]
         
-        # Create chart
-        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 8))
+        # The apps shown change with the data, so both axes are redrawn
+        ax1, ax2 = chart.artists["ax1"], chart.artists["ax2"]
+        ax1.clear()
+        ax2.clear()
         
         # App usage pie chart
         app_names = [app[0] for app in sorted_apps]
@@ -212,39 +238,22 @@ class TimelineView:
                            rotation=45, ha='right')
         ax2.legend()
         ax2.grid(True, alpha=0.3)
-        
-        plt.tight_layout()
-        return fig
-    
-    def create_empty_chart(self, message):
-        """Create empty chart with message"""
-        fig, ax = plt.subplots(figsize=(10, 6))
-        ax.text(0.5, 0.5, message, ha='center', va='center', fontsize=16, 
-                transform=ax.transAxes)
-        ax.set_xlim(0, 1)
-        ax.set_ylim(0, 1)
-        ax.axis('off')
-        return fig
     
     def update_timeline(self):
-        """Update timeline based on current view"""
-        # Clear existing widgets
-        for widget in self.timeline_frame.winfo_children():
-            widget.destroy()
-        
-        # Create appropriate timeline
-        if self.current_view == "hourly":
-            fig = self.create_hourly_timeline()
-        elif self.current_view == "detailed":
-            fig = self.create_detailed_timeline()
-        elif self.current_view == "apps":
-            fig = self.create_apps_timeline()
+        """Update timeline based on current view (rendered in the background when the data changed)"""
+        if self.current_view not in self.charts.views:
+            return
+        self.charts.show(self.current_view, self._data_key())
+        self._move_now_marker()
+    
+    def _move_now_marker(self):
+        # Hourly bars are centered on the hour, so hour h spans h - 0.5 to h + 0.5
+        offset = 0.5 if self.current_view == "hourly" else 0
+        self.charts.set_marker("now", self._now_hour() - offset)
+    
+    def refresh(self):
+        """Periodic refresh: re-render the view if the data changed, else just move the time marker"""
+        if self.charts.data_key != self._data_key():
+            self.update_timeline()
         else:
-            fig = self.create_empty_chart("Invalid view selected")
-        
-        # Embed chart
-        if fig:
-            canvas = FigureCanvasTkAgg(fig, self.timeline_frame)
-            canvas.draw()
-            canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-            plt.close(fig)  # Free memory
+            self._move_now_marker()
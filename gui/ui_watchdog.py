@@ -0,0 +1,250 @@
+import json
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import Counter, deque
+from datetime import datetime
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+
+# Upper bounds (ms) of the lateness histogram buckets; the last one catches the rest
+LATENESS_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, float("inf"))
+
+# Functions that only pass callbacks on; a stall is blamed on what they called
+DISPATCHERS = {"EventBus.drain", "EventBus.publish"}
+
+_PACKAGE_ROOT = str(Path(__file__).resolve().parent.parent)
+
+
+class UIWatchdog:
+    """Measures how responsive the Tk main loop is and explains stalls.
+
+    A heartbeat is scheduled with root.after every interval_ms. How late
+    each one runs is how long the loop was busy elsewhere, and goes into a
+    histogram. A sampler thread watches the heartbeat: once it is more than
+    stall_ms overdue, the main thread is stuck in a callback, so it takes
+    stack samples of it (sys._current_frames) until the heartbeat runs
+    again. Each stall is attributed to the app function the toolkit (or the
+    event bus) called - e.g. MainWindow.update_dashboard or
+    ChartManager._deliver - and written with its most common stack to a
+    rolling JSON-lines log, along with a histogram summary every minute.
+    """
+
+    def __init__(self, root, log_path, interval_ms=50, stall_ms=200, max_samples=20,
+                 max_log_bytes=1024 * 1024, log_backups=3, summary_seconds=60):
+        self.root = root
+        self.interval_ms = interval_ms
+        self.stall_ms = stall_ms
+        self.max_samples = max_samples
+        self.summary_seconds = summary_seconds
+
+        self.histogram = [0] * len(LATENESS_BUCKETS_MS)
+        self.beats = 0
+        self.max_lateness_ms = 0.0
+        self.stalls = deque(maxlen=50)  # most recent first
+        self.by_callback = {}           # callback -> {"stalls", "total_ms", "max_ms"}
+
+        self.running = False
+        self._lock = threading.Lock()
+        self._main_thread = None
+        self._expected = None
+        self._samples = []
+        self._after_id = None
+        self._last_summary = time.monotonic()
+
+        self.log_path = Path(log_path)
+        self._logger = logging.getLogger(f"timeledger.ui_watchdog.{self.log_path}")
+        self._logger.propagate = False
+        self._logger.setLevel(logging.INFO)
+        if not self._logger.handlers:
+            try:
+                self.log_path.parent.mkdir(parents=True, exist_ok=True)
+                handler = RotatingFileHandler(self.log_path, maxBytes=max_log_bytes,
+                                              backupCount=log_backups, encoding="utf-8")
+                handler.setFormatter(logging.Formatter("%(message)s"))
+                self._logger.addHandler(handler)
+            except Exception as e:
+                print(f"Error opening UI latency log: {e}")
+
+    def start(self):
+        """Start the heartbeat (call from the Tk thread)"""
+        if self.running:
+            return
+        self.running = True
+        self._main_thread = threading.get_ident()
+        self._expected = time.monotonic() + self.interval_ms / 1000
+        self._after_id = self.root.after(self.interval_ms, self._beat)
+        threading.Thread(target=self._sample_loop, name="ui-watchdog", daemon=True).start()
+
+    def stop(self):
+        self.running = False
+        if self._after_id is not None:
+            try:
+                self.root.after_cancel(self._after_id)
+            except Exception:
+                pass
+            self._after_id = None
+        self._log_summary()
+
+    def _beat(self):
+        """Tk thread: record how late this heartbeat ran"""
+        now = time.monotonic()
+        with self._lock:
+            lateness_ms = max(0.0, (now - self._expected) * 1000)
+            samples, self._samples = self._samples, []
+            self._expected = now + self.interval_ms / 1000
+
+        self.beats += 1
+        self.max_lateness_ms = max(self.max_lateness_ms, lateness_ms)
+        for bucket, bound in enumerate(LATENESS_BUCKETS_MS):
+            if lateness_ms <= bound:
+                self.histogram[bucket] += 1
+                break
+
+        if lateness_ms >= self.stall_ms or samples:
+            self._record_stall(lateness_ms, samples)
+        if now - self._last_summary >= self.summary_seconds:
+            self._log_summary()
+
+        if self.running:
+            self._after_id = self.root.after(self.interval_ms, self._beat)
+
+    def _sample_loop(self):
+        """Sampler thread: sample the main thread's stack while the heartbeat is overdue"""
+        while self.running:
+            time.sleep(self.interval_ms / 1000)
+            with self._lock:
+                overdue_ms = (time.monotonic() - self._expected) * 1000
+                if overdue_ms < self.stall_ms or len(self._samples) >= self.max_samples:
+                    continue
+                frame = sys._current_frames().get(self._main_thread)
+                if frame is not None:
+                    self._samples.append(self._describe(frame))
+                del frame
+
+    @staticmethod
+    def _describe(frame):
+        """Return (callback, stack lines) for a main-thread frame.
+
+        The callback is the first app function entered from outside the app
+        (Tk, customtkinter) below the main loop, skipping dispatchers and
+        lambdas that only forward the call.
+        """
+        stack = traceback.extract_stack(frame)
+        frames = []
+        while frame is not None:
+            frames.append(frame)
+            frame = frame.f_back
+        frames.reverse()
+
+        callback = None
+        entered_toolkit = False
+        for outer in frames:
+            code = outer.f_code
+            in_app = code.co_filename.startswith(_PACKAGE_ROOT)
+            if not in_app:
+                entered_toolkit = True
+                continue
+            name = getattr(code, "co_qualname", code.co_name)
+            if entered_toolkit and name not in DISPATCHERS and code.co_name != "<lambda>":
+                callback = name
+                break
+        if callback is None and frames:
+            code = frames[-1].f_code
+            callback = getattr(code, "co_qualname", code.co_name)
+
+        lines = [f"{Path(entry.filename).name}:{entry.lineno} {entry.name}" for entry in stack[-15:]]
+        return callback, tuple(lines)
+
+    def _record_stall(self, lateness_ms, samples):
+        if samples:
+            # Blame the callback seen most, and keep its most common stack
+            callback = Counter(callback for callback, _ in samples).most_common(1)[0][0]
+            stack, count = Counter(stack for name, stack in samples if name == callback).most_common(1)[0]
+        else:
+            callback, stack, count = "unknown (too short to sample)", (), 0
+
+        stall = {
+            "type": "stall",
+            "time": datetime.now().isoformat(timespec="seconds"),
+            "lag_ms": round(lateness_ms, 1),
+            "callback": callback,
+            "samples": len(samples),
+            "stack_share": round(count / len(samples), 2) if samples else 0,
+            "stack": list(stack)
+        }
+        self.stalls.appendleft(stall)
+
+        totals = self.by_callback.setdefault(callback, {"stalls": 0, "total_ms": 0.0, "max_ms": 0.0})
+        totals["stalls"] += 1
+        totals["total_ms"] += lateness_ms
+        totals["max_ms"] = max(totals["max_ms"], lateness_ms)
+
+        self._logger.info(json.dumps(stall))
+
+    def percentile(self, fraction):
+        """Approximate lateness percentile: the upper bound of the bucket it falls in"""
+        if not self.beats:
+            return 0.0
+        target = fraction * self.beats
+        seen = 0
+        for bound, count in zip(LATENESS_BUCKETS_MS, self.histogram):
+            seen += count
+            if seen >= target:
+                return min(bound, self.max_lateness_ms)
+        return self.max_lateness_ms
+
+    def summary(self):
+        return {
+            "type": "summary",
+            "time": datetime.now().isoformat(timespec="seconds"),
+            "beats": self.beats,
+            "interval_ms": self.interval_ms,
+            "p50_ms": round(self.percentile(0.5), 1),
+            "p95_ms": round(self.percentile(0.95), 1),
+            "p99_ms": round(self.percentile(0.99), 1),
+            "max_ms": round(self.max_lateness_ms, 1),
+            "histogram": {("inf" if bound == float("inf") else f"<={bound}"): count
+                          for bound, count in zip(LATENESS_BUCKETS_MS, self.histogram)},
+            "stalls": sum(totals["stalls"] for totals in self.by_callback.values())
+        }
+
+    def _log_summary(self):
+        self._last_summary = time.monotonic()
+        if self.beats:
+            self._logger.info(json.dumps(self.summary()))
+
+    def format_report(self, recent=5):
+        """Text summary for the diagnostics panel"""
+        summary = self.summary()
+        lines = [
+            f"Heartbeats: {summary['beats']:,} (every {self.interval_ms} ms)",
+            f"Lateness: p50 {summary['p50_ms']:.0f} ms, p95 {summary['p95_ms']:.0f} ms, "
+            f"p99 {summary['p99_ms']:.0f} ms, max {summary['max_ms']:.0f} ms",
+            "",
+            "Lateness histogram:"
+        ]
+        for bound, count in zip(LATENESS_BUCKETS_MS, self.histogram):
+            label = f"<= {bound} ms" if bound != float("inf") else f"> {LATENESS_BUCKETS_MS[-2]} ms"
+            share = count / self.beats * 100 if self.beats else 0
+            lines.append(f"  {label:>10}  {count:>8,}  {share:5.1f}%")
+
+        lines += ["", f"Stalls over {self.stall_ms} ms by callback:"]
+        ranked = sorted(self.by_callback.items(), key=lambda item: item[1]["total_ms"], reverse=True)
+        for callback, totals in ranked:
+            lines.append(f"  {callback}: {totals['stalls']} stalls, {totals['total_ms'] / 1000:.1f}s total, "
+                         f"worst {totals['max_ms']:.0f} ms")
+        if not ranked:
+            lines.append("  None")
+
+        if self.stalls:
+            lines += ["", "Recent stalls:"]
+            for stall in list(self.stalls)[:recent]:
+                lines.append(f"  {stall['time']}  {stall['lag_ms']:.0f} ms  {stall['callback']}")
+                for line in stall["stack"][-4:]:
+                    lines.append(f"      {line}")
+
+        lines += ["", f"Log: {self.log_path}"]
+        return "\n".join(lines)
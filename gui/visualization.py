@@ -1,8 +1,8 @@
 import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import matplotlib.dates as mdates
 from datetime import datetime, timedelta
 import numpy as np
+from gui.chart_manager import ChartManager
+from utils.time_binning import duration_weights, hour_of_day_occupancy, session_arrays
 
 class DataVisualization:
     def __init__(self, parent_frame, data_manager):
@@ -12,23 +12,49 @@ class DataVisualization:
         # Set matplotlib style
         plt.style.use('dark_background')
         
-    def create_app_usage_pie_chart(self):
-        """Create pie chart of app usage"""
+        # One persistent figure per chart, rendered off the Tk thread
+        self.charts = ChartManager(parent_frame)
+        self.charts.register("app_usage", self.setup_app_usage_pie_chart, self.update_app_usage_pie_chart, (8, 6))
+        self.charts.register("timeline", self.setup_timeline_chart, self.update_timeline_chart, (12, 6))
+        self.charts.register("resource", self.setup_resource_usage_chart, self.update_resource_usage_chart, (12, 8))
+        self.charts.register("storage", self.setup_storage_usage_chart, self.update_storage_usage_chart, (10, 6))
+    
+    def show_chart(self, name):
+        """Show one of the charts ("app_usage", "timeline", "resource", "storage").
+        
+        The data key says what the chart depends on; it's re-rendered in the
+        background only when that changed (or the window was resized).
+        """
+        if name == "app_usage":
+            key = self.data_manager.generation
+        elif name == "timeline":
+            key = (self.data_manager.generation, datetime.now().hour)
+        elif name == "resource":
+            key = (getattr(self.data_manager, 'resource_data', None) or {}).get('timestamp')
+        else:
+            key = (self.data_manager.storage_data or {}).get('last_scan')
+        self.charts.show(name, key)
+    
+    def setup_app_usage_pie_chart(self, chart):
+        chart.artists["ax"] = chart.figure.subplots()
+    
+    def update_app_usage_pie_chart(self, chart):
+        """Redraw the pie chart of app usage"""
         app_usage = self.data_manager.get_app_usage_summary()
-        
         if not app_usage:
-            return None
+            chart.show_message("No app usage data yet")
+            return
+        chart.clear_message()
         
         # Prepare data
         apps = list(app_usage.keys())[:10]  # Top 10 apps
         times = [app_usage[app]['total_time'] / 3600 for app in apps]  # Convert to hours
         
-        # Create figure
-        fig, ax = plt.subplots(figsize=(8, 6))
-        
-        # Create pie chart
+        # The wedge count changes with the data, so the pie is redrawn on the same axes
+        ax = chart.artists["ax"]
+        ax.clear()
         colors = plt.cm.Set3(np.linspace(0, 1, len(apps)))
-        wedges, texts, autotexts = ax.pie(times, labels=apps, autopct='%1.1f%%', 
+        wedges, texts, autotexts = ax.pie(times, labels=apps, autopct='%1.1f%%',
                                          colors=colors, startangle=90)
         
         ax.set_title('App Usage Distribution (Today)', fontsize=14, fontweight='bold')
@@ -38,80 +64,75 @@ class DataVisualization:
             autotext.set_color('white')
             autotext.set_fontweight('bold')
         
-        plt.tight_layout()
-        return fig
     
-    def create_timeline_chart(self):
-        """Create timeline chart of daily activity"""
-        sessions = self.data_manager.app_sessions
-        
-        if not sessions:
-            return None
-        
-        # Group sessions by hour
-        hourly_usage = {}
-        for session in sessions:
-            start_time = datetime.fromisoformat(session['start_time'])
-            hour = start_time.hour
-            
-            if hour not in hourly_usage:
-                hourly_usage[hour] = 0
-            hourly_usage[hour] += session['duration_seconds'] / 3600  # Convert to hours
-        
-        # Create figure
-        fig, ax = plt.subplots(figsize=(12, 6))
-        
+    def setup_timeline_chart(self, chart):
+        ax = chart.figure.subplots()
         hours = list(range(24))
-        usage = [hourly_usage.get(hour, 0) for hour in hours]
-        
-        # Create bar chart
-        bars = ax.bar(hours, usage, color='skyblue', alpha=0.7)
-        
-        # Highlight current hour
-        current_hour = datetime.now().hour
-        if current_hour < len(bars):
-            bars[current_hour].set_color('orange')
+        chart.artists["ax"] = ax
+        chart.artists["bars"] = ax.bar(hours, [0] * 24, color='skyblue', alpha=0.7)
         
         ax.set_xlabel('Hour of Day')
         ax.set_ylabel('Usage (Hours)')
         ax.set_title('Daily Activity Timeline', fontsize=14, fontweight='bold')
         ax.set_xticks(hours[::2])  # Show every 2 hours
         ax.grid(True, alpha=0.3)
-        
-        plt.tight_layout()
-        return fig
     
-    def create_resource_usage_chart(self):
-        """Create resource usage chart"""
-        resource_data = getattr(self.data_manager, 'resource_data', {})
+    def update_timeline_chart(self, chart):
+        """Update the hourly usage bars in place"""
+        current_hour = datetime.now().hour
         
-        if not resource_data or 'system' not in resource_data:
-            return None
+        sessions = self.data_manager.app_sessions
+        if not sessions:
+            chart.show_message("No activity data yet")
+            return
+        chart.clear_message()
         
-        system_data = resource_data['system']
+        # Split each session across the clock hours it spans
+        arrays = session_arrays(sessions, group_by=None)
+        weights = duration_weights(arrays.starts, arrays.ends, arrays.durations)
+        hourly_usage = hour_of_day_occupancy(arrays.starts, arrays.ends, weights=weights)[0]
+        usage = hourly_usage / 3600  # Convert to hours
         
-        # Create figure with subplots
-        fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(12, 8))
+        # Highlight current hour
+        for hour, (bar, height) in enumerate(zip(chart.artists["bars"], usage)):
+            bar.set_height(height)
+            bar.set_color('orange' if hour == current_hour else 'skyblue')
+        
+        ax = chart.artists["ax"]
+        ax.relim()
+        ax.autoscale_view()
+    
+    def setup_resource_usage_chart(self, chart):
+        (ax1, ax2), (ax3, ax4) = chart.figure.subplots(2, 2)
+        chart.artists["ax4"] = ax4
+        
+        # CPU, memory and disk usage bars, resized on each update
+        for ax, label, title, color in ((ax1, 'CPU', 'CPU Usage', 'red'),
+                                        (ax2, 'Memory', 'Memory Usage', 'blue'),
+                                        (ax3, 'Disk', 'Disk Usage', 'green')):
+            chart.artists[label] = ax.bar([label], [0], color=color, alpha=0.7)[0]
+            ax.set_ylabel('Percentage')
+            ax.set_title(title)
+            ax.set_ylim(0, 100)
+    
+    def update_resource_usage_chart(self, chart):
+        """Update the resource usage bars in place"""
+        resource_data = getattr(self.data_manager, 'resource_data', {})
         
-        # CPU Usage
-        ax1.bar(['CPU'], [system_data.get('cpu_percent', 0)], color='red', alpha=0.7)
-        ax1.set_ylabel('Percentage')
-        ax1.set_title('CPU Usage')
-        ax1.set_ylim(0, 100)
+        if not resource_data or 'system' not in resource_data:
+            chart.show_message("No resource data yet")
+            return
         
-        # Memory Usage
-        ax2.bar(['Memory'], [system_data.get('memory_percent', 0)], color='blue', alpha=0.7)
-        ax2.set_ylabel('Percentage')
-        ax2.set_title('Memory Usage')
-        ax2.set_ylim(0, 100)
+        chart.clear_message()
         
-        # Disk Usage
-        ax3.bar(['Disk'], [system_data.get('disk_percent', 0)], color='green', alpha=0.7)
-        ax3.set_ylabel('Percentage')
-        ax3.set_title('Disk Usage')
-        ax3.set_ylim(0, 100)
+        system_data = resource_data['system']
+        chart.artists['CPU'].set_height(system_data.get('cpu_percent', 0))
+        chart.artists['Memory'].set_height(system_data.get('memory_percent', 0))
+        chart.artists['Disk'].set_height(system_data.get('disk_percent', 0))
         
-        # Top Processes (CPU)
+        # Top Processes (CPU); names change, so this axis is redrawn
+        ax4 = chart.artists["ax4"]
+        ax4.clear()
         if 'processes' in resource_data:
             processes = resource_data['processes'][:5]  # Top 5
             proc_names = [p['name'][:10] for p in processes]  # Truncate names
@@ -120,29 +141,27 @@ class DataVisualization:
             ax4.barh(proc_names, proc_cpu, color='orange', alpha=0.7)
             ax4.set_xlabel('CPU %')
             ax4.set_title('Top Processes (CPU)')
-        
-        plt.tight_layout()
-        return fig
     
-    def create_storage_usage_chart(self):
-        """Create storage usage visualization"""
+    def setup_storage_usage_chart(self, chart):
+        chart.artists["ax"] = chart.figure.subplots()
+    
+    def update_storage_usage_chart(self, chart):
+        """Redraw the storage usage bars"""
         storage_data = self.data_manager.storage_data
         
-        if not storage_data or 'app_storage' not in storage_data:
-            return None
-        
-        app_storage = storage_data['app_storage']
-        
+        app_storage = storage_data.get('app_storage', {}) if storage_data else {}
         # Get top 10 apps by storage
         sorted_apps = sorted(app_storage.items(), key=lambda x: x[1], reverse=True)[:10]
         
         if not sorted_apps:
-            return None
+            chart.show_message("No storage data yet")
+            return
+        chart.clear_message()
         
         apps, sizes = zip(*sorted_apps)
         
-        # Create figure
-        fig, ax = plt.subplots(figsize=(10, 6))
+        ax = chart.artists["ax"]
+        ax.clear()
         
         # Create horizontal bar chart
         bars = ax.barh(apps, sizes, color='purple', alpha=0.7)
@@ -153,19 +172,6 @@ class DataVisualization:
         # Add value labels on bars
         for i, bar in enumerate(bars):
             width = bar.get_width()
-            ax.text(width + max(sizes) * 0.01, bar.get_y() + bar.get_height()/2, 
+            ax.text(width + max(sizes) * 0.01, bar.get_y() + bar.get_height()/2,
                    f'{width:.1f} MB', ha='left', va='center')
         
-        plt.tight_layout()
-        return fig
-    
-    def embed_chart_in_frame(self, fig, frame):
-        """Embed matplotlib figure in tkinter frame"""
-        if fig is None:
-            return None
-        
-        canvas = FigureCanvasTkAgg(fig, frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill="both", expand=True)
-        
-        return canvas
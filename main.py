@@ -1,4 +1,5 @@
 import customtkinter as ctk
+import multiprocessing
 import threading
 import json
 import os
@@ -25,7 +26,7 @@ class TimeLedgerApp:
         
         # Initialize trackers
         self.activity_tracker = ActivityTracker(self.data_manager)
-        self.storage_tracker = StorageTracker(self.data_manager)
+        self.storage_tracker = StorageTracker(self.data_manager, live_watch=True)
         self.location_tracker = LocationTracker(self.data_manager)
         
         # Initialize enhanced trackers
@@ -70,6 +71,7 @@ class TimeLedgerApp:
         self.resource_monitor.stop_monitoring()
         self.app_timer.stop_monitoring()
         self.app_blocker.stop_blocking()
+        self.storage_tracker.stop_watching()
             
     def toggle_privacy_mode(self):
         """Toggle privacy mode on/off"""
@@ -86,13 +88,12 @@ class TimeLedgerApp:
                 # Track active window and app usage (every 2 seconds)
                 self.activity_tracker.track_current_activity()
                 
-                # Update location (every 30 minutes)
-                if datetime.now().minute % 30 == 0:
-                    self.location_tracker.update_location()
+                # Refresh location in the background when stale or the network changed
+                self.location_tracker.update_location()
                 
-                # Update storage usage (every hour)
-                if datetime.now().minute == 0:
-                    self.storage_tracker.scan_storage_usage()
+                # Update storage usage (every hour, throttled on its own thread)
+                if self.storage_tracker.is_scan_due():
+                    self.storage_tracker.start_scan()
                     
                 # Save data periodically
                 self.data_manager.save_daily_data()
@@ -115,9 +116,12 @@ class TimeLedgerApp:
         self.root.mainloop()
 
 if __name__ == "__main__":
+    # Report workers are spawned; a frozen build must hand them off here
+    multiprocessing.freeze_support()
     app = TimeLedgerApp()
     app.run()
 import customtkinter as ctk
+import multiprocessing
 import threading
 import json
 import os
@@ -144,7 +148,7 @@ class TimeLedgerApp:
         
         # Initialize trackers
         self.activity_tracker = ActivityTracker(self.data_manager)
-        self.storage_tracker = StorageTracker(self.data_manager)
+        self.storage_tracker = StorageTracker(self.data_manager, live_watch=True)
         self.location_tracker = LocationTracker(self.data_manager)
         
         # Initialize enhanced trackers
@@ -189,6 +193,7 @@ class TimeLedgerApp:
         self.resource_monitor.stop_monitoring()
         self.app_timer.stop_monitoring()
         self.app_blocker.stop_blocking()
+        self.storage_tracker.stop_watching()
             
     def toggle_privacy_mode(self):
         """Toggle privacy mode on/off"""
@@ -205,13 +210,12 @@ class TimeLedgerApp:
                 # Track active window and app usage (every 2 seconds)
                 self.activity_tracker.track_current_activity()
                 
-                # Update location (every 30 minutes)
-                if datetime.now().minute % 30 == 0:
-                    self.location_tracker.update_location()
+                # Refresh location in the background when stale or the network changed
+                self.location_tracker.update_location()
                 
-                # Update storage usage (every hour)
-                if datetime.now().minute == 0:
-                    self.storage_tracker.scan_storage_usage()
+                # Update storage usage (every hour, throttled on its own thread)
+                if self.storage_tracker.is_scan_due():
+                    self.storage_tracker.start_scan()
                     
                 # Save data periodically
                 self.data_manager.save_daily_data()
@@ -234,5 +238,7 @@ class TimeLedgerApp:
         self.root.mainloop()
 
 if __name__ == "__main__":
+    # Report workers are spawned; a frozen build must hand them off here
+    multiprocessing.freeze_support()
     app = TimeLedgerApp()
     app.run()
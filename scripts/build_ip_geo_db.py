@@ -0,0 +1,53 @@
+"""Build the offline IP geolocation database used by OfflineIpProvider.
+
+Usage:
+    python scripts/build_ip_geo_db.py ranges.csv data/ip_geo.bin
+    python scripts/build_ip_geo_db.py --synthetic 1000 data/ip_geo.bin
+    python scripts/build_ip_geo_db.py --lookup 10.0.3.7 data/ip_geo.bin
+
+The CSV holds start,end,city,country,timezone rows; start and end are
+dotted IPv4 addresses or integers, end inclusive.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from tracker.ip_geo_db import IpRangeDatabase, build_database, write_synthetic_csv
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("csv", nargs="?", help="input CSV of IP ranges")
+    parser.add_argument("output", help="database file to write (or read with --lookup)")
+    parser.add_argument("--synthetic", type=int, metavar="RANGES",
+                        help="build from a generated CSV of RANGES adjacent 10.x ranges")
+    parser.add_argument("--lookup", metavar="IP", help="look up one address in an existing database")
+    args = parser.parse_args()
+
+    if args.lookup:
+        with IpRangeDatabase(args.output) as database:
+            started = time.perf_counter()
+            location = database.lookup(args.lookup)
+            elapsed = time.perf_counter() - started
+        print(f"{args.lookup}: {location} ({elapsed * 1e6:.1f} µs)")
+        return
+
+    csv_path = args.csv
+    if args.synthetic:
+        csv_path = os.path.join(tempfile.gettempdir(), f"timeledger_ip_ranges_{args.synthetic}.csv")
+        write_synthetic_csv(csv_path, args.synthetic)
+    elif not csv_path:
+        parser.error("a CSV file or --synthetic is required")
+
+    started = time.perf_counter()
+    count = build_database(csv_path, args.output)
+    print(f"Wrote {count} ranges to {args.output} in {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
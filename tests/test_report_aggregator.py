@@ -0,0 +1,51 @@
+import json
+import time
+
+from utils.report_aggregator import iter_day_sessions
+
+
+def _session(i):
+    return {
+        "app_name": f"app{i % 7}.exe",
+        "start_time": f"2026-01-01T08:{i % 60:02d}:00",
+        "end_time": f"2026-01-01T08:{i % 60:02d}:30",
+        "duration_seconds": 30.0,
+        "was_active": i % 2 == 0,
+        "window_title": f'Doc "{i}" [draft] {{x}} \\ end'
+    }
+
+
+def _write_day(path, sessions, storage_data):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({
+            "date": "2026-01-01",
+            "storage_data": storage_data,
+            "app_sessions": sessions,
+            "location_data": {"city": "a \"quoted\" }] name"},
+            "last_updated": "2026-01-01T23:59:00"
+        }, f, indent=2)
+
+
+def test_skips_large_non_session_values(tmp_path):
+    # Several MB of nested storage data ahead of the sessions, like older day files
+    storage_data = {
+        "app_storage": {f"C:\\Program Files\\app{i}\\{{bin}}\"[x]": i * 1.5 for i in range(60000)},
+        "nested": [[{"k": [i, str(i), None, True]}] for i in range(20000)]
+    }
+    sessions = [_session(i) for i in range(500)]
+    path = tmp_path / "2026-01-01.json"
+    _write_day(path, sessions, storage_data)
+    assert path.stat().st_size > 4 * 1024 * 1024
+
+    started = time.perf_counter()
+    assert list(iter_day_sessions(path)) == sessions
+    # Linear in the file size: well under a second here, not tens of seconds
+    assert time.perf_counter() - started < 5
+
+
+def test_small_chunks_split_strings_and_escapes(tmp_path):
+    sessions = [_session(i) for i in range(50)]
+    path = tmp_path / "2026-01-01.json"
+    _write_day(path, sessions, {"app_storage": {"a\\\"b": 1, "c": "\\\\"}, "count": 12345})
+    for chunk_size in (1, 2, 3, 7, 64):
+        assert list(iter_day_sessions(path, chunk_size=chunk_size)) == sessions
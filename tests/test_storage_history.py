@@ -0,0 +1,25 @@
+from utils.storage_history import StorageHistory
+
+
+def _scan(when, size, used):
+    return {"app_storage": {"app": size}, "disk_usage": {"C:": {"used": used}},
+            "scan_stats": {"files": used}, "last_scan": when}
+
+
+def test_unchanged_scans_resolve_by_scan_time(tmp_path):
+    history = StorageHistory(tmp_path, min_change_mb=1.0)
+    history.record(_scan("2026-01-01T10:00:00", 100, 1))
+    monday = (history.current_hash, history.current_scan)
+    # Later days move nothing, so every line shares the first snapshot hash
+    history.record(_scan("2026-01-02T10:00:00", 100.2, 2))
+    tuesday = (history.current_hash, history.current_scan)
+    history.record(_scan("2026-01-03T10:00:00", 100.4, 3))
+    assert monday[0] == tuesday[0] == history.current_hash
+
+    reloaded = StorageHistory(tmp_path, min_change_mb=1.0)
+    assert reloaded.load_snapshot(*monday)["last_scan"] == "2026-01-01T10:00:00"
+    assert reloaded.load_snapshot(*tuesday)["disk_usage"] == {"C:": {"used": 2}}
+    # A day file's last_updated bounds the lookup the same way
+    assert reloaded.load_snapshot(monday[0], "2026-01-01T23:59:00")["scan_stats"] == {"files": 1}
+    assert reloaded.load_snapshot()["last_scan"] == "2026-01-03T10:00:00"
+    assert reloaded.load_snapshot(monday[0])["app_storage"] == {"app": 100}
@@ -0,0 +1,58 @@
+import threading
+
+import pytest
+
+from tracker.storage_scanner import DirectoryScanner, ScanCancelled
+from tracker.storage_tracker import StorageTracker
+from utils.data_manager import DataManager
+
+
+def _make_tree(root):
+    for app in ("alpha", "beta"):
+        (root / app / "sub").mkdir(parents=True)
+        (root / app / "sub" / "file.bin").write_bytes(b"x" * 1000)
+
+
+def test_cancel_before_walk_stops_scan(tmp_path):
+    scan_root = tmp_path / "apps"
+    _make_tree(scan_root)
+    tracker = StorageTracker(DataManager(tmp_path / "data"), scan_roots=[str(scan_root)],
+                             throttle_entries_per_sec=0)
+
+    # Hold the scan thread before the walk starts, then cancel
+    reached = threading.Event()
+    release = threading.Event()
+    get_disk_usage = tracker.get_disk_usage
+
+    def held_disk_usage():
+        reached.set()
+        release.wait(5)
+        return get_disk_usage()
+
+    tracker.get_disk_usage = held_disk_usage
+    results = []
+    assert tracker.start_scan(done_callback=results.append)
+    assert reached.wait(5)
+    tracker.cancel_scan()
+    release.set()
+    tracker._scan_thread.join(5)
+
+    assert results == [False]
+    assert tracker.data_manager.storage_data == {}
+
+    # The next scan isn't affected by the earlier cancel
+    tracker.get_disk_usage = get_disk_usage
+    assert tracker.start_scan(done_callback=results.append)
+    tracker._scan_thread.join(5)
+    assert results == [False, True]
+    assert set(tracker.data_manager.storage_data["app_storage"]) == {"alpha", "beta"}
+
+
+def test_scanner_cancel_sticks_until_reset(tmp_path):
+    _make_tree(tmp_path)
+    scanner = DirectoryScanner(max_workers=2)
+    scanner.cancel()
+    with pytest.raises(ScanCancelled):
+        scanner.scan(tmp_path)
+    scanner.reset_cancel()
+    assert set(scanner.scan(tmp_path, max_depth=0)) == {str(tmp_path / "alpha"), str(tmp_path / "beta")}
@@ -2,6 +2,7 @@ import psutil
 import time
 from datetime import datetime
 import threading
+from utils.event_bus import ACTIVITY_CHANGED, SESSION_CLOSED
 
 try:
     import win32gui
@@ -15,8 +16,10 @@ class ActivityTracker:
         self.data_manager = data_manager
         self.current_app = None
         self.app_start_time = None
+        self.app_window_title = None
         self.idle_threshold = 300  # 5 minutes
         self.last_activity_time = time.time()
+        self.last_published_state = None
         
     def get_active_window_info(self):
         """Get information about the currently active window"""
@@ -75,25 +78,35 @@ class ActivityTracker:
         # If app changed, save previous app's session
         if self.current_app and self.current_app != app_name and self.app_start_time:
             session_duration = (current_time - self.app_start_time).total_seconds()
-            self.data_manager.add_app_session(
+            session = self.data_manager.add_app_session(
                 self.current_app,
                 self.app_start_time,
                 current_time,
                 session_duration,
-                not activity_info["is_idle"]
+                not activity_info["is_idle"],
+                self.app_window_title
             )
+            self.data_manager.events.publish(SESSION_CLOSED, session)
         
         # Update current app tracking
         if app_name != self.current_app:
             self.current_app = app_name
             self.app_start_time = current_time
+            self.app_window_title = window_info.get("window_title")
             
         # Update real-time data
-        self.data_manager.update_current_activity({
+        current_activity = {
             **window_info,
             **activity_info,
             "session_start": self.app_start_time.isoformat() if self.app_start_time else None
-        })
+        }
+        self.data_manager.update_current_activity(current_activity)
+        
+        # Announce foreground and idle changes (not every poll)
+        state = (app_name, window_info.get("window_title"), activity_info["is_idle"])
+        if state != self.last_published_state:
+            self.last_published_state = state
+            self.data_manager.events.publish(ACTIVITY_CHANGED, current_activity)
         
     def get_running_processes(self):
         """Get list of all running processes with resource usage"""
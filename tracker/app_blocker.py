@@ -3,6 +3,7 @@ import subprocess
 import time
 from datetime import datetime
 from plyer import notification
+from utils.event_bus import APP_BLOCKED
 
 class AppBlocker:
     def __init__(self, data_manager):
@@ -14,6 +15,7 @@ class AppBlocker:
         """Add app to blocked list"""
         self.blocked_apps.add(app_name.lower())
         print(f"Blocked app: {app_name}")
+        self.data_manager.events.publish(APP_BLOCKED, {"app_name": app_name, "blocked": True})
         
         # Send notification
         try:
@@ -29,6 +31,7 @@ class AppBlocker:
         """Remove app from blocked list"""
         self.blocked_apps.discard(app_name.lower())
         print(f"Unblocked app: {app_name}")
+        self.data_manager.events.publish(APP_BLOCKED, {"app_name": app_name, "blocked": False})
     
     def is_app_blocked(self, app_name):
         """Check if app is currently blocked"""
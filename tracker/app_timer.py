@@ -1,7 +1,11 @@
+import argparse
+import json
 import time
 from datetime import datetime, timedelta
+from pathlib import Path
 from plyer import notification
 import threading
+from utils.event_bus import ALERT, LIMITS_CHANGED
 
 class AppTimer:
     def __init__(self, data_manager):
@@ -11,36 +15,81 @@ class AppTimer:
         self.warnings_sent = set()  # Track which apps have been warned
         self.monitoring = True
         
+        # app_usage_today is kept up to date incrementally: the session list
+        # is only appended to, so only sessions past _counted are new
+        self._usage_lock = threading.Lock()
+        self._usage_day = None
+        self._usage_sessions = None
+        self._counted = 0
+        
+        # Limits persist across restarts (and are readable without the GUI)
+        self.limits_path = Path(data_manager.data_dir) / "app_limits.json"
+        self.load_limits()
+    
+    def load_limits(self):
+        """Load saved limits"""
+        if not self.limits_path.exists():
+            return
+        try:
+            with open(self.limits_path, 'r', encoding='utf-8') as f:
+                self.app_limits = {app: float(seconds) for app, seconds in json.load(f).items()}
+        except Exception as e:
+            print(f"Error loading app limits: {e}")
+    
+    def save_limits(self):
+        """Save limits as JSON (app name -> seconds)"""
+        try:
+            with open(self.limits_path, 'w', encoding='utf-8') as f:
+                json.dump(self.app_limits, f, indent=2)
+        except Exception as e:
+            print(f"Error saving app limits: {e}")
+        
     def set_app_limit(self, app_name, limit_hours):
         """Set time limit for an application"""
         self.app_limits[app_name] = limit_hours * 3600  # Convert to seconds
         print(f"Set limit for {app_name}: {limit_hours} hours")
+        self.save_limits()
+        self.data_manager.events.publish(LIMITS_CHANGED, {"app_name": app_name, "limit_seconds": self.app_limits[app_name]})
     
     def remove_app_limit(self, app_name):
         """Remove time limit for an application"""
         if app_name in self.app_limits:
             del self.app_limits[app_name]
             print(f"Removed limit for {app_name}")
+            self.save_limits()
+            self.data_manager.events.publish(LIMITS_CHANGED, {"app_name": app_name, "limit_seconds": None})
     
-    def get_app_usage_today(self, app_name):
-        """Get total usage time for app today"""
+    def _update_usage(self):
+        """Fold sessions recorded since the last call into app_usage_today"""
         app_sessions = self.data_manager.app_sessions
-        total_time = 0
-        
         today = datetime.now().date()
-        for session in app_sessions:
-            if session['app_name'] == app_name:
-                session_date = datetime.fromisoformat(session['start_time']).date()
-                if session_date == today:
-                    total_time += session['duration_seconds']
-        
-        return total_time
+        with self._usage_lock:
+            # Start over on a new day or when the session list was replaced
+            if (today != self._usage_day or app_sessions is not self._usage_sessions
+                    or len(app_sessions) < self._counted):
+                self.app_usage_today = {}
+                self._usage_day = today
+                self._usage_sessions = app_sessions
+                self._counted = 0
+            
+            prefix = today.isoformat()
+            end = len(app_sessions)
+            for session in app_sessions[self._counted:end]:
+                if session['start_time'].startswith(prefix):
+                    app_name = session['app_name']
+                    self.app_usage_today[app_name] = self.app_usage_today.get(app_name, 0) + session['duration_seconds']
+            self._counted = end
+    
+    def get_app_usage_today(self, app_name):
+        """Get total usage time for app today"""
+        self._update_usage()
+        return self.app_usage_today.get(app_name, 0)
     
     def check_app_limits(self):
         """Check if any apps have exceeded their limits"""
         alerts = []
         
-        for app_name, limit_seconds in self.app_limits.items():
+        for app_name, limit_seconds in list(self.app_limits.items()):
             usage_seconds = self.get_app_usage_today(app_name)
             
             if usage_seconds >= limit_seconds:
@@ -101,6 +150,7 @@ class AppTimer:
                     
                     # Log the alert
                     self.data_manager.add_app_alert(alert)
+                    self.data_manager.events.publish(ALERT, alert)
                 
                 # Reset daily warnings at midnight
                 current_time = datetime.now()
@@ -117,7 +167,7 @@ class AppTimer:
         """Get current status of all app limits"""
         status = {}
         
-        for app_name, limit_seconds in self.app_limits.items():
+        for app_name, limit_seconds in list(self.app_limits.items()):
             usage_seconds = self.get_app_usage_today(app_name)
             
             status[app_name] = {
@@ -130,6 +180,38 @@ class AppTimer:
         
         return status
     
+    def format_limits_status(self):
+        """Text summary of all limits, one line per app, for the tray and the command line"""
+        status = self.get_app_limits_status()
+        if not status:
+            return "No app timers set"
+        
+        lines = []
+        for app_name, info in sorted(status.items(), key=lambda item: item[1]['percentage_used'], reverse=True):
+            state = "exceeded" if info['status'] == 'exceeded' else f"{info['remaining_hours']:.1f}h left"
+            lines.append(f"{app_name}: {info['usage_hours']:.1f}h / {info['limit_hours']:.1f}h "
+                         f"({info['percentage_used']:.0f}%, {state})")
+        return "\n".join(lines)
+    
     def stop_monitoring(self):
         """Stop app timer monitoring"""
         self.monitoring = False
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Show today's TimeLedger app timer status.")
+    parser.add_argument("--data-dir", default="data", help="data directory (default: data)")
+    parser.add_argument("--json", action="store_true", help="print the status as JSON")
+    args = parser.parse_args(argv)
+    
+    from utils.data_manager import DataManager
+    app_timer = AppTimer(DataManager(args.data_dir))
+    if args.json:
+        print(json.dumps(app_timer.get_app_limits_status(), indent=2))
+    else:
+        print(app_timer.format_limits_status())
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
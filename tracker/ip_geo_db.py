@@ -0,0 +1,233 @@
+import csv
+import ipaddress
+import mmap
+import os
+import socket
+import struct
+import sys
+from array import array
+from bisect import bisect_right
+from datetime import datetime
+from pathlib import Path
+import psutil
+from tracker.location_providers import LocationProvider
+
+# File layout (little-endian):
+#   header
+#   range starts    uint32[count]   sorted, non-overlapping
+#   range ends      uint32[count]   inclusive
+#   location index  uint32[count]
+#   string offsets  uint32[locations + 1] into the string blob
+#   string blob     "city\x1fcountry\x1ftimezone" per location, UTF-8
+# The three range columns are read straight from the mmap, so a lookup is a
+# bisect over the starts column without loading the file.
+_MAGIC = b"TLIP"
+_VERSION = 1
+_HEADER = struct.Struct("<4sHII")     # magic, version, range count, location count
+_FIELD_SEP = "\x1f"
+
+
+def _ip_to_int(value):
+    value = value.strip()
+    if value.isdigit():
+        return int(value)
+    return int(ipaddress.IPv4Address(value))
+
+
+def _le_array(values):
+    column = array("I", values)
+    if sys.byteorder == "big":
+        column.byteswap()
+    return column.tobytes()
+
+
+def build_database(csv_path, output_path):
+    """Build a lookup file from a CSV of start,end,city,country,timezone rows.
+
+    start/end are dotted IPv4 addresses or integers, end inclusive. A header
+    row is skipped. Overlapping ranges keep the one that starts first.
+    Returns the number of ranges written.
+    """
+    rows = []
+    with open(csv_path, newline="", encoding="utf-8") as f:
+        for line_number, row in enumerate(csv.reader(f), 1):
+            if not row or row[0].lstrip().startswith("#"):
+                continue
+            try:
+                start, end = _ip_to_int(row[0]), _ip_to_int(row[1])
+            except (ValueError, IndexError):
+                if line_number == 1:
+                    continue  # header
+                raise ValueError(f"{csv_path}:{line_number}: bad IP range {row[:2]}")
+            if end < start:
+                raise ValueError(f"{csv_path}:{line_number}: range ends before it starts")
+            fields = (row + ["", "", ""])[2:5]
+            rows.append((start, end, _FIELD_SEP.join(field.strip() for field in fields)))
+
+    rows.sort()
+    starts, ends, location_ids = [], [], []
+    location_index = {}
+    last_end = -1
+    for start, end, location in rows:
+        if start <= last_end:
+            continue
+        starts.append(start)
+        ends.append(end)
+        location_ids.append(location_index.setdefault(location, len(location_index)))
+        last_end = end
+
+    blob = bytearray()
+    offsets = [0]
+    for location in location_index:  # insertion order == index order
+        blob += location.encode("utf-8")
+        offsets.append(len(blob))
+
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = output_path.with_suffix(".tmp")
+    with open(temp_path, "wb") as f:
+        f.write(_HEADER.pack(_MAGIC, _VERSION, len(starts), len(location_index)))
+        f.write(_le_array(starts))
+        f.write(_le_array(ends))
+        f.write(_le_array(location_ids))
+        f.write(_le_array(offsets))
+        f.write(blob)
+    os.replace(temp_path, output_path)
+    return len(starts)
+
+
+def write_synthetic_csv(path, ranges=1000, block_size=256):
+    """Write a small CSV of adjacent ranges for tests and benchmarks.
+
+    Range i covers 10.0.0.0 + i * block_size and maps to City<i % 50>.
+    """
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["start", "end", "city", "country", "timezone"])
+        base = int(ipaddress.IPv4Address("10.0.0.0"))
+        for i in range(ranges):
+            start = base + i * block_size
+            writer.writerow([str(ipaddress.IPv4Address(start)), str(ipaddress.IPv4Address(start + block_size - 1)),
+                             f"City{i % 50}", f"Country{i % 7}", "UTC"])
+
+
+class IpRangeDatabase:
+    """Memory-mapped IPv4 range lookups over a file written by build_database"""
+
+    def __init__(self, file_path):
+        self.file_path = Path(file_path)
+        self._file = open(self.file_path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, version, self.count, self.location_count = _HEADER.unpack_from(self._map, 0)
+            if magic != _MAGIC or version != _VERSION:
+                raise ValueError(f"{self.file_path} is not an IP range database")
+
+            view = memoryview(self._map)
+            offset = _HEADER.size
+            self._starts, offset = self._column(view, offset, self.count)
+            self._ends, offset = self._column(view, offset, self.count)
+            self._location_ids, offset = self._column(view, offset, self.count)
+            self._string_offsets, offset = self._column(view, offset, self.location_count + 1)
+            self._blob_offset = offset
+        except Exception:
+            self.close()
+            raise
+        self._locations = {}
+
+    @staticmethod
+    def _column(view, offset, length):
+        end = offset + length * 4
+        if sys.byteorder == "little":
+            column = view[offset:end].cast("I")
+        else:
+            column = array("I", view[offset:end])
+            column.byteswap()
+        return column, end
+
+    def close(self):
+        for name in ("_starts", "_ends", "_location_ids", "_string_offsets"):
+            column = getattr(self, name, None)
+            if isinstance(column, memoryview):
+                column.release()
+        if getattr(self, "_map", None) is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def lookup(self, ip):
+        """Return {"city", "country", "timezone"} for an IPv4 address, or None"""
+        try:
+            value = _ip_to_int(ip) if isinstance(ip, str) else int(ip)
+        except ValueError:
+            return None
+        index = bisect_right(self._starts, value) - 1
+        if index < 0 or value > self._ends[index]:
+            return None
+        return self._location(self._location_ids[index])
+
+    def _location(self, location_id):
+        location = self._locations.get(location_id)
+        if location is None:
+            start = self._blob_offset + self._string_offsets[location_id]
+            end = self._blob_offset + self._string_offsets[location_id + 1]
+            city, country, timezone = self._map[start:end].decode("utf-8").split(_FIELD_SEP)
+            location = {"city": city, "country": country, "timezone": timezone}
+            self._locations[location_id] = location
+        return location
+
+
+class OfflineIpProvider(LocationProvider):
+    """Resolves the machine's own IPv4 addresses against a local range database.
+
+    With no `ip` given, every non-loopback interface address is tried in
+    turn, so office subnets listed in the CSV resolve without any network
+    access.
+    """
+
+    name = "offline-db"
+
+    def __init__(self, database_path, ip=None, **kwargs):
+        super().__init__(**kwargs)
+        self.database_path = Path(database_path)
+        self.ip = ip
+        self._database = None
+
+    def _addresses(self):
+        if self.ip:
+            return [self.ip]
+        addresses = []
+        for interface in psutil.net_if_addrs().values():
+            for address in interface:
+                if address.family == socket.AF_INET and not address.address.startswith("127."):
+                    addresses.append(address.address)
+        return addresses
+
+    def lookup(self):
+        if self._database is None:
+            if not self.database_path.exists():
+                return None
+            self._database = IpRangeDatabase(self.database_path)
+
+        for address in self._addresses():
+            location = self._database.lookup(address)
+            if location:
+                return {
+                    "ip": address,
+                    "city": location["city"],
+                    "region": None,
+                    "country": location["country"],
+                    "timezone": location["timezone"],
+                    "lat": None,
+                    "lon": None,
+                    "isp": None,
+                    "source": self.name,
+                    "timestamp": datetime.now().isoformat()
+                }
+        return None
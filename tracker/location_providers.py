@@ -0,0 +1,191 @@
+import hashlib
+import json
+import socket
+import sys
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import psutil
+import requests
+
+
+def default_gateway():
+    """Return the IPv4 default gateway from /proc/net/route, or None"""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        with open("/proc/net/route") as f:
+            next(f)  # header
+            for line in f:
+                fields = line.split()
+                # Iface Destination Gateway Flags ...; destination 0 is the default route
+                if len(fields) > 3 and fields[1] == "00000000" and int(fields[3], 16) & 0x2:
+                    return socket.inet_ntoa(int(fields[2], 16).to_bytes(4, "little"))
+    except (OSError, ValueError, StopIteration):
+        pass
+    return None
+
+
+def network_fingerprint():
+    """Cheap hash of the local network setup.
+
+    Built from interface addresses and the default gateway only, so it can
+    be checked often without touching the network. A change means the
+    machine probably moved and the cached location should be refreshed.
+    """
+    parts = []
+    try:
+        for name, addresses in sorted(psutil.net_if_addrs().items()):
+            for address in addresses:
+                if address.family in (socket.AF_INET, socket.AF_INET6) and not address.address.startswith(("127.", "::1", "fe80")):
+                    parts.append(f"{name}={address.address}")
+    except Exception as e:
+        print(f"Error reading network interfaces: {e}")
+    parts.append(f"gw={default_gateway()}")
+    return hashlib.sha1("|".join(sorted(parts)).encode("utf-8")).hexdigest()
+
+
+class LocationProvider:
+    """Base class for location sources.
+
+    `lookup()` returns a location dict (ip, city, region, country, timezone,
+    lat, lon, isp, timestamp) or None. Failures back off exponentially, so a
+    dead provider is skipped instead of being retried on every refresh.
+    """
+
+    name = "provider"
+
+    def __init__(self, min_backoff=30, max_backoff=3600):
+        self.min_backoff = min_backoff
+        self.max_backoff = max_backoff
+        self.failures = 0
+        self.retry_at = 0.0
+
+    def available(self):
+        return time.monotonic() >= self.retry_at
+
+    def lookup(self):
+        raise NotImplementedError
+
+    def resolve(self, ignore_backoff=False):
+        """lookup() with backoff bookkeeping"""
+        if not ignore_backoff and not self.available():
+            return None
+        try:
+            location = self.lookup()
+        except Exception as e:
+            print(f"Location provider {self.name} error: {e}")
+            location = None
+
+        if location:
+            self.failures = 0
+            self.retry_at = 0.0
+        else:
+            self.failures += 1
+            delay = min(self.max_backoff, self.min_backoff * 2 ** (self.failures - 1))
+            self.retry_at = time.monotonic() + delay
+        return location
+
+
+class IpApiProvider(LocationProvider):
+    """ip-api.com JSON endpoint, over a kept-alive HTTP session"""
+
+    name = "ip-api"
+
+    def __init__(self, url="http://ip-api.com/json/", timeout=5, **kwargs):
+        super().__init__(**kwargs)
+        self.url = url
+        self.timeout = timeout
+        self.session = requests.Session()
+
+    def lookup(self):
+        response = self.session.get(self.url, timeout=self.timeout)
+        if response.status_code != 200:
+            return None
+        data = response.json()
+        if data.get("status") != "success":
+            return None
+        return {
+            "ip": data.get("query"),
+            "city": data.get("city"),
+            "region": data.get("regionName"),
+            "country": data.get("country"),
+            "timezone": data.get("timezone"),
+            "lat": data.get("lat"),
+            "lon": data.get("lon"),
+            "isp": data.get("isp"),
+            "source": self.name,
+            "timestamp": datetime.now().isoformat()
+        }
+
+
+class StandInLocationServer:
+    """Local HTTP server answering like ip-api.com, for tests and offline demos.
+
+    Usage:
+        with StandInLocationServer({"city": "Testville"}) as server:
+            provider = IpApiProvider(url=server.url)
+    """
+
+    DEFAULT_RESPONSE = {
+        "status": "success",
+        "query": "127.0.0.1",
+        "city": "Localhost",
+        "regionName": "Loopback",
+        "country": "Nowhere",
+        "timezone": "UTC",
+        "lat": 0.0,
+        "lon": 0.0,
+        "isp": "Stand-in"
+    }
+
+    def __init__(self, response=None, status_code=200, delay=0.0):
+        self.response = dict(self.DEFAULT_RESPONSE, **(response or {}))
+        self.status_code = status_code
+        self.delay = delay
+        self.requests_served = 0
+        self._server = None
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/json/"
+
+    def start(self):
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive, so session reuse is exercised
+
+            def do_GET(self):
+                stand_in.requests_served += 1
+                if stand_in.delay:
+                    time.sleep(stand_in.delay)
+                body = json.dumps(stand_in.response).encode("utf-8")
+                self.send_response(stand_in.status_code)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
@@ -1,45 +1,88 @@
-import requests
 from datetime import datetime
 import threading
+import time
+from pathlib import Path
+from tracker.location_providers import IpApiProvider, network_fingerprint
+from tracker.ip_geo_db import OfflineIpProvider
 
 class LocationTracker:
-    def __init__(self, data_manager):
+    def __init__(self, data_manager, providers=None, ttl=1800, fingerprint_interval=30):
         self.data_manager = data_manager
+        if providers is None:
+            # Local range database first (built with scripts/build_ip_geo_db.py), then ip-api.com
+            providers = [OfflineIpProvider(Path(data_manager.data_dir) / "ip_geo.bin"), IpApiProvider()]
+        self.providers = list(providers)
+        self.ttl = ttl  # seconds a location stays fresh on an unchanged network
+        self.fingerprint_interval = fingerprint_interval
         self.current_location = None
         self.last_update = None
-        
-    def get_ip_location(self):
-        """Get location based on IP address"""
-        try:
-            # Using ip-api.com (free tier)
-            response = requests.get("http://ip-api.com/json/", timeout=10)
-            if response.status_code == 200:
-                data = response.json()
-                if data["status"] == "success":
-                    return {
-                        "ip": data.get("query"),
-                        "city": data.get("city"),
-                        "region": data.get("regionName"),
-                        "country": data.get("country"),
-                        "timezone": data.get("timezone"),
-                        "lat": data.get("lat"),
-                        "lon": data.get("lon"),
-                        "isp": data.get("isp"),
-                        "timestamp": datetime.now().isoformat()
-                    }
-        except Exception as e:
-            print(f"Location tracking error: {e}")
-            
+        self.network_fingerprint = None
+        self._last_fingerprint_check = 0.0
+        self._refresh_thread = None
+        self._refresh_lock = threading.Lock()
+
+        # Pick up the location saved earlier today so a restart doesn't re-query
+        saved = data_manager.location_data
+        if saved and saved.get("timestamp"):
+            try:
+                self.last_update = datetime.fromisoformat(saved["timestamp"])
+                self.current_location = saved
+                self.network_fingerprint = saved.get("network_fingerprint")
+            except ValueError:
+                pass
+
+    def get_ip_location(self, ignore_backoff=False):
+        """Get location from the first provider that answers (blocking)"""
+        for provider in self.providers:
+            location = provider.resolve(ignore_backoff)
+            if location:
+                return location
         return None
-    
-    def update_location(self):
-        """Update current location"""
-        location = self.get_ip_location()
+
+    def is_stale(self):
+        """Check whether the cached location is missing or past its TTL"""
+        if self.current_location is None or self.last_update is None:
+            return True
+        return (datetime.now() - self.last_update).total_seconds() >= self.ttl
+
+    def network_changed(self):
+        """Recompute the network fingerprint (at most every fingerprint_interval)"""
+        now = time.monotonic()
+        if now - self._last_fingerprint_check < self.fingerprint_interval:
+            return False
+        self._last_fingerprint_check = now
+        return network_fingerprint() != self.network_fingerprint
+
+    def update_location(self, force=False, wait=False):
+        """Refresh the location in the background if it's stale or the network changed.
+
+        Returns immediately unless wait is True; callers read the result from
+        get_current_location() or the data manager.
+        """
+        if not (force or self.network_changed() or self.is_stale()):
+            return
+        if not force and not any(provider.available() for provider in self.providers):
+            return  # every provider is backing off
+
+        with self._refresh_lock:
+            thread = self._refresh_thread
+            if thread is None or not thread.is_alive():
+                thread = threading.Thread(target=self._refresh, args=(force,), daemon=True)
+                self._refresh_thread = thread
+                thread.start()
+        if wait:
+            thread.join()
+
+    def _refresh(self, ignore_backoff=False):
+        fingerprint = network_fingerprint()
+        location = self.get_ip_location(ignore_backoff)
+        self.network_fingerprint = fingerprint
         if location:
-            self.current_location = location
+            location["network_fingerprint"] = fingerprint
             self.last_update = datetime.now()
+            self.current_location = location
             self.data_manager.update_location_data(location)
-            
+
     def get_current_location(self):
         """Get current cached location"""
         return self.current_location
@@ -2,6 +2,7 @@ import psutil
 import time
 from datetime import datetime, timedelta
 from collections import defaultdict, deque
+from utils.event_bus import RESOURCES_UPDATED
 
 class ResourceMonitor:
     def __init__(self, data_manager):
@@ -152,6 +153,7 @@ class ResourceMonitor:
                 }
                 
                 self.data_manager.update_resource_data(resource_data)
+                self.data_manager.events.publish(RESOURCES_UPDATED, resource_data)
                 
                 time.sleep(5)  # Monitor every 5 seconds
                 
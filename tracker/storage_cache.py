@@ -0,0 +1,199 @@
+import os
+import struct
+import time
+import zlib
+from pathlib import Path
+
+# File layout: header, then a zlib-compressed body of fixed-size records,
+# each followed by its UTF-8 name. Records are written parent-first, so a
+# record only needs its parent's index and its own basename (roots store
+# their full path). The hardlink owners follow as (dev, inode, record index).
+_MAGIC = b"TLSC"
+_VERSION = 3
+_HEADER = struct.Struct("<4sHdII")    # magic, version, full_scan_at, record count, link count
+# parent, mtime_ns, inode, own, total, own allocated, total allocated, child count, name length
+_RECORD = struct.Struct("<iqQQQQQIH")
+_LINK = struct.Struct("<QQI")
+INODE_MASK = 0xFFFFFFFFFFFFFFFF
+
+
+def link_key(file_stat):
+    """Identity of a file's data: (st_dev, st_ino) packed into one int"""
+    return (file_stat.st_dev << 64) | file_stat.st_ino
+
+
+class CachedDir:
+    """Cached metadata for one directory"""
+
+    __slots__ = ("mtime_ns", "inode", "own_bytes", "total_bytes", "children",
+                 "own_allocated", "total_allocated")
+
+    def __init__(self, mtime_ns, inode, own_bytes, total_bytes, children,
+                 own_allocated=0, total_allocated=0):
+        self.mtime_ns = mtime_ns
+        self.inode = inode
+        self.own_bytes = own_bytes      # files directly inside the directory
+        self.total_bytes = total_bytes  # whole subtree
+        self.children = children        # names of subdirectories
+        self.own_allocated = own_allocated      # same, in allocated blocks
+        self.total_allocated = total_allocated
+
+    def matches(self, stat_result):
+        """True if the directory's entry list can't have changed"""
+        return self.mtime_ns == stat_result.st_mtime_ns and self.inode == stat_result.st_ino & INODE_MASK
+
+
+class StorageCache:
+    """Persisted per-directory metadata used for incremental storage rescans.
+
+    A directory whose (mtime, inode) still match the cache has the same
+    entries as last time, so its file sizes and subdirectory names are reused
+    instead of listing and statting it again. File contents rewritten in place
+    don't touch the directory mtime, which is why a full rescan is forced once
+    the last one is older than `full_rescan_interval`.
+
+    `links` remembers, for every hardlinked file, the directory its size is
+    counted in, so later partial listings can attribute the links they meet.
+    """
+
+    def __init__(self, file_path=None, full_rescan_interval=24 * 3600):
+        self.file_path = Path(file_path) if file_path else Path("data") / "storage_cache.bin"
+        self.full_rescan_interval = full_rescan_interval
+        self.entries = {}
+        self.links = {}  # link_key -> directory holding the counted link
+        self.full_scan_at = 0.0
+
+    def needs_full_rescan(self):
+        """Check whether the cache is missing or too old to trust"""
+        if not self.entries:
+            return True
+        return time.time() - self.full_scan_at >= self.full_rescan_interval
+
+    def update(self, entries, full_scan, links=None):
+        """Replace the cached entries with the result of a finished scan"""
+        self.entries = entries
+        self.links = links if links is not None else {}
+        if full_scan:
+            self.full_scan_at = time.time()
+
+    def request_full_rescan(self):
+        """Keep the entries, but have the next scan list every directory again"""
+        self.full_scan_at = 0.0
+
+    def clear(self):
+        """Forget everything, forcing the next scan to be a full one"""
+        self.entries = {}
+        self.links = {}
+        self.full_scan_at = 0.0
+
+    def subtree_totals(self, root, max_depth):
+        """Return {directory: (apparent bytes, allocated bytes)} for cached
+        directories below root down to max_depth (children of root are depth 0)"""
+        totals = {}
+        cached_root = self.entries.get(root)
+        if cached_root is None:
+            return totals
+
+        stack = [(os.path.join(root, name), 0) for name in cached_root.children]
+        while stack:
+            path, depth = stack.pop()
+            cached = self.entries.get(path)
+            if cached is None:
+                continue
+            totals[path] = (cached.total_bytes, cached.total_allocated)
+            if depth < max_depth:
+                stack.extend((os.path.join(path, name), depth + 1) for name in cached.children)
+        return totals
+
+    def load(self):
+        """Load the cache from disk; a missing or damaged file leaves it empty"""
+        self.clear()
+        if not self.file_path.exists():
+            return False
+
+        try:
+            with open(self.file_path, 'rb') as f:
+                header = f.read(_HEADER.size)
+                magic, version, full_scan_at, count, link_count = _HEADER.unpack(header)
+                if magic != _MAGIC or version != _VERSION:
+                    return False
+                body = zlib.decompress(f.read())
+
+            entries = {}
+            paths = []
+            expected = []
+            offset = 0
+            for _ in range(count):
+                (parent, mtime_ns, inode, own, total, own_alloc, total_alloc,
+                 child_count, name_len) = _RECORD.unpack_from(body, offset)
+                offset += _RECORD.size
+                name = body[offset:offset + name_len].decode("utf-8", "surrogateescape")
+                offset += name_len
+
+                if parent < 0:
+                    path = name
+                else:
+                    path = os.path.join(paths[parent], name)
+                    entries[paths[parent]].children.append(name)
+                paths.append(path)
+                expected.append(child_count)
+                entries[path] = CachedDir(mtime_ns, inode, own, total, [], own_alloc, total_alloc)
+
+            for path, child_count in zip(paths, expected):
+                if len(entries[path].children) != child_count:
+                    raise ValueError(f"inconsistent child count for {path}")
+
+            links = {}
+            for dev, ino, index in _LINK.iter_unpack(body[offset:offset + link_count * _LINK.size]):
+                links[(dev << 64) | ino] = paths[index]
+            if len(links) != link_count:
+                raise ValueError("truncated hardlink table")
+
+        except Exception as e:
+            print(f"Storage cache unreadable, falling back to a full rescan: {e}")
+            self.clear()
+            return False
+
+        self.entries = entries
+        self.links = links
+        self.full_scan_at = full_scan_at
+        return True
+
+    def save(self):
+        """Write the cache to disk atomically"""
+        records = []
+        indexes = {}
+
+        # Roots are the entries whose parent isn't cached; each tree is
+        # written depth-first so parents always precede their children.
+        roots = [path for path in self.entries if os.path.dirname(path) not in self.entries]
+        stack = [(root, -1, root) for root in reversed(roots)]
+        while stack:
+            path, parent_index, name = stack.pop()
+            if path in indexes:
+                continue
+            cached = self.entries[path]
+            children = [n for n in cached.children
+                        if os.path.join(path, n) in self.entries and os.path.join(path, n) not in indexes]
+
+            indexes[path] = len(records)
+            encoded = name.encode("utf-8", "surrogateescape")
+            records.append(_RECORD.pack(parent_index, cached.mtime_ns, cached.inode,
+                                        cached.own_bytes, cached.total_bytes,
+                                        cached.own_allocated, cached.total_allocated,
+                                        len(children), len(encoded)) + encoded)
+            for child_name in reversed(children):
+                stack.append((os.path.join(path, child_name), indexes[path], child_name))
+
+        links = [_LINK.pack(key >> 64, key & INODE_MASK, indexes[path])
+                 for key, path in self.links.items() if path in indexes]
+
+        try:
+            self.file_path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = self.file_path.with_suffix(".tmp")
+            with open(temp_path, 'wb') as f:
+                f.write(_HEADER.pack(_MAGIC, _VERSION, self.full_scan_at, len(records), len(links)))
+                f.write(zlib.compress(b"".join(records + links), 6))
+            os.replace(temp_path, self.file_path)
+        except Exception as e:
+            print(f"Error saving storage cache: {e}")
@@ -0,0 +1,484 @@
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from tracker.storage_cache import CachedDir, INODE_MASK, link_key
+
+# Directories modified this close to the start of a scan may change again
+# within the same mtime tick, so they are never reused from the cache.
+_MTIME_SETTLE_NS = 2_000_000_000
+
+
+class ScanCancelled(Exception):
+    """Raised when a scan is stopped through DirectoryScanner.cancel()"""
+
+
+class ScanStats:
+    """Counters collected while walking a directory tree"""
+
+    def __init__(self):
+        self.files = 0
+        self.dirs = 0
+        self.dirs_reused = 0
+        self.bytes = 0
+        self.bytes_allocated = 0
+        self.hardlinks_skipped = 0
+        self.hardlinks_saturated = False
+        self.errors = 0
+        self.started = time.perf_counter()
+        self.elapsed = 0.0
+
+    def merge(self, other):
+        """Add the counters of another (per-worker) stats object"""
+        self.files += other.files
+        self.dirs += other.dirs
+        self.dirs_reused += other.dirs_reused
+        self.bytes += other.bytes
+        self.bytes_allocated += other.bytes_allocated
+        self.hardlinks_skipped += other.hardlinks_skipped
+        self.errors += other.errors
+
+    def finish(self):
+        """Freeze the elapsed time"""
+        self.elapsed = time.perf_counter() - self.started
+
+    def files_per_sec(self):
+        return self.files / self.elapsed if self.elapsed > 0 else 0.0
+
+    def bytes_per_sec(self):
+        return self.bytes / self.elapsed if self.elapsed > 0 else 0.0
+
+    def to_dict(self):
+        return {
+            "files": self.files,
+            "dirs": self.dirs,
+            "dirs_reused": self.dirs_reused,
+            "bytes": self.bytes,
+            "bytes_allocated": self.bytes_allocated,
+            "hardlinks_skipped": self.hardlinks_skipped,
+            "hardlinks_saturated": self.hardlinks_saturated,
+            "errors": self.errors,
+            "elapsed_seconds": self.elapsed,
+            "files_per_sec": self.files_per_sec(),
+            "bytes_per_sec": self.bytes_per_sec()
+        }
+
+
+class IOThrottle:
+    """Token bucket limiting how many directory entries are processed per second.
+
+    Shared by all scan workers so the combined rate stays under the limit.
+    """
+
+    def __init__(self, entries_per_sec):
+        self.rate = float(entries_per_sec)
+        self._allowance = self.rate
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def consume(self, amount, cancel_event=None):
+        """Take `amount` tokens, sleeping if the bucket is in debt"""
+        with self._lock:
+            now = time.monotonic()
+            self._allowance = min(self.rate, self._allowance + (now - self._last) * self.rate)
+            self._last = now
+            self._allowance -= amount
+            delay = -self._allowance / self.rate if self._allowance < 0 else 0
+
+        if delay > 0:
+            if cancel_event is not None:
+                cancel_event.wait(delay)
+            else:
+                time.sleep(delay)
+
+
+class _DirNode:
+    __slots__ = ("path", "depth", "parent", "root", "own", "own_alloc", "total", "total_alloc",
+                 "mtime_ns", "inode", "child_names")
+
+    def __init__(self, path, depth, parent, root):
+        self.path = path
+        self.depth = depth
+        self.parent = parent
+        self.root = root
+        self.own = 0
+        self.own_alloc = 0
+        self.total = 0
+        self.total_alloc = 0
+        self.mtime_ns = None
+        self.inode = 0
+        self.child_names = []
+
+
+class _LinkTracker:
+    """Seen-set for hardlinked files, keyed by (st_dev, st_ino).
+
+    Only files with more than one link are remembered, and each is forgotten
+    again once all of its links have been seen, so memory follows the number
+    of hardlinks still "open" rather than the size of the tree. Past
+    `max_entries` new inodes are no longer deduplicated.
+    """
+
+    def __init__(self, max_entries=500000):
+        self.max_entries = max_entries
+        self.saturated = False
+        self._remaining = {}
+        self._lock = threading.Lock()
+
+    def first_sighting(self, file_stat):
+        """True if this file's data hasn't been counted yet"""
+        # DirEntry.stat() on Windows reports st_nlink as 0, so no dedupe there
+        if file_stat.st_nlink <= 1:
+            return True
+
+        key = link_key(file_stat)
+        with self._lock:
+            remaining = self._remaining.get(key)
+            if remaining is None:
+                if len(self._remaining) < self.max_entries:
+                    self._remaining[key] = file_stat.st_nlink - 1
+                else:
+                    self.saturated = True
+                return True
+
+            if remaining <= 1:
+                del self._remaining[key]
+            else:
+                self._remaining[key] = remaining - 1
+            return False
+
+
+def allocated_size(file_stat):
+    """Bytes actually allocated on disk (st_blocks is unavailable on Windows)"""
+    blocks = getattr(file_stat, "st_blocks", None)
+    if blocks is None:
+        return file_stat.st_size
+    return blocks * 512
+
+
+class _ScanState:
+    """Everything the workers of one scan share"""
+
+    def __init__(self, roots, worker_count, previous, progress_callback, throttle, max_tracked_links):
+        self.roots = set(roots)
+        self.queues = _WorkQueues(worker_count)
+        self.nodes = []
+        self.stats = ScanStats()
+        self.worker_stats = [ScanStats() for _ in range(worker_count)]
+        self.previous = previous
+        self.progress_callback = progress_callback
+        self.progress_lock = threading.Lock()
+        self.last_progress = 0.0
+        self.throttle = throttle
+        self.links = _LinkTracker(max_tracked_links)
+        self.owners = {}   # link_key -> directory the file was counted in
+        self.reused = []   # directories taken from the cache
+
+
+class _WorkQueues:
+    """Per-worker deques of directories still to be listed.
+
+    A worker pops the newest directory from its own deque (depth-first, good
+    locality) and, once that runs dry, steals the oldest directory from
+    another worker - usually the top of a large, not yet explored subtree.
+    """
+
+    def __init__(self, count):
+        self._deques = [deque() for _ in range(count)]
+        self._cond = threading.Condition()
+        self._pending = 0
+        self._closed = False
+
+    def push(self, index, items):
+        if not items:
+            return
+        with self._cond:
+            self._deques[index].extend(items)
+            self._pending += len(items)
+            self._cond.notify(len(items))
+
+    def take(self, index):
+        """Return the next directory for worker `index`, or None when done"""
+        count = len(self._deques)
+        with self._cond:
+            while True:
+                if self._closed:
+                    return None
+
+                own = self._deques[index]
+                if own:
+                    return own.pop()
+
+                for offset in range(1, count):
+                    victim = self._deques[(index + offset) % count]
+                    if victim:
+                        return victim.popleft()
+
+                if self._pending == 0:
+                    self._closed = True
+                    self._cond.notify_all()
+                    return None
+
+                self._cond.wait()
+
+    def task_done(self):
+        with self._cond:
+            self._pending -= 1
+            if self._pending == 0:
+                self._cond.notify_all()
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+
+class DirectoryScanner:
+    """Single-pass, parallel directory size scanner.
+
+    Every directory is listed exactly once with ``os.scandir`` and every file
+    is statted exactly once through the cached ``DirEntry.stat`` data.
+    Directories are spread over a bounded thread pool with work stealing, the
+    per-directory sums are then folded bottom-up into their parents, so a
+    directory's aggregate size never requires walking its subtree again.
+    With a StorageCache, unchanged directories aren't listed at all.
+
+    Sizes are reported as (apparent, allocated) byte pairs. Hardlinked files
+    are counted once, and a root nested inside another root is left to its
+    own scan, so every byte is attributed exactly once. Symlinks are not
+    followed.
+    """
+
+    def __init__(self, max_workers=4, progress_interval=0.5, max_tracked_links=500000):
+        self.max_workers = max(1, max_workers)
+        self.progress_interval = progress_interval
+        self.max_tracked_links = max_tracked_links
+        self.last_stats = None
+        self._cancel_event = threading.Event()
+
+    def cancel(self):
+        """Stop the running scan, or the next one if it hasn't started yet.
+
+        The request sticks until reset_cancel(), so a cancel that lands
+        before the walk begins isn't lost.
+        """
+        self._cancel_event.set()
+
+    def reset_cancel(self):
+        """Forget earlier cancel() calls; call before starting a new scan"""
+        self._cancel_event.clear()
+
+    def scan(self, root, max_depth=2, progress_callback=None, throttle=None, cache=None):
+        """Return {directory: (apparent bytes, allocated bytes)} for every
+        directory below root down to max_depth (children of root are depth 0)"""
+        root = os.fspath(root)
+        return self.scan_many([root], max_depth, progress_callback, throttle, cache)[root]
+
+    def scan_many(self, roots, max_depth=2, progress_callback=None, throttle=None,
+                  cache=None, full_rescan=False):
+        """Scan several roots with one shared worker pool.
+
+        Returns {root: {directory: (apparent bytes, allocated bytes)}}.
+        Raises ScanCancelled if cancel() is called before the walk completes.
+
+        With a StorageCache, directories whose (mtime, inode) are unchanged
+        are not listed again: their file totals and subdirectory names come
+        from the cache and only the subdirectories themselves are statted.
+        The cache is updated with the new results, unless cancelled.
+        """
+        roots = list(dict.fromkeys(os.fspath(root) for root in roots))
+        # None: no cache at all, {}: record a fresh cache without reusing anything
+        previous = None
+        if cache is not None:
+            previous = {} if full_rescan else cache.entries
+        settled_before_ns = time.time_ns() - _MTIME_SETTLE_NS
+        worker_count = self.max_workers
+
+        state = _ScanState(roots, worker_count, previous, progress_callback, throttle,
+                           self.max_tracked_links)
+        for i, root in enumerate(roots):
+            node = _DirNode(root, -1, None, root)
+            state.nodes.append(node)
+            state.queues.push(i % worker_count, [node])
+
+        with ThreadPoolExecutor(max_workers=worker_count, thread_name_prefix="storage-scan") as pool:
+            futures = [pool.submit(self._worker, i, state) for i in range(worker_count)]
+            try:
+                for future in futures:
+                    future.result()
+            finally:
+                state.queues.close()
+
+        stats = state.stats
+        for own in state.worker_stats:
+            stats.merge(own)
+        stats.hardlinks_saturated = state.links.saturated
+        stats.finish()
+        self.last_stats = stats
+
+        if self._cancel_event.is_set():
+            raise ScanCancelled()
+
+        # Nodes are created after their parent, so walking the list backwards
+        # visits every child before the directory that contains it.
+        for node in reversed(state.nodes):
+            node.total += node.own
+            node.total_alloc += node.own_alloc
+            if node.parent is not None:
+                node.parent.total += node.total
+                node.parent.total_alloc += node.total_alloc
+
+        if cache is not None:
+            # Reused directories keep the hardlinks they were charged for
+            reused = set(state.reused)
+            links = dict(state.owners)
+            if previous:
+                links.update((key, path) for key, path in cache.links.items() if path in reused)
+            cache.update(self._build_cache_entries(state.nodes, settled_before_ns),
+                         full_scan=not previous, links=links)
+
+        results = {root: {} for root in roots}
+        for node in state.nodes:
+            if 0 <= node.depth <= max_depth:
+                results[node.root][node.path] = (node.total, node.total_alloc)
+
+        return results
+
+    def _worker(self, index, state):
+        own_stats = state.worker_stats[index]
+        queues = state.queues
+        cancel_event = self._cancel_event
+
+        while True:
+            node = queues.take(index)
+            if node is None:
+                return
+
+            try:
+                if cancel_event.is_set():
+                    queues.close()
+                    return
+
+                children, entry_count = self._list_directory(node, own_stats, state)
+                state.nodes.extend(children)
+                queues.push(index, children)
+
+                if state.throttle is not None:
+                    state.throttle.consume(entry_count, cancel_event)
+
+                if state.progress_callback is not None:
+                    self._report_progress(state)
+            finally:
+                queues.task_done()
+
+    def _child_node(self, node, path, state):
+        """Node for a subdirectory, or None if it is scanned as its own root"""
+        if path in state.roots:
+            return None
+        return _DirNode(path, node.depth + 1, node, node.root)
+
+    def _list_directory(self, node, own_stats, state):
+        """List one directory, sum its files and return its subdirectories"""
+        if state.previous is not None:
+            try:
+                dir_stat = os.stat(node.path, follow_symlinks=False)
+            except OSError:
+                own_stats.errors += 1
+                return [], 0
+
+            node.mtime_ns = dir_stat.st_mtime_ns
+            node.inode = dir_stat.st_ino & INODE_MASK
+            cached = state.previous.get(node.path)
+            if cached is not None and cached.matches(dir_stat):
+                return self._reuse_cached(node, cached, own_stats, state), 1
+
+        children = []
+        entry_count = 0
+        links = state.links
+        try:
+            with os.scandir(node.path) as entries:
+                for entry in entries:
+                    entry_count += 1
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            child = self._child_node(node, entry.path, state)
+                            if child is not None:
+                                children.append(child)
+                                node.child_names.append(entry.name)
+                                own_stats.dirs += 1
+                        elif entry.is_file(follow_symlinks=False):
+                            file_stat = entry.stat(follow_symlinks=False)
+                            own_stats.files += 1
+                            if not links.first_sighting(file_stat):
+                                own_stats.hardlinks_skipped += 1
+                                continue
+                            if file_stat.st_nlink > 1:
+                                state.owners.setdefault(link_key(file_stat), node.path)
+                            size = file_stat.st_size
+                            allocated = allocated_size(file_stat)
+                            node.own += size
+                            node.own_alloc += allocated
+                            own_stats.bytes += size
+                            own_stats.bytes_allocated += allocated
+                    except OSError:
+                        own_stats.errors += 1
+        except OSError:
+            own_stats.errors += 1
+            node.mtime_ns = None  # never cache a directory we couldn't list
+
+        return children, entry_count
+
+    def _reuse_cached(self, node, cached, own_stats, state):
+        """Take an unchanged directory's totals and subdirectories from the cache.
+
+        Hardlinks inside it aren't registered in the seen-set again; a full
+        rescan settles any double count with links in changed directories.
+        The cache's record of which links it was charged for is kept.
+        """
+        node.own = cached.own_bytes
+        node.own_alloc = cached.own_allocated
+        own_stats.dirs_reused += 1
+        state.reused.append(node.path)
+        own_stats.bytes += cached.own_bytes
+        own_stats.bytes_allocated += cached.own_allocated
+
+        children = []
+        for name in cached.children:
+            child = self._child_node(node, os.path.join(node.path, name), state)
+            if child is not None:
+                children.append(child)
+                node.child_names.append(name)
+        own_stats.dirs += len(children)
+        return children
+
+    def _build_cache_entries(self, nodes, settled_before_ns):
+        """Turn the scanned nodes into StorageCache entries"""
+        entries = {}
+        for node in nodes:
+            if node.mtime_ns is None:
+                continue
+            # A directory changed during this scan must be listed again next time
+            mtime_ns = node.mtime_ns if node.mtime_ns < settled_before_ns else -1
+            entries[node.path] = CachedDir(mtime_ns, node.inode, node.own, node.total,
+                                           node.child_names, node.own_alloc, node.total_alloc)
+        return entries
+
+    def _report_progress(self, state):
+        """Call the progress callback at most once per progress_interval"""
+        now = time.perf_counter()
+        with state.progress_lock:
+            if now - state.last_progress < self.progress_interval:
+                return
+            state.last_progress = now
+
+        snapshot = ScanStats()
+        snapshot.started = state.stats.started
+        for own in state.worker_stats:
+            snapshot.merge(own)
+        snapshot.finish()
+
+        try:
+            state.progress_callback(snapshot.to_dict())
+        except Exception as e:
+            print(f"Storage scan progress error: {e}")
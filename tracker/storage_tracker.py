@@ -1,14 +1,50 @@
 import os
 import psutil
+import time
 from pathlib import Path
 import threading
 from datetime import datetime
+from tracker.storage_scanner import DirectoryScanner, IOThrottle, ScanCancelled
+from tracker.storage_cache import StorageCache
+from tracker.storage_watcher import InotifyStorageWatcher
+from utils.event_bus import STORAGE_SCAN_DONE
+
+# Folders whose immediate subfolders are treated as one application each.
+# Roots that don't exist on the current machine are skipped.
+DEFAULT_SCAN_ROOTS = [
+    # Windows
+    "~/AppData/Local",
+    "~/AppData/Roaming",
+    "C:/Program Files",
+    "C:/Program Files (x86)",
+    # Linux
+    "~/.cache",
+    "~/.local/share",
+    "/opt",
+    "/usr/share",
+]
 
 class StorageTracker:
-    def __init__(self, data_manager):
+    def __init__(self, data_manager, scan_roots=None, max_workers=4, throttle_entries_per_sec=20000,
+                 live_watch=False):
         self.data_manager = data_manager
         self.scan_in_progress = False
-        
+        self.scan_roots = list(scan_roots) if scan_roots is not None else list(DEFAULT_SCAN_ROOTS)
+        self.scanner = DirectoryScanner(max_workers=max_workers)
+        self.io_throttle = IOThrottle(throttle_entries_per_sec) if throttle_entries_per_sec else None
+        self.scan_interval = 3600  # seconds between background scans
+        self.cache = StorageCache(Path(data_manager.data_dir) / "storage_cache.bin")
+        self._cache_loaded = False
+        self.live_watch = live_watch  # keep storage_data current from inotify events (Linux)
+        self.watcher = None
+        self.last_disk_usage = {}
+        self.last_app_storage_allocated = {}
+        self.last_scan_stats = {}
+        self.scan_totals = {}
+        self.last_scan_started = None
+        self._scan_lock = threading.Lock()
+        self._scan_thread = None
+    
     def get_disk_usage(self):
         """Get overall disk usage statistics"""
         disk_usage = {}
@@ -25,83 +61,218 @@ class StorageTracker:
                 continue
         return disk_usage
     
+    def set_scan_roots(self, scan_roots):
+        """Replace the folders scanned for application storage"""
+        self.scan_roots = list(scan_roots)
+    
+    def get_existing_scan_roots(self):
+        """Get configured scan roots that exist on this machine"""
+        roots = []
+        for root in self.scan_roots:
+            path = Path(os.path.expanduser(root))
+            if path.is_dir() and str(path) not in roots:
+                roots.append(str(path))
+        return roots
+    
+    def _format_folder_sizes(self, sizes):
+        """Convert {folder: (apparent, allocated)} into the per-folder info dicts"""
+        scanned_at = datetime.now().isoformat()
+        folder_sizes = {}
+        for folder, (size, allocated) in sizes.items():
+            folder_sizes[folder] = {
+                "size_bytes": size,
+                "size_mb": size / 1024 / 1024,
+                "size_gb": size / 1024 / 1024 / 1024,
+                "allocated_bytes": allocated,
+                "allocated_mb": allocated / 1024 / 1024,
+                "last_scanned": scanned_at
+            }
+        return folder_sizes
+    
     def scan_folder_sizes(self, path, max_depth=2, current_depth=0):
-        """Recursively scan folder sizes"""
+        """Scan folder sizes in a single pass over the tree"""
         if current_depth > max_depth:
             return {}
-            
-        folder_sizes = {}
-        try:
-            path_obj = Path(path)
-            if not path_obj.exists():
-                return {}
-                
-            for item in path_obj.iterdir():
-                if item.is_dir():
-                    try:
-                        size = sum(f.stat().st_size for f in item.rglob('*') if f.is_file())
-                        folder_sizes[str(item)] = {
-                            "size_bytes": size,
-                            "size_mb": size / 1024 / 1024,
-                            "size_gb": size / 1024 / 1024 / 1024,
-                            "last_scanned": datetime.now().isoformat()
-                        }
-                        
-                        # Recursively scan subdirectories
-                        if current_depth < max_depth:
-                            subfolder_sizes = self.scan_folder_sizes(item, max_depth, current_depth + 1)
-                            folder_sizes.update(subfolder_sizes)
-                            
-                    except (PermissionError, OSError):
-                        continue
-        except (PermissionError, OSError):
-            pass
-            
-        return folder_sizes
+        
+        path_obj = Path(path)
+        if not path_obj.exists():
+            return {}
+        
+        self.scanner.reset_cancel()
+        sizes = self.scanner.scan(path_obj, max_depth=max_depth - current_depth)
+        self.last_scan_stats = self.scanner.last_stats.to_dict()
+        
+        return self._format_folder_sizes(sizes)
     
-    def get_app_storage_usage(self):
+    def get_app_storage_usage(self, progress_callback=None, throttled=False, full_rescan=False):
         """Estimate storage usage by applications"""
+        if not self._cache_loaded:
+            self.cache.load()
+            self._cache_loaded = True
+        full_rescan = full_rescan or self.cache.needs_full_rescan()
+        
+        # All roots share one worker pool so large and small roots balance out;
+        # directories unchanged since the last scan are reused from the cache
+        results = self.scanner.scan_many(
+            self.get_existing_scan_roots(),
+            max_depth=0,
+            progress_callback=progress_callback,
+            throttle=self.io_throttle if throttled else None,
+            cache=self.cache,
+            full_rescan=full_rescan
+        )
+        self.cache.save()
+        self.last_scan_stats = self.scanner.last_stats.to_dict()
+        self.last_scan_stats["incremental"] = not full_rescan
+        self.scan_totals = self.last_scan_stats
+        
+        self.last_app_storage_allocated = self._build_app_storage(results, "allocated_mb")
+        return self._build_app_storage(results)
+    
+    def _build_app_storage(self, results, key="size_mb"):
+        """Sum per-folder sizes by application name.
+        
+        Only the immediate subfolders of each root are applications, so
+        every byte is counted once, in the deepest app folder holding it.
+        """
         app_storage = {}
+        for sizes in results.values():
+            for folder, info in self._format_folder_sizes(sizes).items():
+                app_name = os.path.basename(folder)
+                if app_name not in app_storage:
+                    app_storage[app_name] = 0
+                app_storage[app_name] += info[key]
         
-        # Common application directories
-        app_dirs = [
-            os.path.expanduser("~/AppData/Local"),
-            os.path.expanduser("~/AppData/Roaming"),
-            "C:/Program Files",
-            "C:/Program Files (x86)",
-        ]
-        
-        for app_dir in app_dirs:
-            if os.path.exists(app_dir):
-                folder_sizes = self.scan_folder_sizes(app_dir, max_depth=1)
-                for folder, info in folder_sizes.items():
-                    app_name = os.path.basename(folder)
-                    if app_name not in app_storage:
-                        app_storage[app_name] = 0
-                    app_storage[app_name] += info["size_mb"]
-                    
         return app_storage
     
-    def scan_storage_usage(self):
+    def scan_storage_usage(self, progress_callback=None, throttled=False, full_rescan=False):
         """Perform full storage scan"""
-        if self.scan_in_progress:
-            return
-            
+        if not self._scan_lock.acquire(blocking=False):
+            return False
+        
         self.scan_in_progress = True
+        self.last_scan_started = time.monotonic()
+        
+        # The watcher edits the cache in place, so it pauses while the scan
+        # rebuilds it
+        was_watching = self.is_watching()
+        if was_watching:
+            self.watcher.stop()
         
         try:
             # Get disk usage
             disk_usage = self.get_disk_usage()
+            self.last_disk_usage = disk_usage
             
             # Get app storage usage
-            app_storage = self.get_app_storage_usage()
+            app_storage = self.get_app_storage_usage(progress_callback, throttled, full_rescan)
             
             # Update data manager
             self.data_manager.update_storage_data({
                 "disk_usage": disk_usage,
                 "app_storage": app_storage,
+                "app_storage_allocated": self.last_app_storage_allocated,
+                "scan_stats": self.scan_totals,
                 "last_scan": datetime.now().isoformat()
             })
-            
+            completed = True
+        
+        except ScanCancelled:
+            print("Storage scan cancelled")
+            completed = False
         finally:
             self.scan_in_progress = False
+            self._scan_lock.release()
+        
+        if self.live_watch and (was_watching or completed):
+            self.start_watching()
+        self.data_manager.events.publish(STORAGE_SCAN_DONE, {"completed": completed, "stats": self.last_scan_stats})
+        return completed
+    
+    def is_watching(self):
+        """Check whether live inotify accounting is active"""
+        return self.watcher is not None and self.watcher.running
+    
+    def start_watching(self):
+        """Keep storage totals current from filesystem events.
+        
+        Needs a finished scan to seed the cache. Returns False when watching
+        isn't possible, in which case periodic incremental rescans continue.
+        """
+        if self.is_watching():
+            return True
+        if not self.cache.entries:
+            return False
+        
+        self.watcher = InotifyStorageWatcher(
+            self.cache,
+            self.get_existing_scan_roots(),
+            on_change=self._on_watched_change,
+            on_degraded=self._on_watch_degraded
+        )
+        return self.watcher.start()
+    
+    def stop_watching(self):
+        """Stop live accounting and persist the cache it kept current"""
+        if self.watcher is not None:
+            self.watcher.stop()
+            self.watcher = None
+            self.cache.save()
+    
+    def _on_watched_change(self):
+        """Publish storage totals updated by the watcher"""
+        results = {root: self.cache.subtree_totals(root, 0) for root in self.get_existing_scan_roots()}
+        self.last_app_storage_allocated = self._build_app_storage(results, "allocated_mb")
+        self.data_manager.update_storage_data({
+            "disk_usage": self.last_disk_usage,
+            "app_storage": self._build_app_storage(results),
+            "app_storage_allocated": self.last_app_storage_allocated,
+            "scan_stats": self.scan_totals,
+            "last_scan": datetime.now().isoformat(),
+            "live": True
+        })
+    
+    def _on_watch_degraded(self, reason):
+        """Fall back to periodic incremental rescans"""
+        self.cache.save()
+        self.last_scan_started = None  # rescan soon to catch up on missed events
+    
+    def is_scan_due(self):
+        """Check whether the periodic background scan should run.
+        
+        While watching, only a full rescan (the daily one, or one the
+        watcher asked for after meeting hardlinks it couldn't attribute)
+        is still scheduled.
+        """
+        if self.scan_in_progress:
+            return False
+        if self.is_watching() and not self.cache.needs_full_rescan():
+            return False
+        if self.last_scan_started is None:
+            return True
+        return time.monotonic() - self.last_scan_started >= self.scan_interval
+    
+    def start_scan(self, progress_callback=None, done_callback=None, throttled=True, full_rescan=False):
+        """Run a storage scan on the tracker's background thread.
+        
+        Returns False if a scan is already running.
+        """
+        if self.scan_in_progress or (self._scan_thread and self._scan_thread.is_alive()):
+            return False
+        
+        def run():
+            completed = self.scan_storage_usage(progress_callback, throttled, full_rescan)
+            if done_callback:
+                done_callback(completed)
+        
+        # Cleared here rather than when the walk starts, so a cancel that
+        # arrives before then still stops this scan
+        self.scanner.reset_cancel()
+        self._scan_thread = threading.Thread(target=run, daemon=True)
+        self._scan_thread.start()
+        return True
+    
+    def cancel_scan(self):
+        """Cancel the running storage scan, keeping the previous results"""
+        if self.scan_in_progress or (self._scan_thread and self._scan_thread.is_alive()):
+            self.scanner.cancel()
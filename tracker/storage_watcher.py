@@ -0,0 +1,475 @@
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from tracker.storage_cache import CachedDir, INODE_MASK, link_key
+from tracker.storage_scanner import allocated_size
+
+# inotify constants from <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_DONT_FOLLOW = 0x02000000
+IN_EXCL_UNLINK = 0x04000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = (IN_MODIFY | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE |
+              IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR | IN_DONT_FOLLOW | IN_EXCL_UNLINK)
+
+_EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, name length
+
+_libc = None
+
+
+def _load_libc():
+    global _libc
+    if _libc is None:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+        _libc = libc
+    return _libc
+
+
+def inotify_available():
+    """Check whether inotify can be used on this system"""
+    if not sys.platform.startswith("linux"):
+        return False
+    try:
+        return hasattr(_load_libc(), "inotify_init1")
+    except OSError:
+        return False
+
+
+def default_watch_budget():
+    """Use at most half of the per-user inotify watch limit"""
+    try:
+        with open("/proc/sys/fs/inotify/max_user_watches") as f:
+            return max(1, min(65536, int(f.read()) // 2))
+    except (OSError, ValueError):
+        return 8192
+
+
+class WatchLimitReached(Exception):
+    """Raised when the tree needs more watches than the budget allows"""
+
+
+class InotifyStorageWatcher:
+    """Keeps StorageCache directory totals current from inotify events.
+
+    Every cached directory under the scan roots gets one watch. Events only
+    mark their directory dirty; dirty directories are re-listed once per
+    `coalesce_interval` and the size difference is propagated up to the
+    roots, so a burst of writes costs one listing per directory. Running out
+    of watches, or an event queue overflow, stops the watcher and calls
+    `on_degraded` so the caller can return to incremental rescans.
+
+    Hardlinked files stay charged to the directory the cache's link map
+    names. When that link goes away, another link listed in the same flush
+    takes over. A full rescan is requested only for links that can't be
+    placed that way, or for new links whose other links weren't listed.
+    """
+
+    def __init__(self, cache, roots, on_change=None, on_degraded=None,
+                 max_watches=None, coalesce_interval=2.0):
+        self.cache = cache
+        self.roots = list(roots)
+        self._root_set = set(self.roots)
+        self.on_change = on_change
+        self.on_degraded = on_degraded
+        self.max_watches = max_watches or default_watch_budget()
+        self.coalesce_interval = coalesce_interval
+
+        self.running = False
+        self.degraded = False
+        self.degraded_reason = None
+        self.events_seen = 0
+        self.links_unresolved = 0
+
+        self._fd = None
+        self._wd_paths = {}
+        self._path_wds = {}
+        self._dirty = set()
+        self._owned = {}         # directory -> link keys charged to it
+        self._thread = None
+
+        # Hardlink bookkeeping of the current flush
+        self._new_links = {}     # key -> st_nlink of links nobody was charged for
+        self._sightings = {}     # key -> {directory: links to it listed there}
+        self._skipped = {}       # key -> (directory, size, allocated) of a link not charged
+        self._orphaned = set()   # keys whose charged link went away
+        self._stop_event = threading.Event()
+
+    def start(self):
+        """Add watches for the cached tree and start the event thread.
+
+        Returns False (and marks the watcher degraded) if inotify is
+        unavailable or the tree doesn't fit in the watch budget.
+        """
+        if not inotify_available():
+            self._degrade("inotify is not available on this system", notify=False)
+            return False
+
+        libc = _load_libc()
+        fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            self._degrade(f"inotify_init1 failed: {os.strerror(ctypes.get_errno())}", notify=False)
+            return False
+        self._fd = fd
+
+        self._owned = {}
+        for key, path in self.cache.links.items():
+            self._owned.setdefault(path, set()).add(key)
+
+        try:
+            for root in self.roots:
+                for path in self._cached_subtree(root):
+                    self._add_watch(path)
+        except WatchLimitReached as e:
+            self._close()
+            self._degrade(str(e), notify=False)
+            return False
+
+        self.running = True
+        self.degraded = False
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self):
+        """Stop watching and release all watches"""
+        self.running = False
+        self._stop_event.set()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout=5)
+        self._thread = None
+        self._close()
+
+    def watch_count(self):
+        return len(self._wd_paths)
+
+    def _close(self):
+        if self._fd is not None:
+            try:
+                os.close(self._fd)
+            except OSError:
+                pass
+        self._fd = None
+        self._wd_paths.clear()
+        self._path_wds.clear()
+        self._dirty.clear()
+
+    def _degrade(self, reason, notify=True):
+        print(f"Storage watcher disabled: {reason}")
+        self.degraded = True
+        self.degraded_reason = reason
+        self.running = False
+        if notify and self.on_degraded:
+            self.on_degraded(reason)
+
+    def _cached_subtree(self, path):
+        """Yield path and every cached directory below it"""
+        stack = [path]
+        while stack:
+            current = stack.pop()
+            cached = self.cache.entries.get(current)
+            if cached is None:
+                continue
+            yield current
+            stack.extend(os.path.join(current, name) for name in cached.children)
+
+    def _add_watch(self, path):
+        if path in self._path_wds:
+            return
+        if len(self._wd_paths) >= self.max_watches:
+            raise WatchLimitReached(f"more than {self.max_watches} directories to watch")
+
+        wd = _load_libc().inotify_add_watch(self._fd, os.fsencode(path), WATCH_MASK)
+        if wd < 0:
+            err = ctypes.get_errno()
+            if err == errno.ENOSPC:
+                raise WatchLimitReached("the system inotify watch limit was reached")
+            return  # vanished or unreadable; its parent's listing will catch up
+
+        # A moved directory keeps its watch descriptor under the new name
+        old_path = self._wd_paths.get(wd)
+        if old_path is not None:
+            self._path_wds.pop(old_path, None)
+        self._wd_paths[wd] = path
+        self._path_wds[path] = wd
+
+    def _remove_watch(self, path):
+        wd = self._path_wds.pop(path, None)
+        if wd is None or self._wd_paths.get(wd) != path:
+            return
+        del self._wd_paths[wd]
+        _load_libc().inotify_rm_watch(self._fd, wd)
+
+    def _run(self):
+        """Read events and flush dirty directories every coalesce_interval"""
+        next_flush = None
+        while not self._stop_event.is_set():
+            timeout = 1.0 if next_flush is None else max(0.0, next_flush - time.monotonic())
+            try:
+                readable, _, _ = select.select([self._fd], [], [], timeout)
+                if readable:
+                    self._read_events()
+                    if self._dirty and next_flush is None:
+                        next_flush = time.monotonic() + self.coalesce_interval
+
+                if next_flush is not None and time.monotonic() >= next_flush:
+                    next_flush = None
+                    self._flush()
+
+            except WatchLimitReached as e:
+                self._close()
+                self._degrade(str(e))
+                return
+            except Exception as e:
+                print(f"Storage watcher error: {e}")
+                self._stop_event.wait(5)
+
+    def _read_events(self):
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return
+
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            wd, mask, _cookie, name_len = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size + name_len
+            self.events_seen += 1
+
+            if mask & IN_Q_OVERFLOW:
+                raise WatchLimitReached("the inotify event queue overflowed")
+
+            path = self._wd_paths.get(wd)
+            if path is None:
+                continue
+
+            if mask & IN_IGNORED:
+                self._wd_paths.pop(wd, None)
+                self._path_wds.pop(path, None)
+            elif mask & (IN_DELETE_SELF | IN_MOVE_SELF):
+                # The parent's listing decides what happened to it
+                self._dirty.add(os.path.dirname(path))
+            else:
+                self._dirty.add(path)
+
+    def _flush(self):
+        """Re-list every dirty directory and propagate the size changes"""
+        dirty = sorted(self._dirty, key=lambda p: p.count(os.sep))
+        self._dirty.clear()
+
+        self._new_links = {}
+        self._sightings = {}
+        self._skipped = {}
+        self._orphaned = set()
+        changed = False
+        for path in dirty:
+            if path in self.cache.entries:
+                changed = self._relist(path) or changed
+        changed = self._settle_links() or changed
+
+        if changed and self.on_change:
+            self.on_change()
+
+    def _list_own(self, path):
+        """Return (stat, own bytes, own allocated, subdirectory names) for one directory"""
+        own = 0
+        own_alloc = 0
+        names = []
+        linked = {}  # key -> [st_nlink, size, allocated, links here]
+        dir_stat = os.stat(path, follow_symlinks=False)
+        with os.scandir(path) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.path not in self._root_set:
+                            names.append(entry.name)
+                    elif entry.is_file(follow_symlinks=False):
+                        file_stat = entry.stat(follow_symlinks=False)
+                        if file_stat.st_nlink > 1:
+                            key = link_key(file_stat)
+                            if key in linked:
+                                linked[key][3] += 1
+                            else:
+                                linked[key] = [file_stat.st_nlink, file_stat.st_size,
+                                               allocated_size(file_stat), 1]
+                            continue
+                        own += file_stat.st_size
+                        own_alloc += allocated_size(file_stat)
+                except OSError:
+                    continue
+
+        link_own, link_alloc = self._attribute_links(path, linked)
+        return dir_stat, own + link_own, own_alloc + link_alloc, names
+
+    def _attribute_links(self, path, linked):
+        """Return (bytes, allocated) of the hardlinked files a directory is charged for.
+
+        A link counts here if the link map already names this directory, or
+        names none yet. Charged links that left the directory are settled
+        once the flush is done.
+        """
+        owners = self.cache.links
+        owned = self._owned.setdefault(path, set())
+        for key in owned - linked.keys():
+            owned.discard(key)
+            owners.pop(key, None)
+            self._orphaned.add(key)
+
+        own = 0
+        own_alloc = 0
+        for key, (nlink, size, allocated, count) in linked.items():
+            self._sightings.setdefault(key, {})[path] = count
+            owner = owners.get(key)
+            if owner is None:
+                owners[key] = path
+                owned.add(key)
+                if key not in self._orphaned:
+                    self._new_links[key] = nlink
+            elif owner != path:
+                self._skipped.setdefault(key, (path, size, allocated))
+                continue
+            own += size
+            own_alloc += allocated
+        return own, own_alloc
+
+    def _settle_links(self):
+        """Re-home links whose charged copy went away; returns True if a total changed.
+
+        A link to the same file listed elsewhere in this flush takes over.
+        Anything else - a lost link with no listed replacement (which may
+        just mean the file is gone), or a new link with links in directories
+        that weren't listed - can't be placed, so a full rescan is requested.
+        """
+        changed = False
+        unresolved = 0
+        for key in self._orphaned:
+            if key in self.cache.links:
+                continue  # claimed by a directory listed after it was lost
+            skipped = self._skipped.get(key)
+            if skipped is None or skipped[0] not in self.cache.entries:
+                unresolved += 1
+                continue
+            path, size, allocated = skipped
+            self.cache.links[key] = path
+            self._owned.setdefault(path, set()).add(key)
+            cached = self.cache.entries[path]
+            cached.own_bytes += size
+            cached.own_allocated += allocated
+            cached.total_bytes += size
+            cached.total_allocated += allocated
+            self._propagate(path, size, allocated)
+            changed = True
+
+        for key, nlink in self._new_links.items():
+            if sum(self._sightings[key].values()) < nlink:
+                unresolved += 1
+
+        if unresolved:
+            self.links_unresolved += unresolved
+            self.cache.request_full_rescan()
+        return changed
+
+    def _relist(self, path):
+        """Refresh one directory; returns True if any total changed"""
+        cached = self.cache.entries[path]
+        try:
+            dir_stat, own, own_alloc, names = self._list_own(path)
+        except OSError:
+            # Gone or unreadable: let the parent drop it
+            parent = os.path.dirname(path)
+            if parent in self.cache.entries and parent != path:
+                return self._relist(parent)
+            return False
+
+        old_total = cached.total_bytes
+        old_total_alloc = cached.total_allocated
+        old_names = set(cached.children)
+        new_names = set(names)
+
+        for name in old_names - new_names:
+            self._drop_subtree(os.path.join(path, name))
+        for name in new_names - old_names:
+            self._index_subtree(os.path.join(path, name))
+
+        cached.mtime_ns = dir_stat.st_mtime_ns
+        cached.inode = dir_stat.st_ino & INODE_MASK
+        cached.own_bytes = own
+        cached.own_allocated = own_alloc
+        cached.children = [n for n in names if os.path.join(path, n) in self.cache.entries]
+        self._fold(path)
+
+        delta = cached.total_bytes - old_total
+        delta_alloc = cached.total_allocated - old_total_alloc
+        if delta or delta_alloc:
+            self._propagate(path, delta, delta_alloc)
+        return delta != 0 or delta_alloc != 0 or old_names != new_names
+
+    def _fold(self, path):
+        """Recompute a directory's totals from its own files and its children"""
+        cached = self.cache.entries[path]
+        cached.total_bytes = cached.own_bytes
+        cached.total_allocated = cached.own_allocated
+        for name in cached.children:
+            child = self.cache.entries[os.path.join(path, name)]
+            cached.total_bytes += child.total_bytes
+            cached.total_allocated += child.total_allocated
+
+    def _propagate(self, path, delta, delta_alloc):
+        """Add the deltas to every cached ancestor of path"""
+        parent = os.path.dirname(path)
+        while parent != path and parent in self.cache.entries:
+            cached = self.cache.entries[parent]
+            cached.total_bytes += delta
+            cached.total_allocated += delta_alloc
+            path, parent = parent, os.path.dirname(parent)
+
+    def _drop_subtree(self, path):
+        for sub_path in list(self._cached_subtree(path)):
+            self._remove_watch(sub_path)
+            del self.cache.entries[sub_path]
+            for key in self._owned.pop(sub_path, ()):
+                self.cache.links.pop(key, None)
+                self._orphaned.add(key)
+
+    def _index_subtree(self, path):
+        """Walk a new directory, cache its totals and watch it"""
+        order = []
+        stack = [path]
+        while stack:
+            current = stack.pop()
+            try:
+                dir_stat, own, own_alloc, names = self._list_own(current)
+            except OSError:
+                continue
+
+            self._add_watch(current)
+            self.cache.entries[current] = CachedDir(dir_stat.st_mtime_ns, dir_stat.st_ino & INODE_MASK,
+                                                    own, own, names, own_alloc, own_alloc)
+            order.append(current)
+            stack.extend(os.path.join(current, name) for name in names)
+
+        # Children were appended after their parents; fold totals bottom-up
+        for current in reversed(order):
+            cached = self.cache.entries[current]
+            cached.children = [n for n in cached.children if os.path.join(current, n) in self.cache.entries]
+            self._fold(current)
@@ -0,0 +1,181 @@
+import fnmatch
+import hashlib
+import json
+import re
+from functools import lru_cache
+from pathlib import Path
+
+# Built-in rules: app name substrings per category. Earlier rules win.
+DEFAULT_CATEGORIES = {
+    "Productivity": ["notepad", "word", "excel", "powerpoint", "code", "sublime", "atom", "vscode"],
+    "Web Browsing": ["chrome", "firefox", "edge", "safari", "opera"],
+    "Communication": ["slack", "teams", "discord", "skype", "zoom"],
+    "Entertainment": ["spotify", "vlc", "netflix", "youtube", "steam"],
+    "Development": ["python", "java", "git", "docker", "terminal", "cmd"]
+}
+
+DEFAULT_PRODUCTIVE_CATEGORIES = ["Productivity", "Development"]
+
+MATCH_KINDS = ("substring", "glob", "regex")
+FIELDS = ("exe", "title")
+
+
+def default_rules():
+    return [
+        {"category": category, "field": "exe", "match": "substring", "pattern": keyword}
+        for category, keywords in DEFAULT_CATEGORIES.items()
+        for keyword in keywords
+    ]
+
+
+class AppCategorizer:
+    """Maps (app name, window title) to a category using ordered rules.
+
+    Rules are dicts like {"category": "Development", "field": "exe" or
+    "title", "match": "substring", "glob" or "regex", "pattern": "git"},
+    matched case-insensitively; the first matching rule wins. All rules for
+    a field are compiled into one regex of zero-width alternatives, so a
+    lookup is one scan per field whatever the rule count, and results are
+    memoized per (app, title). Regex rules that can't be embedded there
+    (inline global flags like (?i), capture groups) are matched one by one.
+    """
+
+    def __init__(self, rules=None, productive_categories=None, memo_size=4096):
+        self.rules = list(rules) if rules is not None else default_rules()
+        self.productive_categories = set(productive_categories if productive_categories is not None
+                                         else DEFAULT_PRODUCTIVE_CATEGORIES)
+        self.memo_size = memo_size
+        self._compile()
+
+    @classmethod
+    def load(cls, file_path, **kwargs):
+        """Load rules from a JSON file, falling back to the built-in rules"""
+        file_path = Path(file_path)
+        if file_path.exists():
+            try:
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                return cls(data.get("rules"), data.get("productive_categories"), **kwargs)
+            except Exception as e:
+                print(f"Error loading category rules: {e}")
+        return cls(**kwargs)
+
+    def save(self, file_path):
+        """Write the rules as JSON for hand editing"""
+        data = {
+            "productive_categories": sorted(self.productive_categories),
+            "rules": self.rules
+        }
+        try:
+            with open(file_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2)
+        except Exception as e:
+            print(f"Error saving category rules: {e}")
+
+    def fingerprint(self):
+        """Hash of the rules, for invalidating results computed with other rules"""
+        encoded = json.dumps([self.rules, sorted(self.productive_categories)], sort_keys=True)
+        return hashlib.sha1(encoded.encode("utf-8")).hexdigest()
+
+    def _compile(self):
+        alternatives = {field: [] for field in FIELDS}
+        # Regexes that can't be embedded in the combined pattern (inline
+        # global flags, capture groups whose numbers or names would clash)
+        # are matched on their own: field -> [(rule index, compiled)]
+        fallbacks = {field: [] for field in FIELDS}
+        for index, rule in enumerate(self.rules):
+            field = rule.get("field", "exe")
+            kind = rule.get("match", "substring")
+            pattern = rule.get("pattern", "")
+            if field not in FIELDS or kind not in MATCH_KINDS or not pattern:
+                print(f"Skipping invalid category rule: {rule}")
+                continue
+
+            if kind == "substring":
+                expression = re.escape(pattern)
+            elif kind == "glob":
+                expression = "^" + fnmatch.translate(pattern)  # whole value
+            else:
+                expression = pattern
+                try:
+                    compiled = re.compile(expression, re.IGNORECASE | re.DOTALL)
+                except re.error as e:
+                    print(f"Skipping category rule with bad regex {pattern!r}: {e}")
+                    continue
+                if compiled.groups or not self._embeddable(index, expression):
+                    fallbacks[field].append((index, compiled))
+                    continue
+
+            # Zero-width, so at each position the lowest-indexed rule that
+            # matches there is reported and no match hides another
+            alternatives[field].append((index, f"(?=(?P<r{index}>{expression}))"))
+
+        self._categories = [rule.get("category", "Other") for rule in self.rules]
+        self._matchers = {}
+        for field, parts in alternatives.items():
+            try:
+                self._matchers[field] = (re.compile("|".join(part for _, part in parts), re.IGNORECASE | re.DOTALL)
+                                         if parts else None)
+            except re.error as e:
+                # Shouldn't happen once each part compiled on its own; match them one by one
+                print(f"Category rules for {field} could not be combined ({e}); matching separately")
+                self._matchers[field] = None
+                fallbacks[field].extend((index, re.compile(part, re.IGNORECASE | re.DOTALL)) for index, part in parts)
+        self._fallbacks = {field: sorted(rules, key=lambda item: item[0]) for field, rules in fallbacks.items()}
+        self._lookup = lru_cache(maxsize=self.memo_size)(self._match)
+
+    @staticmethod
+    def _embeddable(index, expression):
+        """True if a regex still compiles wrapped the way the combined pattern wraps it"""
+        try:
+            re.compile(f"(?=(?P<r{index}>{expression}))", re.IGNORECASE | re.DOTALL)
+            return True
+        except re.error:
+            return False
+
+    def _first_rule(self, matcher, value):
+        best = None
+        for match in matcher.finditer(value):
+            index = int(match.lastgroup[1:])
+            if best is None or index < best:
+                best = index
+                if index == 0:
+                    break
+        return best
+
+    def _match(self, app_name, window_title):
+        best = None
+        for field, value in (("exe", app_name), ("title", window_title)):
+            if not value:
+                continue
+            matcher = self._matchers[field]
+            if matcher is not None:
+                index = self._first_rule(matcher, value)
+                if index is not None and (best is None or index < best):
+                    best = index
+            for index, regex in self._fallbacks[field]:
+                if best is not None and index >= best:
+                    break
+                if regex.search(value):
+                    best = index
+                    break
+        category = self._categories[best] if best is not None else "Other"
+        return category, category in self.productive_categories
+
+    def classify(self, app_name, window_title=""):
+        """Return (category, is productive) for an app and window title"""
+        return self._lookup(app_name or "", window_title or "")
+
+    def categorize(self, app_name, window_title=""):
+        return self.classify(app_name, window_title)[0]
+
+    def is_productive(self, app_name, window_title=""):
+        return self.classify(app_name, window_title)[1]
+
+    def __getstate__(self):
+        # The memo wrapper can't be pickled; worker processes rebuild it
+        return {"rules": self.rules, "productive_categories": sorted(self.productive_categories),
+                "memo_size": self.memo_size}
+
+    def __setstate__(self, state):
+        self.__init__(state["rules"], state["productive_categories"], state["memo_size"])
@@ -3,11 +3,15 @@ import os
 from datetime import datetime, date
 import pandas as pd
 from pathlib import Path
+from utils.storage_history import StorageHistory
+from utils.app_categorizer import AppCategorizer
+from utils.day_snapshot import DaySnapshot, SessionView
+from utils.event_bus import EventBus
 
 class DataManager:
-    def __init__(self):
-        self.data_dir = Path("data")
-        self.data_dir.mkdir(exist_ok=True)
+    def __init__(self, data_dir="data"):
+        self.data_dir = Path(data_dir)
+        self.data_dir.mkdir(parents=True, exist_ok=True)
         
         # Current session data
         self.current_activity = {}
@@ -15,9 +19,22 @@ class DataManager:
         self.storage_data = {}
         self.location_data = {}
         
+        # Bumped whenever app_sessions changes, so views can skip redundant refreshes
+        self.generation = 0
+        
+        # Trackers publish what changed here; the GUI subscribes
+        self.events = EventBus()
+        
+        # Storage snapshots live in their own content-addressed store
+        # (live watching publishes often, so sub-MB drift isn't recorded)
+        self.storage_history = StorageHistory(self.data_dir / "storage", min_change_mb=1.0)
+        
+        # Category rules shared by reports and views (user-editable JSON)
+        self.categorizer = AppCategorizer.load(self.data_dir / "category_rules.json")
+        
         # Load today's data if exists
         self.load_daily_data()
-        
+    
     def get_daily_file_path(self, target_date=None):
         """Get file path for daily data"""
         if target_date is None:
@@ -32,18 +49,41 @@ class DataManager:
                 with open(file_path, 'r') as f:
                     data = json.load(f)
                     self.app_sessions = data.get("app_sessions", [])
-                    self.storage_data = data.get("storage_data", {})
+                    self.generation += 1
+                    if "storage_data" in data:
+                        # Day files written before the snapshot store existed
+                        self.storage_data = data["storage_data"]
+                    else:
+                        self.storage_data = self.storage_history.load_snapshot(
+                            data.get("storage_snapshot"), data.get("storage_scan") or data.get("last_updated"))
                     self.location_data = data.get("location_data", {})
             except Exception as e:
                 print(f"Error loading daily data: {e}")
     
+    def snapshot(self, target_date=None):
+        """Get a read-only view of a day's data that live tracking can't disturb.
+        
+        Today's view shares the live session list (it's only ever appended
+        to), so it's cheap to take and safe to read from another thread.
+        """
+        if target_date is None or target_date == date.today():
+            return DaySnapshot(
+                date.today(),
+                SessionView(self.app_sessions),
+                self.storage_data,
+                self.location_data,
+                getattr(self, 'resource_data', {})
+            )
+        return DaySnapshot.from_file(target_date, self.get_daily_file_path(target_date), self.storage_history)
+    
     def save_daily_data(self, target_date=None):
         """Save current data to daily file"""
         file_path = self.get_daily_file_path(target_date)
         data = {
             "date": date.today().isoformat(),
             "app_sessions": self.app_sessions,
-            "storage_data": self.storage_data,
+            "storage_snapshot": self.storage_history.current_hash,
+            "storage_scan": self.storage_history.current_scan,
             "location_data": self.location_data,
             "last_updated": datetime.now().isoformat()
         }
@@ -54,7 +94,7 @@ class DataManager:
         except Exception as e:
             print(f"Error saving daily data: {e}")
     
-    def add_app_session(self, app_name, start_time, end_time, duration, was_active):
+    def add_app_session(self, app_name, start_time, end_time, duration, was_active, window_title=None):
         """Add an app usage session"""
         session = {
             "app_name": app_name,
@@ -64,7 +104,11 @@ class DataManager:
             "was_active": was_active,
             "date": date.today().isoformat()
         }
+        if window_title:
+            session["window_title"] = window_title
         self.app_sessions.append(session)
+        self.generation += 1
+        return session
     
     def update_current_activity(self, activity_data):
         """Update current activity data"""
@@ -73,15 +117,16 @@ class DataManager:
     def update_storage_data(self, storage_data):
         """Update storage usage data"""
         self.storage_data = storage_data
+        self.storage_history.record(storage_data)
     
     def update_location_data(self, location_data):
         """Update location data"""
         self.location_data = location_data
-
+    
     def update_resource_data(self, resource_data):
         """Update resource usage data"""
         self.resource_data = resource_data
-
+    
     def add_app_alert(self, alert):
         """Add app timer alert to log"""
         if not hasattr(self, 'app_alerts'):
@@ -93,7 +138,7 @@ class DataManager:
         # Keep only last 100 alerts
         if len(self.app_alerts) > 100:
             self.app_alerts = self.app_alerts[-100:]
-
+    
     def get_resource_summary(self):
         """Get resource usage summary"""
         if not hasattr(self, 'resource_data') or not self.resource_data:
@@ -105,6 +150,10 @@ class DataManager:
             "last_updated": self.resource_data.get('timestamp', '')
         }
     
+    def get_storage_growth(self, since, limit=10):
+        """Get the apps whose storage grew most since a scan index or ISO timestamp"""
+        return self.storage_history.top_growers(since, limit=limit)
+    
     def get_app_usage_summary(self, days=1):
         """Get app usage summary for specified days"""
         app_usage = {}
@@ -0,0 +1,117 @@
+import json
+from collections.abc import Sequence
+from types import MappingProxyType
+from utils.report_aggregator import iter_day_sessions
+
+
+class SessionView(Sequence):
+    """Read-only view of the first `length` sessions of a session list.
+
+    The live list is only ever appended to (and replaced wholesale when the
+    day changes), so a prefix of it never changes: the view shares the
+    list instead of copying it, and later appends aren't visible. Sessions
+    are handed out as read-only mappings.
+    """
+
+    __slots__ = ("_sessions", "_length")
+
+    def __init__(self, sessions, length=None):
+        self._sessions = sessions
+        self._length = len(sessions) if length is None else length
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return tuple(MappingProxyType(session) for session in self._sessions[:self._length][index])
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("session index out of range")
+        return MappingProxyType(self._sessions[index])
+
+    def __iter__(self):
+        sessions = self._sessions
+        for index in range(self._length):
+            yield MappingProxyType(sessions[index])
+
+
+class DaySnapshot:
+    """Immutable view of one day's data for reports and analytics.
+
+    Today's snapshot is a SessionView over the live list, so taking one is
+    O(1) and tracking can keep appending while a report runs on another
+    thread. Past days read their day file, streaming the sessions each time
+    they're iterated unless `sessions` (which loads them once) is used.
+    """
+
+    def __init__(self, day, sessions=None, storage_data=None, location_data=None, resource_data=None,
+                 file_path=None, storage_history=None):
+        self.day = day
+        self.live = file_path is None
+        self.file_path = file_path
+        self._sessions = sessions
+        self._storage_history = storage_history
+        self._metadata = None
+        if self.live:
+            self._metadata = {
+                "storage_data": MappingProxyType(dict(storage_data or {})),
+                "location_data": MappingProxyType(dict(location_data or {})),
+                "resource_data": MappingProxyType(dict(resource_data or {}))
+            }
+
+    @classmethod
+    def from_file(cls, day, file_path, storage_history=None):
+        return cls(day, file_path=file_path, storage_history=storage_history)
+
+    def iter_sessions(self):
+        """Iterate the day's sessions without holding them all in memory"""
+        if self._sessions is not None:
+            return iter(self._sessions)
+        if self.file_path is None or not self.file_path.exists():
+            return iter(())
+        return (MappingProxyType(session) for session in iter_day_sessions(self.file_path))
+
+    @property
+    def sessions(self):
+        """All sessions as a read-only sequence"""
+        if self._sessions is None:
+            sessions = []
+            if self.file_path is not None and self.file_path.exists():
+                sessions = list(iter_day_sessions(self.file_path))
+            self._sessions = SessionView(sessions)
+        return self._sessions
+
+    def _load_metadata(self):
+        metadata = {"storage_data": {}, "location_data": {}, "resource_data": {}}
+        if self.file_path is not None and self.file_path.exists():
+            try:
+                with open(self.file_path, 'r') as f:
+                    data = json.load(f)
+                if "storage_data" in data:
+                    metadata["storage_data"] = data["storage_data"]
+                elif self._storage_history is not None and data.get("storage_snapshot"):
+                    metadata["storage_data"] = self._storage_history.load_snapshot(
+                        data["storage_snapshot"], data.get("storage_scan") or data.get("last_updated"))
+                metadata["location_data"] = data.get("location_data", {})
+            except Exception as e:
+                print(f"Error loading day snapshot {self.file_path}: {e}")
+        self._metadata = {key: MappingProxyType(value) for key, value in metadata.items()}
+
+    def _meta(self, key):
+        if self._metadata is None:
+            self._load_metadata()
+        return self._metadata[key]
+
+    @property
+    def storage_data(self):
+        return self._meta("storage_data")
+
+    @property
+    def location_data(self):
+        return self._meta("location_data")
+
+    @property
+    def resource_data(self):
+        return self._meta("resource_data")
@@ -0,0 +1,98 @@
+import threading
+from collections import defaultdict
+
+# Topics published by the trackers
+SESSION_CLOSED = "session_closed"        # payload: the session dict
+ACTIVITY_CHANGED = "activity_changed"    # payload: current activity dict
+ALERT = "alert"                          # payload: app timer alert dict
+APP_BLOCKED = "app_blocked"              # payload: {"app_name", "blocked"}
+LIMITS_CHANGED = "limits_changed"        # payload: {"app_name", "limit_seconds" or None}
+RESOURCES_UPDATED = "resources_updated"  # payload: resource data dict
+STORAGE_SCAN_DONE = "storage_scan_done"  # payload: {"completed", "stats"}
+
+# Topics where only the latest event matters: if several arrive before a
+# drain, subscribers see just the last one
+COALESCED_TOPICS = {SESSION_CLOSED, ACTIVITY_CHANGED, RESOURCES_UPDATED, STORAGE_SCAN_DONE}
+
+
+class EventBus:
+    """In-process publish/subscribe from tracker threads to the GUI.
+
+    publish() is thread-safe and only queues the event. Queued events are
+    delivered by drain(), which is scheduled once per batch through the
+    scheduler given to attach() - for the GUI, root.after - so subscribers
+    run on the Tk thread, nothing runs while nothing happens, and a burst
+    of coalesced events costs one callback each. Without a scheduler,
+    events are delivered right away on the publishing thread.
+    """
+
+    def __init__(self, coalesced_topics=COALESCED_TOPICS):
+        self.coalesced_topics = set(coalesced_topics)
+        self._subscribers = defaultdict(list)
+        self._lock = threading.Lock()
+        self._pending = []         # [topic, payload] in arrival order
+        self._coalesced = {}       # topic -> its entry in _pending
+        self._scheduled = False
+        self._schedule = None
+
+    def attach(self, schedule):
+        """Deliver events through schedule(callback), e.g. lambda cb: root.after(0, cb)"""
+        self._schedule = schedule
+
+    def detach(self):
+        self._schedule = None
+
+    def subscribe(self, topic, callback):
+        """Call callback(payload) for every delivered event on a topic"""
+        with self._lock:
+            self._subscribers[topic].append(callback)
+
+    def unsubscribe(self, topic, callback):
+        with self._lock:
+            if callback in self._subscribers[topic]:
+                self._subscribers[topic].remove(callback)
+
+    def publish(self, topic, payload=None):
+        with self._lock:
+            entry = self._coalesced.get(topic)
+            if entry is not None:
+                entry[1] = payload
+            else:
+                entry = [topic, payload]
+                self._pending.append(entry)
+                if topic in self.coalesced_topics:
+                    self._coalesced[topic] = entry
+            wake = not self._scheduled
+            self._scheduled = True
+
+        if wake:
+            schedule = self._schedule
+            if schedule is None:
+                self.drain()
+                return
+            try:
+                schedule(self.drain)
+            except Exception as e:
+                # The GUI loop is gone (RuntimeError, or TclError once the root
+                # is destroyed); detach and fall back to direct delivery
+                print(f"Event scheduling failed, delivering directly: {e}")
+                with self._lock:
+                    if self._schedule is schedule:
+                        self._schedule = None
+                    self._scheduled = False
+                self.drain()
+
+    def drain(self):
+        """Deliver everything queued so far"""
+        with self._lock:
+            pending, self._pending = self._pending, []
+            self._coalesced = {}
+            self._scheduled = False
+            subscribers = {topic: list(callbacks) for topic, callbacks in self._subscribers.items()}
+
+        for topic, payload in pending:
+            for callback in subscribers.get(topic, ()):
+                try:
+                    callback(payload)
+                except Exception as e:
+                    print(f"Event handler error ({topic}): {e}")
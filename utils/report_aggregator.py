@@ -0,0 +1,338 @@
+import json
+import re
+from collections import defaultdict
+from array import array
+from datetime import datetime
+import numpy as np
+from utils.app_categorizer import AppCategorizer
+from utils.time_binning import hour_of_day_occupancy
+
+_LOCAL_EPOCH = datetime(1970, 1, 1)
+_HOURLY_BATCH = 65536  # sessions buffered before binning, to bound memory
+_STRUCTURE = re.compile(r'["\[\]{}]')
+_STRING_END = re.compile(r'["\\]')
+
+class _JsonStream:
+    """Incremental reader over a JSON document, one value at a time"""
+
+    def __init__(self, f, chunk_size):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder()
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self):
+        if self.eof:
+            return False
+        chunk = self.f.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        if self.pos > self.chunk_size:
+            self.buf = self.buf[self.pos:]
+            self.pos = 0
+        self.buf += chunk
+        return True
+
+    def peek(self):
+        """Return the next non-whitespace character without consuming it"""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in " \t\r\n":
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise ValueError(f"expected {char!r} in day file")
+        self.pos += 1
+
+    def value(self):
+        """Decode the next complete JSON value"""
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            # A number at the end of the buffer may continue in the next chunk
+            if end == len(self.buf) and not self.eof and self._fill():
+                continue
+            self.pos = end
+            return value
+
+    def skip(self):
+        """Move past the next JSON value without decoding it.
+
+        Containers and strings are crossed by tracking bracket depth and
+        string state, one regex jump at a time, so skipping a value of any
+        size costs one pass over it and holds at most two read chunks.
+        """
+        if self.peek() not in '[{"':
+            self.value()  # a number, true, false or null
+            return
+        depth = 0
+        in_string = False
+        while True:
+            match = (_STRING_END if in_string else _STRUCTURE).search(self.buf, self.pos)
+            if match is None:
+                self.pos = len(self.buf)
+                if not self._fill():
+                    raise ValueError("unexpected end of day file")
+                continue
+            char = match.group()
+            self.pos = match.end()
+            if in_string:
+                if char == "\\":
+                    # The escaped character may start the next chunk
+                    while self.pos >= len(self.buf):
+                        if not self._fill():
+                            raise ValueError("unexpected end of day file")
+                    self.pos += 1
+                    continue
+                in_string = False
+                if depth == 0:
+                    return
+            elif char == '"':
+                in_string = True
+            elif char in "[{":
+                depth += 1
+            else:
+                depth -= 1
+                if depth == 0:
+                    return
+
+
+def iter_day_sessions(file_path, chunk_size=64 * 1024):
+    """Yield the app sessions of a day file one at a time.
+
+    Only the current session and one read chunk are held in memory, so very
+    large days can be aggregated without loading the whole file. Other
+    top-level values (e.g. the inline storage_data of older day files) are
+    skipped without being decoded.
+    """
+    with open(file_path, 'r', encoding='utf-8') as f:
+        stream = _JsonStream(f, chunk_size)
+        stream.expect("{")
+        while stream.peek() not in ("}", ""):
+            key = stream.value()
+            stream.expect(":")
+            if key != "app_sessions":
+                stream.skip()
+            else:
+                stream.expect("[")
+                while stream.peek() not in ("]", ""):
+                    yield stream.value()
+                    if stream.peek() == ",":
+                        stream.pos += 1
+                stream.pos += 1
+            if stream.peek() == ",":
+                stream.pos += 1
+
+
+class ReportAggregator:
+    """Builds every session-based report section in one pass.
+
+    Feed sessions with add() (or add_all() from any iterable, e.g.
+    iter_day_sessions) and read summary(), app_usage(), productivity() and
+    timeline() afterwards. Each session's timestamps are parsed once, and
+    categories come from the categorizer's memo.
+    """
+
+    def __init__(self, categorizer=None, top_apps=20, keep_timeline=True):
+        self.categorizer = categorizer or AppCategorizer()
+        self.top_apps = top_apps
+        self.keep_timeline = keep_timeline  # the only section that grows with the session count
+
+        self.total_time = 0
+        self.active_time = 0
+        self.apps = {}        # app name -> [total, active, sessions]
+        self.hourly = defaultdict(lambda: {"productive": 0, "total": 0})
+        self._timeline = []   # (start, app, end, duration, active)
+        self._timeline_sorted = True
+        self.app_categories = {}  # app name -> category of its first session
+        self.days = {}        # ISO date -> [total, active]
+        # Sessions waiting to be split into clock hours by the binning kernel
+        self._starts, self._ends = array("d"), array("d")
+        self._weights, self._productive = array("d"), array("b")
+
+    def add(self, session):
+        """Fold one session into every section"""
+        app_name = session['app_name']
+        duration = session['duration_seconds']
+        active = session['was_active']
+
+        self.total_time += duration
+        if active:
+            self.active_time += duration
+
+        stats = self.apps.get(app_name)
+        if stats is None:
+            stats = self.apps[app_name] = [0, 0, 0]
+        stats[0] += duration
+        stats[2] += 1
+        if active:
+            stats[1] += duration
+
+        category, productive = self.categorizer.classify(app_name, session.get('window_title', ''))
+        self.app_categories.setdefault(app_name, category)
+        start = datetime.fromisoformat(session['start_time'])
+        end = datetime.fromisoformat(session['end_time'])
+        start_seconds = (start - _LOCAL_EPOCH).total_seconds()
+        span = (end - start).total_seconds()
+        if span <= 0:
+            span = duration  # zero-length record: charge its duration from the start
+        self._starts.append(start_seconds)
+        self._ends.append(start_seconds + span)
+        self._weights.append(duration / span if span > 0 else 0.0)
+        self._productive.append(1 if productive else 0)
+        if len(self._starts) >= _HOURLY_BATCH:
+            self._flush_hourly()
+
+        day = session.get('date') or start.date().isoformat()
+        day_totals = self.days.get(day)
+        if day_totals is None:
+            day_totals = self.days[day] = [0, 0]
+        day_totals[0] += duration
+        if active:
+            day_totals[1] += duration
+
+        if self.keep_timeline:
+            if self._timeline and session['start_time'] < self._timeline[-1][0]:
+                self._timeline_sorted = False
+            self._timeline.append((session['start_time'], app_name, session['end_time'], duration, active))
+
+    def add_all(self, sessions):
+        for session in sessions:
+            self.add(session)
+        return self
+
+    def to_partial(self):
+        """JSON-serializable totals that merge() can combine (timeline excluded)"""
+        self._flush_hourly()
+        return {
+            "total_time": self.total_time,
+            "active_time": self.active_time,
+            "apps": self.apps,
+            "app_categories": self.app_categories,
+            "hourly": {str(hour): [data["productive"], data["total"]] for hour, data in self.hourly.items()},
+            "days": self.days
+        }
+
+    def merge(self, partial):
+        """Add another aggregator's to_partial() into this one.
+
+        Merging is associative and order-independent apart from which
+        category an app keeps when days disagree (the first one merged).
+        """
+        self.total_time += partial["total_time"]
+        self.active_time += partial["active_time"]
+        for app, (total, active, count) in partial["apps"].items():
+            stats = self.apps.get(app)
+            if stats is None:
+                self.apps[app] = [total, active, count]
+            else:
+                stats[0] += total
+                stats[1] += active
+                stats[2] += count
+        for app, category in partial["app_categories"].items():
+            self.app_categories.setdefault(app, category)
+        for hour, (productive, total) in partial["hourly"].items():
+            bucket = self.hourly[int(hour)]
+            bucket["productive"] += productive
+            bucket["total"] += total
+        for day, (total, active) in partial["days"].items():
+            day_totals = self.days.setdefault(day, [0, 0])
+            day_totals[0] += total
+            day_totals[1] += active
+        return self
+
+    def daily_totals(self):
+        """Return [(ISO date, total seconds, active seconds)] in date order"""
+        return [(day, total, active) for day, (total, active) in sorted(self.days.items())]
+
+    def _flush_hourly(self):
+        """Bin the buffered sessions into clock hours and clear the buffer"""
+        if not self._starts:
+            return
+        starts = np.frombuffer(self._starts, dtype=np.float64)
+        ends = np.frombuffer(self._ends, dtype=np.float64)
+        weights = np.frombuffer(self._weights, dtype=np.float64)
+        productive = np.frombuffer(self._productive, dtype=np.int8).astype(np.int64)
+        binned = hour_of_day_occupancy(starts, ends, productive, 2, weights)
+        for hour in np.flatnonzero(binned.sum(axis=0)):
+            bucket = self.hourly[int(hour)]
+            bucket["total"] += float(binned[0, hour] + binned[1, hour])
+            bucket["productive"] += float(binned[1, hour])
+        self._starts, self._ends = array("d"), array("d")
+        self._weights, self._productive = array("d"), array("b")
+
+    def summary(self):
+        if not self.apps:
+            return {
+                "total_time": 0,
+                "active_time": 0,
+                "apps_used": 0,
+                "most_used_app": "None"
+            }
+
+        most_used_app = max(self.apps.items(), key=lambda x: x[1][0])[0]
+        return {
+            "total_time": self.total_time,
+            "active_time": self.active_time,
+            "apps_used": len(self.apps),
+            "most_used_app": most_used_app,
+            "productivity_ratio": (self.active_time / self.total_time * 100) if self.total_time > 0 else 0
+        }
+
+    def app_usage(self):
+        """Top apps by total time"""
+        sorted_apps = sorted(self.apps.items(), key=lambda x: x[1][0], reverse=True)
+        return {
+            app: {
+                "total_time": total,
+                "active_time": active,
+                "sessions": count,
+                "category": self.app_categories[app]
+            }
+            for app, (total, active, count) in sorted_apps[:self.top_apps]
+        }
+
+    def productivity(self):
+        if not self.apps:
+            return {"score": 0, "insights": []}
+
+        self._flush_hourly()
+        total_time = sum(data["total"] for data in self.hourly.values())
+        productive_time = sum(data["productive"] for data in self.hourly.values())
+        productivity_score = (productive_time / total_time * 100) if total_time > 0 else 0
+
+        insights = []
+        if productivity_score > 70:
+            insights.append("Excellent productivity! You spent most of your time on productive tasks.")
+        elif productivity_score > 40:
+            insights.append("Good productivity balance. Consider reducing time on non-productive apps.")
+        else:
+            insights.append("Low productivity detected. Try to focus more on work-related applications.")
+
+        return {
+            "score": productivity_score,
+            "insights": insights,
+            "hourly_data": dict(self.hourly)
+        }
+
+    def timeline(self):
+        """Sessions sorted by start time"""
+        if not self._timeline_sorted:
+            self._timeline.sort(key=lambda item: item[0])
+            self._timeline_sorted = True
+        return [
+            {"app": app, "start": start, "end": end, "duration": duration, "active": active}
+            for start, app, end, duration, active in self._timeline
+        ]
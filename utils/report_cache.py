@@ -0,0 +1,116 @@
+import hashlib
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+
+
+def file_digest(file_path, chunk_size=1024 * 1024):
+    """SHA-256 of a file's contents, read in chunks"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ReportCache:
+    """Reuses rendered reports whose inputs haven't changed.
+
+    Each report gets a sidecar manifest (<report>.manifest.json) recording a
+    key - a hash of the input data, the generator version and the report
+    options - along with the inputs, build time and report size. A report is
+    current when its manifest key matches and the file is still the size it
+    was written at.
+
+    Closed days are keyed on the day file's contents. The content hash is
+    remembered in the manifest with the file's mtime and size, so checking
+    an unchanged day doesn't read it at all, while a rewritten file is
+    re-hashed (and only rebuilt if its contents really differ). Today's
+    report is keyed on the live sessions themselves.
+    """
+
+    def __init__(self, version):
+        self.version = version
+
+    @staticmethod
+    def manifest_path(report_path):
+        report_path = Path(report_path)
+        return report_path.with_name(report_path.name + ".manifest.json")
+
+    def load_manifest(self, report_path):
+        path = self.manifest_path(report_path)
+        if not path.exists():
+            return None
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"Ignoring unreadable report manifest {path}: {e}")
+            return None
+
+    def snapshot_inputs(self, snapshot, manifest=None):
+        """Describe a day snapshot's data, including a hash of its contents"""
+        if snapshot.live:
+            digest = hashlib.sha256()
+            for session in snapshot.iter_sessions():
+                digest.update(json.dumps(dict(session), sort_keys=True, default=str).encode("utf-8"))
+                digest.update(b"\n")
+            return {
+                "day": snapshot.day.isoformat(),
+                "source": "live",
+                "sessions": len(snapshot.sessions),
+                "resource_data": bool(snapshot.resource_data),
+                "sha256": digest.hexdigest()
+            }
+
+        inputs = {"day": snapshot.day.isoformat(), "source": str(snapshot.file_path)}
+        if not snapshot.file_path.exists():
+            inputs["sha256"] = None
+            return inputs
+
+        stat = os.stat(snapshot.file_path)
+        inputs["mtime_ns"] = stat.st_mtime_ns
+        inputs["size"] = stat.st_size
+        previous = (manifest or {}).get("inputs", {})
+        if all(previous.get(field) == inputs[field] for field in ("source", "mtime_ns", "size")) and previous.get("sha256"):
+            inputs["sha256"] = previous["sha256"]
+        else:
+            inputs["sha256"] = file_digest(snapshot.file_path)
+        return inputs
+
+    def key(self, inputs, options):
+        """Hash of everything that determines a report's contents"""
+        content = {key: value for key, value in inputs.items() if key not in ("mtime_ns", "size")}
+        encoded = json.dumps([self.version, content, options], sort_keys=True)
+        return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+    def is_current(self, report_path, key, manifest=None):
+        if manifest is None:
+            manifest = self.load_manifest(report_path)
+        if not manifest or manifest.get("key") != key:
+            return False
+        try:
+            return os.path.getsize(report_path) == manifest.get("report_size")
+        except OSError:
+            return False
+
+    def record(self, report_path, key, inputs, options, build_seconds):
+        """Write the manifest for a freshly built report"""
+        manifest = {
+            "key": key,
+            "version": self.version,
+            "inputs": inputs,
+            "options": options,
+            "built_at": datetime.now().isoformat(),
+            "build_seconds": round(build_seconds, 4),
+            "report_size": os.path.getsize(report_path)
+        }
+        path = self.manifest_path(report_path)
+        try:
+            temp_path = path.with_suffix(".tmp")
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(manifest, f, indent=2)
+            os.replace(temp_path, path)
+        except Exception as e:
+            print(f"Error saving report manifest {path}: {e}")
@@ -1,165 +1,204 @@
+import argparse
 import json
-from datetime import datetime, timedelta
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date, datetime, timedelta
 from pathlib import Path
-import matplotlib.pyplot as plt
-import matplotlib.dates as mdates
-from collections import defaultdict
+from html import escape
+from utils.report_aggregator import ReportAggregator
+from utils.report_cache import ReportCache
+from utils.report_rollups import RollupCache, collect_partials, merge_partials
+from utils.report_svg import timeline_svg_chunks
+
+_HTML_HEAD = """<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="utf-8">
+    <title>TimeLedger {title} - {date}</title>
+    <style>
+        body {{ font-family: Arial, sans-serif; margin: 20px; background-color: #f5f5f5; }}
+        .container {{ max-width: 1200px; margin: 0 auto; background: white; padding: 20px; border-radius: 10px; box-shadow: 0 2px 10px rgba(0,0,0,0.1); }}
+        .header {{ text-align: center; color: #333; border-bottom: 2px solid #4CAF50; padding-bottom: 20px; }}
+        .summary {{ display: grid; grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); gap: 20px; margin: 20px 0; }}
+        .stat-card {{ background: #4CAF50; color: white; padding: 20px; border-radius: 8px; text-align: center; }}
+        .stat-value {{ font-size: 2em; font-weight: bold; }}
+        .stat-label {{ font-size: 0.9em; opacity: 0.9; }}
+        .section {{ margin: 30px 0; }}
+        .section h2 {{ color: #333; border-left: 4px solid #4CAF50; padding-left: 10px; }}
+        .app-list {{ display: grid; gap: 10px; }}
+        .app-item {{ display: flex; justify-content: space-between; padding: 10px; background: #f9f9f9; border-radius: 5px; }}
+        .timeline {{ background: #f9f9f9; padding: 15px; border-radius: 5px; }}
+        .insight {{ background: #e3f2fd; padding: 15px; border-left: 4px solid #2196F3; margin: 10px 0; }}
+    </style>
+</head>
+<body>
+    <div class="container">
+        <div class="header">
+            <h1>📊 TimeLedger {title}</h1>
+            <p>Report for {date}</p>
+        </div>
+"""
+
+_HTML_SUMMARY = """
+        <div class="summary">
+            <div class="stat-card">
+                <div class="stat-value">{total_hours:.1f}h</div>
+                <div class="stat-label">Total Time</div>
+            </div>
+            <div class="stat-card">
+                <div class="stat-value">{active_hours:.1f}h</div>
+                <div class="stat-label">Active Time</div>
+            </div>
+            <div class="stat-card">
+                <div class="stat-value">{apps_used}</div>
+                <div class="stat-label">Apps Used</div>
+            </div>
+            <div class="stat-card">
+                <div class="stat-value">{productivity:.0f}%</div>
+                <div class="stat-label">Productivity</div>
+            </div>
+        </div>
+"""
+
+_HTML_ITEM = """
+            <div class="app-item">
+                <span><strong>{name}</strong>{detail}</span>
+                <span>{value}</span>
+            </div>"""
+
+# Bump whenever the report's contents or layout change, so cached reports
+# built by an older generator are rebuilt
+REPORT_VERSION = 1
+
+# Apps listed in detail in each report
+TOP_APPS = 20
 
 class ReportGenerator:
-    def __init__(self, data_manager):
+    def __init__(self, data_manager, reports_dir="reports"):
         self.data_manager = data_manager
-        self.reports_dir = Path("reports")
-        self.reports_dir.mkdir(exist_ok=True)
-        
-    def generate_daily_report(self, target_date=None):
-        """Generate comprehensive daily report"""
+        self.reports_dir = Path(reports_dir)
+        self.reports_dir.mkdir(parents=True, exist_ok=True)
+        self.rollup_cache = RollupCache(Path(data_manager.data_dir) / "rollups")
+        self.last_rollup_stats = {}
+        self.report_cache = ReportCache(REPORT_VERSION)
+        self.last_report_cached = False
+        
+    def generate_daily_report(self, target_date=None, force=False):
+        """Generate comprehensive daily report.
+        
+        If the day's data, the rules and the generator are unchanged since
+        the report was last built, the existing report is returned as is
+        (unless force is set).
+        """
         if target_date is None:
             target_date = datetime.now().date()
         
-        # Load data for the target date
-        self.data_manager.load_daily_data(target_date)
+        # Reports read an immutable snapshot, never the live tracking state
+        snapshot = self.data_manager.snapshot(target_date)
+        report_path = self.daily_report_path(target_date)
+        
+        manifest = self.report_cache.load_manifest(report_path)
+        inputs = self.report_cache.snapshot_inputs(snapshot, manifest)
+        options = self._report_options()
+        key = self.report_cache.key(inputs, options)
+        self.last_report_cached = not force and self.report_cache.is_current(report_path, key, manifest)
+        if self.last_report_cached:
+            return str(report_path)
+        
+        started = time.perf_counter()
+        
+        # One pass over the day's sessions builds every session-based section
+        aggregator = ReportAggregator(self.data_manager.categorizer, top_apps=TOP_APPS).add_all(snapshot.iter_sessions())
         
         report_data = {
             "date": target_date.isoformat(),
-            "summary": self._generate_daily_summary(),
-            "app_usage": self._generate_app_usage_analysis(),
-            "productivity": self._generate_productivity_analysis(),
-            "resource_usage": self._generate_resource_analysis(),
-            "timeline": self._generate_timeline_data()
+            "summary": aggregator.summary(),
+            "app_usage": aggregator.app_usage(),
+            "productivity": aggregator.productivity(),
+            "resource_usage": self._generate_resource_analysis(snapshot.resource_data),
+            "timeline": aggregator.timeline()
         }
         
-        # Generate HTML report
-        html_content = self._generate_html_report(report_data)
-        
         # Save report
-        report_filename = f"daily_report_{target_date.isoformat()}.html"
-        report_path = self.reports_dir / report_filename
-        
-        with open(report_path, 'w', encoding='utf-8') as f:
-            f.write(html_content)
+        self._save_html_report(report_path, report_data)
+        self.report_cache.record(report_path, key, inputs, options, time.perf_counter() - started)
         
         return str(report_path)
     
-    def _generate_daily_summary(self):
-        """Generate daily summary statistics"""
-        sessions = self.data_manager.app_sessions
-        
-        if not sessions:
-            return {
-                "total_time": 0,
-                "active_time": 0,
-                "apps_used": 0,
-                "most_used_app": "None"
-            }
-        
-        total_time = sum(s['duration_seconds'] for s in sessions)
-        active_time = sum(s['duration_seconds'] for s in sessions if s['was_active'])
-        
-        # Count app usage
-        app_times = defaultdict(int)
-        for session in sessions:
-            app_times[session['app_name']] += session['duration_seconds']
-        
-        most_used_app = max(app_times.items(), key=lambda x: x[1])[0] if app_times else "None"
-        
-        return {
-            "total_time": total_time,
-            "active_time": active_time,
-            "apps_used": len(app_times),
-            "most_used_app": most_used_app,
-            "productivity_ratio": (active_time / total_time * 100) if total_time > 0 else 0
-        }
+    def daily_report_path(self, target_date):
+        """Path of the daily report file for a date"""
+        return self.reports_dir / f"daily_report_{target_date.isoformat()}.html"
     
-    def _generate_app_usage_analysis(self):
-        """Generate detailed app usage analysis"""
-        sessions = self.data_manager.app_sessions
-        app_data = defaultdict(lambda: {
-            "total_time": 0,
-            "active_time": 0,
-            "sessions": 0,
-            "category": "Other"
-        })
-        
-        # Categorize apps
-        categories = {
-            "Productivity": ["notepad", "word", "excel", "powerpoint", "code", "sublime", "atom", "vscode"],
-            "Web Browsing": ["chrome", "firefox", "edge", "safari", "opera"],
-            "Communication": ["slack", "teams", "discord", "skype", "zoom"],
-            "Entertainment": ["spotify", "vlc", "netflix", "youtube", "steam"],
-            "Development": ["python", "java", "git", "docker", "terminal", "cmd"]
-        }
-        
-        for session in sessions:
-            app_name = session['app_name']
-            duration = session['duration_seconds']
-            
-            app_data[app_name]["total_time"] += duration
-            app_data[app_name]["sessions"] += 1
-            
-            if session['was_active']:
-                app_data[app_name]["active_time"] += duration
-            
-            # Categorize app
-            for category, keywords in categories.items():
-                if any(keyword in app_name.lower() for keyword in keywords):
-                    app_data[app_name]["category"] = category
-                    break
-        
-        # Convert to sorted list
-        sorted_apps = sorted(app_data.items(), key=lambda x: x[1]["total_time"], reverse=True)
-        
-        return {app: data for app, data in sorted_apps[:20]}  # Top 20 apps
+    def daily_report_is_current(self, target_date):
+        """True if the day's report was built from the day's current data"""
+        report_path = self.daily_report_path(target_date)
+        manifest = self.report_cache.load_manifest(report_path)
+        if manifest is None:
+            return False
+        inputs = self.report_cache.snapshot_inputs(self.data_manager.snapshot(target_date), manifest)
+        key = self.report_cache.key(inputs, self._report_options())
+        return self.report_cache.is_current(report_path, key, manifest)
     
-    def _generate_productivity_analysis(self):
-        """Analyze productivity patterns"""
-        sessions = self.data_manager.app_sessions
-        
-        if not sessions:
-            return {"score": 0, "insights": []}
-        
-        # Calculate hourly productivity
-        hourly_data = defaultdict(lambda: {"productive": 0, "total": 0})
-        
-        productive_apps = ["notepad", "word", "excel", "code", "sublime", "atom", "vscode"]
-        
-        for session in sessions:
-            start_time = datetime.fromisoformat(session['start_time'])
-            hour = start_time.hour
-            duration = session['duration_seconds']
-            
-            hourly_data[hour]["total"] += duration
-            
-            if any(app in session['app_name'].lower() for app in productive_apps):
-                hourly_data[hour]["productive"] += duration
+    def _report_options(self):
+        """Settings that change a report's contents"""
+        return {"top_apps": TOP_APPS, "category_rules": self.data_manager.categorizer.fingerprint()}
+    
+    def generate_weekly_report(self, target_date=None, jobs=None):
+        """Generate a report for the Monday-to-Sunday week containing target_date"""
+        if target_date is None:
+            target_date = datetime.now().date()
+        start_date = target_date - timedelta(days=target_date.weekday())
+        year, week, _ = start_date.isocalendar()
+        return self.generate_range_report(start_date, start_date + timedelta(days=6), "Weekly Report",
+                                          f"weekly_report_{year}-W{week:02d}.html", jobs)
+    
+    def generate_monthly_report(self, target_date=None, jobs=None):
+        """Generate a report for the calendar month containing target_date"""
+        if target_date is None:
+            target_date = datetime.now().date()
+        start_date = target_date.replace(day=1)
+        end_date = (start_date + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+        return self.generate_range_report(start_date, end_date, "Monthly Report",
+                                          f"monthly_report_{start_date:%Y-%m}.html", jobs)
+    
+    def generate_range_report(self, start_date, end_date, title="Range Report", report_filename=None, jobs=None):
+        """Generate a report covering every day from start_date to end_date.
         
-        # Calculate overall productivity score
-        total_time = sum(data["total"] for data in hourly_data.values())
-        productive_time = sum(data["productive"] for data in hourly_data.values())
+        Each day is aggregated separately (in worker processes, reusing the
+        cached rollups of unchanged closed days) and the partials are merged.
+        """
+        today = self.data_manager.snapshot()
+        partials, stats = collect_partials(
+            self.data_manager.data_dir, start_date, end_date, self.data_manager.categorizer,
+            cache=self.rollup_cache, jobs=jobs,
+            live_sessions=today.sessions
+        )
+        self.last_rollup_stats = stats
+        aggregator = merge_partials(partials, self.data_manager.categorizer)
         
-        productivity_score = (productive_time / total_time * 100) if total_time > 0 else 0
+        report_data = {
+            "title": title,
+            "date": f"{start_date.isoformat()} to {end_date.isoformat()}",
+            "summary": aggregator.summary(),
+            "app_usage": aggregator.app_usage(),
+            "productivity": aggregator.productivity(),
+            "resource_usage": self._generate_resource_analysis(today.resource_data),
+            "daily": aggregator.daily_totals()
+        }
         
-        # Generate insights
-        insights = []
-        if productivity_score > 70:
-            insights.append("Excellent productivity! You spent most of your time on productive tasks.")
-        elif productivity_score > 40:
-            insights.append("Good productivity balance. Consider reducing time on non-productive apps.")
-        else:
-            insights.append("Low productivity detected. Try to focus more on work-related applications.")
+        if report_filename is None:
+            report_filename = f"range_report_{start_date.isoformat()}_{end_date.isoformat()}.html"
+        report_path = self.reports_dir / report_filename
+        self._save_html_report(report_path, report_data)
         
-        return {
-            "score": productivity_score,
-            "insights": insights,
-            "hourly_data": dict(hourly_data)
-        }
+        return str(report_path)
     
-    def _generate_resource_analysis(self):
+    def _generate_resource_analysis(self, resource_data):
         """Analyze system resource usage"""
-        if not hasattr(self.data_manager, 'resource_data') or not self.data_manager.resource_data:
+        if not resource_data:
             return {"available": False}
         
-        resource_data = self.data_manager.resource_data
-        
         return {
             "available": True,
             "system": resource_data.get('system', {}),
@@ -184,134 +223,155 @@ class ReportGenerator:
         
         return recommendations
     
-    def _generate_timeline_data(self):
-        """Generate timeline data for visualization"""
-        sessions = self.data_manager.app_sessions
-        
-        timeline = []
-        for session in sessions:
-            timeline.append({
-                "app": session['app_name'],
-                "start": session['start_time'],
-                "end": session['end_time'],
-                "duration": session['duration_seconds'],
-                "active": session['was_active']
-            })
-        
-        return sorted(timeline, key=lambda x: x['start'])
+    def _save_html_report(self, report_path, report_data):
+        """Stream the HTML report to a temp file, then move it into place"""
+        temp_path = Path(report_path).with_suffix(".tmp")
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            self._write_html_report(f, report_data)
+        os.replace(temp_path, report_path)
     
-    def _generate_html_report(self, report_data):
-        """Generate HTML report"""
-        html_template = """
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <title>TimeLedger Daily Report - {date}</title>
-            <style>
-                body {{ font-family: Arial, sans-serif; margin: 20px; background-color: #f5f5f5; }}
-                .container {{ max-width: 1200px; margin: 0 auto; background: white; padding: 20px; border-radius: 10px; box-shadow: 0 2px 10px rgba(0,0,0,0.1); }}
-                .header {{ text-align: center; color: #333; border-bottom: 2px solid #4CAF50; padding-bottom: 20px; }}
-                .summary {{ display: grid; grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); gap: 20px; margin: 20px 0; }}
-                .stat-card {{ background: #4CAF50; color: white; padding: 20px; border-radius: 8px; text-align: center; }}
-                .stat-value {{ font-size: 2em; font-weight: bold; }}
-                .stat-label {{ font-size: 0.9em; opacity: 0.9; }}
-                .section {{ margin: 30px 0; }}
-                .section h2 {{ color: #333; border-left: 4px solid #4CAF50; padding-left: 10px; }}
-                .app-list {{ display: grid; gap: 10px; }}
-                .app-item {{ display: flex; justify-content: space-between; padding: 10px; background: #f9f9f9; border-radius: 5px; }}
-                .timeline {{ background: #f9f9f9; padding: 15px; border-radius: 5px; }}
-                .insight {{ background: #e3f2fd; padding: 15px; border-left: 4px solid #2196F3; margin: 10px 0; }}
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                <div class="header">
-                    <h1>📊 TimeLedger Daily Report</h1>
-                    <p>Report for {date}</p>
-                </div>
-                
-                <div class="summary">
-                    <div class="stat-card">
-                        <div class="stat-value">{total_hours:.1f}h</div>
-                        <div class="stat-label">Total Time</div>
-                    </div>
-                    <div class="stat-card">
-                        <div class="stat-value">{active_hours:.1f}h</div>
-                        <div class="stat-label">Active Time</div>
-                    </div>
-                    <div class="stat-card">
-                        <div class="stat-value">{apps_used}</div>
-                        <div class="stat-label">Apps Used</div>
-                    </div>
-                    <div class="stat-card">
-                        <div class="stat-value">{productivity:.0f}%</div>
-                        <div class="stat-label">Productivity</div>
-                    </div>
-                </div>
-                
-                <div class="section">
-                    <h2>🏆 Top Applications</h2>
-                    <div class="app-list">
-                        {app_usage_html}
-                    </div>
-                </div>
-                
-                <div class="section">
-                    <h2>📈 Productivity Insights</h2>
-                    {productivity_insights_html}
-                </div>
-                
-                <div class="section">
-                    <h2>⏰ Activity Timeline</h2>
-                    <div class="timeline">
-                        <p>Timeline visualization would go here (requires JavaScript charting library)</p>
-                    </div>
-                </div>
-                
-                <div class="section">
-                    <h2>💻 System Performance</h2>
-                    {resource_analysis_html}
-                </div>
-            </div>
-        </body>
-        </html>
-        """
-        
-        # Prepare data for template
+    def _write_html_report(self, f, report_data):
+        """Write the HTML report section by section"""
         summary = report_data['summary']
-        app_usage = report_data['app_usage']
-        productivity = report_data['productivity']
-        
-        # Generate app usage HTML
-        app_usage_html = ""
-        for app_name, data in list(app_usage.items())[:10]:
-            hours = data['total_time'] / 3600
-            app_usage_html += f"""
-            <div class="app-item">
-                <span><strong>{app_name}</strong> ({data['category']})</span>
-                <span>{hours:.1f}h ({data['sessions']} sessions)</span>
-            </div>
-            """
         
-        # Generate productivity insights HTML
-        productivity_insights_html = ""
-        for insight in productivity['insights']:
-            productivity_insights_html += f'<div class="insight">{insight}</div>'
+        f.write(_HTML_HEAD.format(title=escape(report_data.get('title', "Daily Report")), date=report_data['date']))
+        f.write(_HTML_SUMMARY.format(
+            total_hours=summary['total_time'] / 3600,
+            active_hours=summary['active_time'] / 3600,
+            apps_used=summary['apps_used'],
+            productivity=summary.get('productivity_ratio', 0)
+        ))
+        
+        # Top applications
+        f.write('\n        <div class="section">\n            <h2>🏆 Top Applications</h2>\n            <div class="app-list">')
+        for app_name, data in list(report_data['app_usage'].items())[:10]:
+            f.write(_HTML_ITEM.format(
+                name=escape(app_name),
+                detail=f" ({escape(data['category'])})",
+                value=f"{data['total_time'] / 3600:.1f}h ({data['sessions']} sessions)"
+            ))
+        f.write('\n            </div>\n        </div>\n')
+        
+        # Productivity insights
+        f.write('\n        <div class="section">\n            <h2>📈 Productivity Insights</h2>\n')
+        for insight in report_data['productivity']['insights']:
+            f.write(f'            <div class="insight">{insight}</div>\n')
+        f.write('        </div>\n')
+        
+        # Timeline, or a per-day list for multi-day reports
+        if 'daily' in report_data:
+            f.write('\n        <div class="section">\n            <h2>📅 Daily Breakdown</h2>\n            <div class="timeline">')
+            if not report_data['daily']:
+                f.write("<p>No activity recorded in this period.</p>")
+            for day, total, active in report_data['daily']:
+                f.write(_HTML_ITEM.format(name=day, detail="",
+                                          value=f"{total / 3600:.1f}h ({active / 3600:.1f}h active)"))
+        else:
+            f.write('\n        <div class="section">\n            <h2>⏰ Activity Timeline</h2>\n            <div class="timeline">\n')
+            for chunk in timeline_svg_chunks(report_data.get('timeline', [])):
+                f.write(chunk)
+        f.write('\n            </div>\n        </div>\n')
         
-        # Generate resource analysis HTML
-        resource_analysis = report_data['resource_usage']
-        if resource_analysis.get('available'):
+        # System performance
+        if report_data['resource_usage'].get('available'):
             resource_analysis_html = "<p>System performance data available in detailed logs.</p>"
         else:
             resource_analysis_html = "<p>No system performance data available for this period.</p>"
+        f.write(f'\n        <div class="section">\n            <h2>💻 System Performance</h2>\n            {resource_analysis_html}\n        </div>\n')
         
-        return html_template.format(
-            date=report_data['date'],
-            total_hours=summary['total_time'] / 3600,
-            active_hours=summary['active_time'] / 3600,
-            apps_used=summary['apps_used'],
-            productivity=summary['productivity_ratio'],
-            app_usage_html=app_usage_html,
-            productivity_insights_html=productivity_insights_html,
-            resource_analysis_html=resource_analysis_html
-        )
+        f.write('    </div>\n</body>\n</html>\n')
+
+
+# Batch rendering (python -m utils.report_generator). Each worker process
+# keeps one ReportGenerator per (data dir, reports dir).
+_batch_generators = {}
+
+
+def _batch_generator(data_dir, reports_dir):
+    key = (data_dir, reports_dir)
+    if key not in _batch_generators:
+        from utils.data_manager import DataManager
+        _batch_generators[key] = ReportGenerator(DataManager(data_dir), reports_dir)
+    return _batch_generators[key]
+
+
+def _render_daily_report(data_dir, reports_dir, day, force):
+    """Render one day's report; returns (status, report path, source bytes)"""
+    generator = _batch_generator(data_dir, reports_dir)
+    target_date = date.fromisoformat(day)
+    source = generator.data_manager.get_daily_file_path(target_date)
+    report_path = generator.generate_daily_report(target_date, force=force)
+    if generator.last_report_cached:
+        return "skipped", report_path, 0
+    return "rendered", report_path, source.stat().st_size
+
+
+def _default_reports_dir(data_dir):
+    # Mirrors the app layout: <root>/data next to <root>/reports
+    return str(Path(data_dir).resolve().parent / "reports")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render TimeLedger daily reports for a date range.")
+    parser.add_argument("--from", dest="start", required=True, type=date.fromisoformat, help="first day (YYYY-MM-DD)")
+    parser.add_argument("--to", dest="end", type=date.fromisoformat, help="last day (default: same as --from)")
+    parser.add_argument("--data-dir", action="append", default=None,
+                        help="data directory to read; repeat for several machines (default: data)")
+    parser.add_argument("--reports-dir", default=None,
+                        help="output directory (default: 'reports' next to each data directory)")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="worker processes")
+    parser.add_argument("--force", action="store_true", help="re-render reports that are already up to date")
+    args = parser.parse_args(argv)
+
+    end = args.end or args.start
+    data_dirs = args.data_dir or ["data"]
+    if len(data_dirs) > 1 and args.reports_dir:
+        parser.error("--reports-dir can only be used with a single --data-dir")
+
+    reports_dirs = {data_dir: args.reports_dir or _default_reports_dir(data_dir) for data_dir in data_dirs}
+    if len(set(reports_dirs.values())) < len(data_dirs):
+        # Sibling data directories would overwrite each other's reports
+        reports_dirs = {data_dir: str(Path(reports_dir) / Path(data_dir).resolve().name)
+                        for data_dir, reports_dir in reports_dirs.items()}
+
+    tasks = []
+    for data_dir in data_dirs:
+        reports_dir = reports_dirs[data_dir]
+        day = args.start
+        while day <= end:
+            if (Path(data_dir) / f"{day.isoformat()}.json").exists():
+                tasks.append((data_dir, reports_dir, day.isoformat(), args.force))
+            day += timedelta(days=1)
+
+    if not tasks:
+        print("No day files found in the requested range.")
+        return 0
+
+    counts = {"rendered": 0, "skipped": 0, "failed": 0}
+    source_bytes = 0
+    started = time.perf_counter()
+
+    with ProcessPoolExecutor(max_workers=max(1, args.jobs)) as pool:
+        futures = {pool.submit(_render_daily_report, *task): task for task in tasks}
+        for future in as_completed(futures):
+            data_dir, _reports_dir, day, _force = futures[future]
+            try:
+                status, report_path, size = future.result()
+            except Exception as e:
+                counts["failed"] += 1
+                print(f"FAILED   {data_dir} {day}: {e}")
+                continue
+            counts[status] += 1
+            source_bytes += size
+            if status == "rendered":
+                print(f"rendered {report_path}")
+
+    elapsed = time.perf_counter() - started
+    print(f"{counts['rendered']} rendered, {counts['skipped']} up to date, {counts['failed']} failed "
+          f"in {elapsed:.2f}s ({counts['rendered'] / elapsed:.1f} reports/s, "
+          f"{source_bytes / 1024 / 1024 / elapsed:.1f} MB/s of day files, {args.jobs} jobs)")
+    return 1 if counts["failed"] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,137 @@
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
+from pathlib import Path
+from utils.report_aggregator import ReportAggregator, iter_day_sessions
+
+_ROLLUP_VERSION = 1
+
+
+def compute_day_partial(file_path, categorizer):
+    """Aggregate one day file into a mergeable partial (runs in a worker process)"""
+    aggregator = ReportAggregator(categorizer, keep_timeline=False)
+    aggregator.add_all(iter_day_sessions(file_path))
+    return aggregator.to_partial()
+
+
+class RollupCache:
+    """Per-day partial aggregates of closed days, stored as small JSON files.
+
+    An entry is reused only while its day file has the same mtime and size
+    and the category rules are unchanged, so edited or re-synced days are
+    recomputed automatically.
+    """
+
+    def __init__(self, cache_dir):
+        self.cache_dir = Path(cache_dir)
+
+    def _path(self, day):
+        return self.cache_dir / f"{day.isoformat()}.json"
+
+    @staticmethod
+    def _key(file_path, categorizer):
+        stat = os.stat(file_path)
+        return [_ROLLUP_VERSION, stat.st_mtime_ns, stat.st_size, categorizer.fingerprint()]
+
+    def get(self, day, file_path, categorizer):
+        path = self._path(day)
+        if not path.exists():
+            return None
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            if entry.get("key") == self._key(file_path, categorizer):
+                return entry["partial"]
+        except Exception as e:
+            print(f"Ignoring unreadable rollup for {day}: {e}")
+        return None
+
+    def put(self, day, file_path, categorizer, partial):
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            path = self._path(day)
+            temp_path = path.with_suffix(".tmp")
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump({"key": self._key(file_path, categorizer), "partial": partial}, f)
+            os.replace(temp_path, path)
+        except Exception as e:
+            print(f"Error saving rollup for {day}: {e}")
+
+
+def iter_days(start, end):
+    day = start
+    while day <= end:
+        yield day
+        day += timedelta(days=1)
+
+
+def collect_partials(data_dir, start, end, categorizer, cache=None, jobs=None, live_sessions=None):
+    """Return ({day: partial}, stats) for every day file between start and end.
+
+    Closed days come from the rollup cache when it is current; the rest are
+    computed one task per day file in a process pool of up to `jobs`
+    workers (default: one per CPU, never more than there are days to
+    compute; 1 computes them in this process). Workers are spawned rather
+    than forked, since callers like the GUI run many threads. Today is never
+    cached: pass the in-memory sessions as live_sessions to include them.
+    """
+    data_dir = Path(data_dir)
+    today = date.today()
+    partials = {}
+    pending = []
+    stats = {"days": 0, "cached": 0, "computed": 0}
+
+    for day in iter_days(start, end):
+        if day == today and live_sessions is not None:
+            aggregator = ReportAggregator(categorizer, keep_timeline=False).add_all(live_sessions)
+            partials[day] = aggregator.to_partial()
+            stats["computed"] += 1
+            continue
+
+        file_path = data_dir / f"{day.isoformat()}.json"
+        if not file_path.exists():
+            continue
+        partial = cache.get(day, file_path, categorizer) if cache and day < today else None
+        if partial is not None:
+            partials[day] = partial
+            stats["cached"] += 1
+        else:
+            pending.append((day, file_path))
+
+    workers = min(len(pending), jobs or os.cpu_count() or 1)
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+            futures = [(day, file_path, pool.submit(compute_day_partial, file_path, categorizer))
+                       for day, file_path in pending]
+            results = []
+            for day, file_path, future in futures:
+                try:
+                    results.append((day, file_path, future.result()))
+                except Exception as e:
+                    print(f"Error aggregating {file_path}: {e}")
+    else:
+        results = []
+        for day, file_path in pending:
+            try:
+                results.append((day, file_path, compute_day_partial(file_path, categorizer)))
+            except Exception as e:
+                print(f"Error aggregating {file_path}: {e}")
+
+    for day, file_path, partial in results:
+        partials[day] = partial
+        stats["computed"] += 1
+        if cache and day < today:
+            cache.put(day, file_path, categorizer, partial)
+
+    stats["days"] = len(partials)
+    return partials, stats
+
+
+def merge_partials(partials, categorizer=None, top_apps=20):
+    """Merge per-day partials (in date order) into one ReportAggregator"""
+    aggregator = ReportAggregator(categorizer, top_apps=top_apps, keep_timeline=False)
+    for day in sorted(partials):
+        aggregator.merge(partials[day])
+    return aggregator
@@ -0,0 +1,117 @@
+from datetime import datetime
+from html import escape
+
+# Lane colors, cycled; inactive time is drawn in the same color, faded
+PALETTE = ["#4CAF50", "#2196F3", "#FF9800", "#9C27B0", "#F44336", "#00BCD4",
+           "#8BC34A", "#FFC107", "#3F51B5", "#E91E63", "#795548", "#607D8B"]
+
+
+def _fmt_duration(seconds):
+    hours, rest = divmod(int(seconds), 3600)
+    return f"{hours}h {rest // 60:02d}m" if hours else f"{rest // 60}m {rest % 60:02d}s"
+
+
+def timeline_svg_chunks(timeline, width=1100, lane_height=18, label_width=150, max_lanes=12):
+    """Yield an inline SVG Gantt chart of sessions, one lane per app.
+
+    timeline is the report's list of {"app", "start", "end", "duration",
+    "active"} dicts. Each lane is rasterized to one-pixel columns and runs of
+    columns in the same state (active or idle) become one rectangle, so
+    sub-pixel sessions coalesce and the output size depends on the chart
+    width, not the session count.
+    Apps beyond the busiest max_lanes - 1 share an "Other" lane.
+    """
+    if not timeline:
+        yield "<p>No activity recorded for this day.</p>"
+        return
+
+    intervals = []
+    totals = {}
+    for item in timeline:
+        start = datetime.fromisoformat(item["start"]).timestamp()
+        end = datetime.fromisoformat(item["end"]).timestamp()
+        intervals.append((start, end, item["app"], item["active"]))
+        totals[item["app"]] = totals.get(item["app"], 0) + item["duration"]
+
+    ranked = sorted(totals, key=totals.get, reverse=True)
+    if len(ranked) > max_lanes:
+        lanes = ranked[:max_lanes - 1] + ["Other"]
+    else:
+        lanes = ranked
+    lane_index = {app: index for index, app in enumerate(lanes)}
+    other_lane = lane_index.get("Other", len(lanes) - 1)
+
+    # Axis: whole hours around the first and last session
+    first = min(start for start, _, _, _ in intervals)
+    last = max(end for _, end, _, _ in intervals)
+    axis_start = datetime.fromtimestamp(first).replace(minute=0, second=0, microsecond=0).timestamp()
+    axis_end = max(axis_start + 3600, -(-(last - axis_start) // 3600) * 3600 + axis_start)
+    plot_width = width - label_width - 10
+    scale = plot_width / (axis_end - axis_start)
+
+    # Rasterize each lane into one-pixel columns holding active and idle
+    # seconds, then emit one rectangle per run of columns in the same state
+    columns = max(1, int(plot_width))
+    active_secs = [[0.0] * columns for _ in lanes]
+    idle_secs = [[0.0] * columns for _ in lanes]
+    for start, end, app, active in intervals:
+        lane = lane_index.get(app, other_lane)
+        target = active_secs[lane] if active else idle_secs[lane]
+        x0 = (start - axis_start) * scale
+        x1 = max(x0, (end - axis_start) * scale)
+        column = min(columns - 1, int(x0))
+        last_column = min(columns - 1, int(x1))
+        if column == last_column:
+            target[column] += end - start
+            continue
+        seconds_per_px = 1 / scale
+        target[column] += (column + 1 - x0) * seconds_per_px
+        for middle in range(column + 1, last_column):
+            target[middle] += seconds_per_px
+        target[last_column] += (x1 - last_column) * seconds_per_px
+
+    rects = []
+    for lane in range(len(lanes)):
+        run_state, run_start, run_seconds = 0, 0, 0.0
+        for column in range(columns + 1):
+            if column < columns:
+                active, idle = active_secs[lane][column], idle_secs[lane][column]
+                state = 0 if not (active or idle) else 1 if active >= idle else 2
+            else:
+                state, active, idle = -1, 0.0, 0.0
+            if state != run_state:
+                if run_state > 0:
+                    rects.append((lane, run_state == 1, run_start, column, run_seconds))
+                run_state, run_start, run_seconds = state, column, 0.0
+            run_seconds += active + idle
+
+    axis_height = 20
+    height = axis_height + lane_height * len(lanes) + 4
+    yield (f'<svg xmlns="http://www.w3.org/2000/svg" width="100%" viewBox="0 0 {width} {height}" '
+           f'font-family="Arial, sans-serif" font-size="11">')
+
+    # Hour grid
+    hours = int(round((axis_end - axis_start) / 3600))
+    step = 1 if hours <= 12 else 2 if hours <= 24 else 6
+    grid = []
+    for hour in range(0, hours + 1, step):
+        x = label_width + hour * 3600 * scale
+        label = datetime.fromtimestamp(axis_start + hour * 3600).strftime("%H:%M")
+        grid.append(f'<line x1="{x:.1f}" y1="{axis_height - 4}" x2="{x:.1f}" y2="{height}" stroke="#ddd"/>'
+                    f'<text x="{x:.1f}" y="{axis_height - 8}" text-anchor="middle" fill="#666">{label}</text>')
+    yield "".join(grid)
+
+    for index, app in enumerate(lanes):
+        y = axis_height + index * lane_height
+        yield (f'<text x="{label_width - 6}" y="{y + lane_height * 0.7:.1f}" text-anchor="end" fill="#333">'
+               f'{escape(app[:24])}</text>')
+
+    for lane, active, x0, x1, seconds in rects:
+        y = axis_height + lane * lane_height + 2
+        color = PALETTE[lane % len(PALETTE)]
+        opacity = "" if active else ' fill-opacity="0.35"'
+        yield (f'<rect x="{label_width + x0:.1f}" y="{y}" width="{max(1.0, x1 - x0):.1f}" height="{lane_height - 4}" '
+               f'fill="{color}"{opacity}><title>{escape(lanes[lane])}: {_fmt_duration(seconds)}'
+               f'{"" if active else " (idle)"}</title></rect>')
+
+    yield "</svg>"
@@ -0,0 +1,211 @@
+import json
+import os
+from collections import namedtuple
+from datetime import date, datetime, timedelta
+import numpy as np
+from utils.report_rollups import iter_days
+from utils.time_binning import to_local_seconds
+
+_LOCAL_EPOCH = datetime(1970, 1, 1)
+
+# Columns a session list can be sorted by
+SORT_COLUMNS = ("start", "app", "category", "duration", "active", "title")
+
+SessionFilter = namedtuple("SessionFilter", "app category min_duration active_only sort_by descending")
+SessionFilter.__new__.__defaults__ = ("", None, 0, False, "start", True)
+
+# One day's sessions as columns; app, category and title are codes into the index's vocabularies
+_DayColumns = namedtuple("_DayColumns", "key starts durations active apps categories titles")
+
+
+class _Vocabulary:
+    """Interns strings as small integer codes"""
+
+    def __init__(self):
+        self.codes = {}
+        self.names = []
+
+    def code(self, name):
+        code = self.codes.get(name)
+        if code is None:
+            code = self.codes[name] = len(self.names)
+            self.names.append(name)
+        return code
+
+    def ranks(self):
+        """Sort position of each code's name, case-insensitively"""
+        order = sorted(range(len(self.names)), key=lambda code: self.names[code].lower())
+        ranks = np.empty(len(order), dtype=np.int64)
+        ranks[order] = np.arange(len(order))
+        return ranks
+
+
+class SessionIndex:
+    """Sessions of a date range as NumPy columns, for browsing large histories.
+
+    Each day is converted once and kept while its day file is unchanged
+    (today's while the live list hasn't grown), so widening the range or
+    re-running a query only reads the days that are new. Apps, categories
+    and window titles are stored as codes, which keeps a year of sessions
+    small and makes filtering and sorting vectorized. Not thread-safe: use
+    one index from one worker thread.
+    """
+
+    def __init__(self, data_manager):
+        self.data_manager = data_manager
+        self.apps = _Vocabulary()
+        self.categories = _Vocabulary()
+        self.titles = _Vocabulary()
+        self._days = {}
+        self._pair_categories = {}  # (app code, title code) -> category code
+        self._rules = None
+        self.columns = self._concatenate([])
+
+    def load(self, first_day, last_day):
+        """Make the columns hold every session from first_day to last_day"""
+        categorizer = self.data_manager.categorizer
+        if self._rules != categorizer.fingerprint():
+            # Categories depend on the rules; start over
+            self._rules = categorizer.fingerprint()
+            self._days = {}
+            self._pair_categories = {}
+            self.categories = _Vocabulary()
+
+        today = date.today()
+        days = {}
+        for day in iter_days(first_day, last_day):
+            if day == today:
+                snapshot = self.data_manager.snapshot()
+                key = ("live", len(snapshot.sessions))
+                sessions = snapshot.sessions
+            else:
+                file_path = self.data_manager.get_daily_file_path(day)
+                try:
+                    stat = os.stat(file_path)
+                except OSError:
+                    continue
+                key = (stat.st_mtime_ns, stat.st_size)
+                sessions = None
+
+            block = self._days.get(day)
+            if block is None or block.key != key:
+                try:
+                    if sessions is None:
+                        with open(file_path, 'r') as f:
+                            sessions = json.load(f).get("app_sessions", [])
+                    block = self._convert(key, sessions)
+                except Exception as e:
+                    print(f"Error indexing sessions for {day}: {e}")
+                    continue
+            days[day] = block
+
+        changed = days.keys() != self._days.keys() or any(days[day] is not self._days[day] for day in days)
+        self._days = days
+        if changed:
+            self.columns = self._concatenate([days[day] for day in sorted(days)])
+        return self
+
+    def _convert(self, key, sessions):
+        categorizer = self.data_manager.categorizer
+        pair_categories = self._pair_categories
+        count = len(sessions)
+        apps = np.empty(count, dtype=np.int32)
+        categories = np.empty(count, dtype=np.int32)
+        titles = np.empty(count, dtype=np.int32)
+        for row, session in enumerate(sessions):
+            app_name = session['app_name']
+            title = session.get('window_title', '')
+            app = apps[row] = self.apps.code(app_name)
+            title_code = titles[row] = self.titles.code(title)
+            # Categorize each distinct (app, title) once, however many days it appears on
+            category = pair_categories.get((app, title_code))
+            if category is None:
+                category = pair_categories[(app, title_code)] = self.categories.code(
+                    categorizer.categorize(app_name, title))
+            categories[row] = category
+        return _DayColumns(
+            key,
+            to_local_seconds([s['start_time'] for s in sessions]) if sessions else np.empty(0),
+            np.fromiter((s['duration_seconds'] for s in sessions), dtype=np.float64, count=count),
+            np.fromiter((bool(s['was_active']) for s in sessions), dtype=bool, count=count),
+            apps, categories, titles
+        )
+
+    @staticmethod
+    def _concatenate(blocks):
+        if not blocks:
+            return _DayColumns(None, np.empty(0), np.empty(0), np.empty(0, dtype=bool),
+                               *(np.empty(0, dtype=np.int32) for _ in range(3)))
+        return _DayColumns(None, *(np.concatenate(column) for column in list(zip(*blocks))[1:]))
+
+    def query(self, session_filter):
+        """Return a SessionResult of the sessions matching a SessionFilter, sorted"""
+        columns = self.columns
+        mask = np.ones(len(columns.starts), dtype=bool)
+
+        if session_filter.app:
+            needle = session_filter.app.lower()
+            codes = [code for code, name in enumerate(self.apps.names) if needle in name.lower()]
+            mask &= np.isin(columns.apps, codes)
+        if session_filter.category:
+            code = self.categories.codes.get(session_filter.category, -1)
+            mask &= columns.categories == code
+        if session_filter.min_duration:
+            mask &= columns.durations >= session_filter.min_duration
+        if session_filter.active_only:
+            mask &= columns.active
+
+        rows = np.flatnonzero(mask)
+        sort_by = session_filter.sort_by
+        if sort_by == "start":
+            order = np.argsort(columns.starts[rows], kind="stable")
+        else:
+            if sort_by in ("app", "category", "title"):
+                vocabulary = {"app": self.apps, "category": self.categories, "title": self.titles}[sort_by]
+                codes = {"app": columns.apps, "category": columns.categories, "title": columns.titles}[sort_by]
+                keys = vocabulary.ranks()[codes[rows]]
+            elif sort_by == "duration":
+                keys = columns.durations[rows]
+            else:
+                keys = columns.active[rows]
+            # Ties keep chronological order
+            order = np.lexsort((columns.starts[rows], keys))
+        rows = rows[order]
+        if session_filter.descending:
+            rows = rows[::-1]
+
+        return SessionResult(columns, rows, list(self.apps.names), list(self.categories.names),
+                             list(self.titles.names), len(columns.starts))
+
+
+class SessionResult:
+    """The sessions a query matched, in order; rows are formatted a page at a time"""
+
+    def __init__(self, columns, rows, app_names, category_names, title_names, searched):
+        self.columns = columns
+        self.rows = rows
+        self.app_names = app_names
+        self.category_names = category_names
+        self.title_names = title_names
+        self.searched = searched
+        self.total_seconds = float(columns.durations[rows].sum())
+
+    def __len__(self):
+        return len(self.rows)
+
+    def page(self, offset, count):
+        """Display values (start, app, category, duration, active, title) for rows offset..offset+count"""
+        columns = self.columns
+        page = []
+        for row in self.rows[offset:offset + count].tolist():
+            start = _LOCAL_EPOCH + timedelta(seconds=float(columns.starts[row]))
+            duration = int(columns.durations[row])
+            page.append((
+                start.strftime("%Y-%m-%d %H:%M:%S"),
+                self.app_names[columns.apps[row]],
+                self.category_names[columns.categories[row]],
+                f"{duration // 3600}:{duration % 3600 // 60:02d}:{duration % 60:02d}",
+                "✓" if columns.active[row] else "",
+                self.title_names[columns.titles[row]]
+            ))
+        return page
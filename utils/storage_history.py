@@ -0,0 +1,210 @@
+import hashlib
+import heapq
+import json
+import os
+import threading
+from bisect import bisect_right
+from pathlib import Path
+
+# Keys of a storage snapshot that describe what is stored where. Everything
+# else (disk usage, scan stats, timestamps) changes on every scan and is kept
+# in the history line instead of the content-addressed object.
+CONTENT_KEYS = ("app_storage", "app_storage_allocated")
+
+
+class StorageHistory:
+    """Content-addressed storage snapshots plus a per-app size history.
+
+    Each distinct snapshot is written once to ``objects/<sha256>.json``.
+    ``history.jsonl`` gets one line per completed scan, holding the snapshot
+    hash, the scan's disk usage and stats, and only the apps whose size
+    moved, so diffing two scans touches just the changes recorded between
+    them. A scan that moved nothing reuses the previous snapshot hash.
+    """
+
+    def __init__(self, base_dir, min_change_mb=0.01):
+        self.base_dir = Path(base_dir)
+        self.objects_dir = self.base_dir / "objects"
+        self.history_path = self.base_dir / "history.jsonl"
+        self.min_change_mb = min_change_mb
+
+        self.entries = []     # parsed history lines, oldest first
+        self.current_hash = None
+        self.current_scan = None  # scan time of the latest history line
+        self._current_sizes = {}
+        self._object_cache = {}
+        self._lock = threading.Lock()
+
+        self._load_history()
+
+    def _load_history(self):
+        if not self.history_path.exists():
+            return
+        try:
+            with open(self.history_path, 'r') as f:
+                for line in f:
+                    line = line.strip()
+                    if line:
+                        self.entries.append(json.loads(line))
+        except Exception as e:
+            print(f"Error loading storage history: {e}")
+
+        if self.entries:
+            self.current_hash = self.entries[-1]["snapshot"]
+            self.current_scan = self.entries[-1].get("scan")
+            self._current_sizes = dict(self.load_object(self.current_hash).get("app_storage", {}))
+
+    @staticmethod
+    def hash_content(content):
+        """Stable hash of a snapshot's content"""
+        encoded = json.dumps(content, sort_keys=True, separators=(",", ":")).encode("utf-8")
+        return hashlib.sha256(encoded).hexdigest()
+
+    def load_object(self, snapshot_hash):
+        """Load the content stored under a snapshot hash"""
+        if snapshot_hash in self._object_cache:
+            return self._object_cache[snapshot_hash]
+        try:
+            with open(self.objects_dir / f"{snapshot_hash}.json", 'r') as f:
+                content = json.load(f)
+        except Exception as e:
+            print(f"Error loading storage snapshot {snapshot_hash}: {e}")
+            content = {}
+        self._object_cache[snapshot_hash] = content
+        return content
+
+    def _write_object(self, snapshot_hash, content):
+        path = self.objects_dir / f"{snapshot_hash}.json"
+        if path.exists():
+            return
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_suffix(".tmp")
+        with open(temp_path, 'w') as f:
+            json.dump(content, f, sort_keys=True, separators=(",", ":"))
+        os.replace(temp_path, path)
+
+    def record(self, storage_data):
+        """Record a finished scan; returns the snapshot hash.
+
+        A new snapshot object is only written when some app's size moved by
+        at least min_change_mb since the last recorded scan; otherwise the
+        history line points at the current one. Live (watcher) updates that
+        moved nothing aren't recorded at all.
+        """
+        sizes = storage_data.get("app_storage", {})
+        with self._lock:
+            changes = {}
+            for app, size in sizes.items():
+                old = self._current_sizes.get(app, 0)
+                if abs(size - old) >= self.min_change_mb or app not in self._current_sizes:
+                    changes[app] = [old, size]
+            for app, old in self._current_sizes.items():
+                if app not in sizes:
+                    changes[app] = [old, 0]
+
+            if not changes and self.current_hash is not None:
+                if storage_data.get("live"):
+                    return self.current_hash
+                content = None
+                snapshot_hash = self.current_hash
+            else:
+                content = {key: storage_data.get(key, {}) for key in CONTENT_KEYS}
+                snapshot_hash = self.hash_content(content)
+            entry = {
+                "scan": storage_data.get("last_scan"),
+                "snapshot": snapshot_hash,
+                "changes": changes,
+                "disk_usage": storage_data.get("disk_usage", {}),
+                "scan_stats": storage_data.get("scan_stats", {})
+            }
+
+            try:
+                if content is not None:
+                    self._write_object(snapshot_hash, content)
+                self.base_dir.mkdir(parents=True, exist_ok=True)
+                with open(self.history_path, 'a') as f:
+                    f.write(json.dumps(entry, separators=(",", ":")) + "\n")
+            except Exception as e:
+                print(f"Error saving storage history: {e}")
+                return self.current_hash
+
+            if content is not None:
+                self._object_cache[snapshot_hash] = content
+            self.entries.append(entry)
+            self.current_hash = snapshot_hash
+            self.current_scan = entry["scan"]
+            for app, (old, new) in changes.items():
+                if app in sizes:
+                    self._current_sizes[app] = new
+                else:
+                    self._current_sizes.pop(app, None)
+            return snapshot_hash
+
+    def load_snapshot(self, snapshot_hash=None, scan=None):
+        """Rebuild the full storage_data dict for a snapshot (default: latest).
+
+        Unchanged scans share a hash, so `scan` (an ISO time, e.g. the
+        current_scan a day file was saved with) picks the last of its
+        scans at or before then; without it the newest one is used.
+        """
+        snapshot_hash = snapshot_hash or self.current_hash
+        if snapshot_hash is None:
+            return {}
+
+        storage_data = dict(self.load_object(snapshot_hash))
+        last = self.scan_index(scan) if scan is not None else len(self.entries) - 1
+        matches = (entry for entry in reversed(self.entries[:last + 1]) if entry["snapshot"] == snapshot_hash)
+        entry = next(matches, None)
+        if entry is None:
+            entry = next((entry for entry in reversed(self.entries) if entry["snapshot"] == snapshot_hash), None)
+        if entry is not None:
+            storage_data["disk_usage"] = entry.get("disk_usage", {})
+            storage_data["scan_stats"] = entry.get("scan_stats", {})
+            storage_data["last_scan"] = entry.get("scan")
+        return storage_data
+
+    def scan_index(self, when):
+        """Index of the last recorded scan at or before an ISO timestamp"""
+        times = [entry.get("scan") or "" for entry in self.entries]
+        return max(0, bisect_right(times, when) - 1)
+
+    def app_history(self, app_name):
+        """Return [(scan time, size_mb)] for every recorded change of one app"""
+        history = []
+        for entry in self.entries:
+            change = entry["changes"].get(app_name)
+            if change is not None:
+                history.append((entry.get("scan"), change[1]))
+        return history
+
+    def diff(self, start, end=None):
+        """Return {app: (size at start, size at end)} for apps that changed.
+
+        start and end are scan indexes (negative counts from the latest) or
+        ISO timestamps. Only the changes recorded between them are read.
+        """
+        if not self.entries:
+            return {}
+        start = self._resolve(start)
+        end = self._resolve(end if end is not None else -1)
+        if end < start:
+            start, end = end, start
+
+        sizes = {}
+        for entry in self.entries[start + 1:end + 1]:
+            for app, (old, new) in entry["changes"].items():
+                if app in sizes:
+                    sizes[app] = (sizes[app][0], new)
+                else:
+                    sizes[app] = (old, new)
+        return {app: pair for app, pair in sizes.items() if pair[0] != pair[1]}
+
+    def top_growers(self, start, end=None, limit=10):
+        """Return [(app, growth_mb, size_mb)] for the apps that grew most"""
+        growth = ((app, new - old, new) for app, (old, new) in self.diff(start, end).items() if new > old)
+        return heapq.nlargest(limit, growth, key=lambda item: item[1])
+
+    def _resolve(self, ref):
+        if isinstance(ref, int):
+            return ref if ref >= 0 else len(self.entries) + ref
+        return self.scan_index(ref)
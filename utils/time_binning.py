@@ -0,0 +1,143 @@
+from collections import namedtuple
+import numpy as np
+
+# Bucket sizes understood by bin_intervals callers
+BUCKET_SECONDS = {
+    "minute": 60,
+    "15min": 900,
+    "hour": 3600,
+    "day": 86400
+}
+
+# Session timestamps are naive local ISO strings. Offsets are measured from
+# this naive epoch, so bucket boundaries fall on local clock minutes, hours
+# and midnights.
+_EPOCH = np.datetime64("1970-01-01T00:00:00", "us")
+
+SessionArrays = namedtuple("SessionArrays", "starts ends durations active groups names")
+
+
+def to_local_seconds(timestamps):
+    """Convert naive ISO timestamp strings to seconds since the naive epoch"""
+    parsed = np.array(timestamps, dtype="datetime64[us]")
+    return (parsed - _EPOCH).astype(np.float64) / 1e6
+
+
+def day_origin(day):
+    """Seconds since the naive epoch at local midnight of a date"""
+    return float((np.datetime64(day.isoformat(), "us") - _EPOCH).astype(np.int64)) / 1e6
+
+
+def session_arrays(sessions, group_by="app", categorizer=None):
+    """Turn session dicts into parallel arrays for bin_intervals.
+
+    group_by is "app", "category" (needs a categorizer) or None (a single
+    group). Timestamps are parsed in bulk by NumPy.
+    """
+    sessions = list(sessions)
+    starts = to_local_seconds([s['start_time'] for s in sessions])
+    ends = to_local_seconds([s['end_time'] for s in sessions])
+    durations = np.fromiter((s['duration_seconds'] for s in sessions), dtype=np.float64, count=len(sessions))
+    active = np.fromiter((bool(s['was_active']) for s in sessions), dtype=bool, count=len(sessions))
+
+    if group_by is None:
+        names = ["All"]
+        groups = np.zeros(len(sessions), dtype=np.int64)
+    else:
+        if group_by == "category":
+            keys = [categorizer.categorize(s['app_name'], s.get('window_title', '')) for s in sessions]
+        else:
+            keys = [s['app_name'] for s in sessions]
+        index = {}
+        groups = np.fromiter((index.setdefault(key, len(index)) for key in keys), dtype=np.int64, count=len(keys))
+        names = list(index)
+
+    return SessionArrays(starts, ends, durations, active, groups, names)
+
+
+def bin_intervals(starts, ends, bucket_seconds, n_buckets, origin=0.0, groups=None, n_groups=1, weights=None):
+    """Return an (n_groups, n_buckets) array of seconds each group occupies per bucket.
+
+    Intervals [start, end) are split exactly at bucket boundaries: the
+    partial first and last buckets get their overlap and every bucket in
+    between gets a full bucket_seconds, added through a difference array so
+    the cost is O(intervals + buckets) however long the intervals are.
+    weights scales each interval's contribution (e.g. duration / span).
+    Parts outside [origin, origin + n_buckets * bucket_seconds) are dropped.
+    """
+    starts = np.asarray(starts, dtype=np.float64) - origin
+    ends = np.asarray(ends, dtype=np.float64) - origin
+    limit = n_buckets * bucket_seconds
+    starts = np.clip(starts, 0, limit)
+    ends = np.clip(ends, 0, limit)
+
+    keep = ends > starts
+    starts, ends = starts[keep], ends[keep]
+    weights = np.ones_like(starts) if weights is None else np.asarray(weights, dtype=np.float64)[keep]
+    groups = np.zeros(len(starts), dtype=np.int64) if groups is None else np.asarray(groups, dtype=np.int64)[keep]
+
+    first = np.floor(starts / bucket_seconds).astype(np.int64)
+    last = np.ceil(ends / bucket_seconds).astype(np.int64) - 1
+    np.minimum(first, n_buckets - 1, out=first)
+    np.maximum(last, first, out=last)
+
+    width = n_buckets + 1
+    size = n_groups * width
+    row = groups * width
+
+    single = first == last
+    multi = ~single
+
+    # Intervals inside one bucket, plus the partial ends of longer ones
+    occupancy = np.bincount(row[single] + first[single],
+                            weights=(ends[single] - starts[single]) * weights[single], minlength=size)
+    occupancy += np.bincount(row[multi] + first[multi],
+                             weights=((first[multi] + 1) * bucket_seconds - starts[multi]) * weights[multi],
+                             minlength=size)
+    occupancy += np.bincount(row[multi] + last[multi],
+                             weights=(ends[multi] - last[multi] * bucket_seconds) * weights[multi],
+                             minlength=size)
+
+    # Full buckets strictly between first and last
+    full = multi & (last > first + 1)
+    diff = np.bincount(row[full] + first[full] + 1, weights=bucket_seconds * weights[full], minlength=size)
+    diff -= np.bincount(row[full] + last[full], weights=bucket_seconds * weights[full], minlength=size)
+
+    occupancy = occupancy.reshape(n_groups, width) + np.cumsum(diff.reshape(n_groups, width), axis=1)
+    return occupancy[:, :n_buckets]
+
+
+def duration_weights(starts, ends, durations):
+    """Scale factors that make each interval's binned total equal its recorded duration"""
+    spans = np.asarray(ends) - np.asarray(starts)
+    return np.divide(durations, spans, out=np.ones_like(spans, dtype=np.float64), where=spans > 0)
+
+
+def hour_of_day_occupancy(starts, ends, groups=None, n_groups=1, weights=None):
+    """Return (n_groups, 24) seconds per clock hour, summed over every day spanned"""
+    starts = np.asarray(starts, dtype=np.float64)
+    ends = np.asarray(ends, dtype=np.float64)
+    if len(starts) == 0:
+        return np.zeros((n_groups, 24))
+    origin = np.floor(starts.min() / 86400) * 86400
+    days = int(np.ceil((ends.max() - origin) / 86400)) or 1
+    binned = bin_intervals(starts, ends, 3600, days * 24, origin, groups, n_groups, weights)
+    return binned.reshape(n_groups, days, 24).sum(axis=1)
+
+
+def coalesce_intervals(starts, ends, resolution):
+    """Merge intervals that overlap or sit closer than `resolution` apart.
+
+    Returns (starts, ends) of the merged runs in start order. Used to draw
+    at most about one rectangle per pixel however many sessions there are.
+    """
+    starts = np.asarray(starts, dtype=np.float64)
+    ends = np.asarray(ends, dtype=np.float64)
+    if len(starts) == 0:
+        return starts, ends
+    order = np.argsort(starts, kind="stable")
+    starts, ends = starts[order], ends[order]
+    reach = np.maximum.accumulate(ends)
+    breaks = np.flatnonzero(starts[1:] > reach[:-1] + resolution) + 1
+    first = np.concatenate(([0], breaks))
+    return starts[first], np.maximum.reduceat(ends, first)